@@ -0,0 +1 @@
+"""Load benchmarks for the backend API (see benchmarks/run.py)"""
@@ -0,0 +1,112 @@
+"""In-process Supabase stand-in for benchmarks.
+
+LatencyClient wraps the embedded SQLite backend and sleeps before every
+query executes, imitating the network round trip to a hosted Supabase
+project. The sleep happens in the worker thread that runs the query, exactly
+where supabase-py would block on HTTP, so the worker pool and connection
+limits behave as they do in production. Storage calls go straight to the
+local bucket directories without added latency.
+"""
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from models.application import STATUS_OPTIONS
+
+SEED_CHUNK_SIZE = 1000
+
+COMPANIES = ["Genentech", "Amgen", "Pfizer", "Moderna", "Regeneron", "Vertex", "Gilead", "Biogen", "Novartis", "Merck"]
+TITLES = ["Scientist", "Senior Scientist", "Principal Scientist", "Research Associate", "Associate Director"]
+TAGS = ["remote", "referral", "oncology", "immunology", "cell-therapy", "analytical", "process", "startup"]
+WORDS = (
+    "assay development characterization formulation bioprocess chromatography mass spectrometry "
+    "protein antibody cell culture purification validation regulatory clinical translational "
+    "team cross-functional lead design experiments data analysis manuscript publication"
+).split()
+
+class Latency:
+    """Fixed delay in milliseconds plus uniform jitter"""
+
+    def __init__(self, ms: float, jitter_ms: float = 0.0, seed: int = 0):
+        self.ms = ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+
+    def sleep(self):
+        delay = self.ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+class _DelayedQuery:
+    """Forwards builder calls to a SQLite query and delays execute()"""
+
+    def __init__(self, query, latency: Latency):
+        self._query = query
+        self._latency = latency
+
+    def execute(self):
+        self._latency.sleep()
+        return self._query.execute()
+
+    def __getattr__(self, name):
+        attr = getattr(self._query, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            # Builder methods return the query itself; keep the wrapper in the chain
+            return self if result is self._query else result
+
+        return call
+
+class LatencyClient:
+    """A SQLiteClient whose table() and rpc() queries take ``latency`` to run"""
+
+    def __init__(self, client, latency: Latency):
+        self._client = client
+        self.latency = latency
+
+    def table(self, name: str):
+        return _DelayedQuery(self._client.table(name), self.latency)
+
+    def rpc(self, fn: str, params: dict = None):
+        return _DelayedQuery(self._client.rpc(fn, params), self.latency)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def application_rows(count: int, seed: int = 0) -> List[dict]:
+    """Deterministic application rows spread over the last year"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        created = now - timedelta(minutes=rng.randrange(365 * 24 * 60))
+        status = rng.choice(STATUS_OPTIONS)
+        rows.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "company": f"{rng.choice(COMPANIES)} {i % 500}",
+            "title": rng.choice(TITLES),
+            "location": "Boston, MA",
+            "status": status,
+            "status_history": [{"status": status, "date": created.isoformat()}],
+            "job_description": _text(rng, rng.randint(150, 400)),
+            "tags": rng.sample(TAGS, 2),
+            "notes": _text(rng, 20),
+            "created_at": created.isoformat(),
+            "updated_at": created.isoformat(),
+        })
+    return rows
+
+def seed_applications(client, count: int, seed: int = 0) -> List[str]:
+    """Insert ``count`` applications directly (without latency) and return their ids"""
+    rows = application_rows(count, seed)
+    for start in range(0, len(rows), SEED_CHUNK_SIZE):
+        client.table("applications").insert(rows[start:start + SEED_CHUNK_SIZE]).execute()
+    return [row["id"] for row in rows]
@@ -0,0 +1,231 @@
+"""Load benchmark for the backend API.
+
+Boots main.app in-process on the SQLite backend, wrapped in a LatencyClient
+that adds a simulated Supabase round trip to every query, seeds applications
+and drives each scenario at increasing concurrency through httpx's ASGI
+transport. Results (throughput and p50/p95/p99 latency) are compared with
+benchmarks/baseline.json, and anything slower than the tolerance is flagged.
+
+Run from backend/:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --rows 100000 --concurrency 1,16,64 --scenarios list,get
+    python -m benchmarks.run --save-baseline
+
+The response cache is disabled unless --cache is passed, so list timings
+measure the query and serialization rather than cache hits. Baselines are
+only comparable when recorded with the same options on similar hardware.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+SCENARIOS = ["list", "get", "update", "export", "upload", "download"]
+UPLOAD_BYTES = 256 * 1024
+DOWNLOAD_FILES = 20
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10000, help="applications to seed")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated Supabase round trip")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="uniform jitter on the round trip")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario and level")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated scenarios to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="leave the response cache enabled")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write results to the baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if any result regressed")
+    args = parser.parse_args(argv)
+    args.concurrency = [int(c) for c in args.concurrency.split(",")]
+    args.scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+def configure_environment(args, workdir: str):
+    """Point config at a scratch SQLite database before the app is imported"""
+    os.environ["DATA_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = os.path.join(workdir, "bench.db")
+    os.environ["LOCAL_STORAGE_PATH"] = os.path.join(workdir, "storage")
+    os.environ.setdefault("SLOW_REQUEST_SECONDS", "3600")
+    if not args.cache:
+        os.environ["RESPONSE_CACHE_TTL"] = "0"
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+async def drive(request: Callable, total: int, concurrency: int) -> dict:
+    """Issue ``total`` requests from ``concurrency`` workers and summarize them"""
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in remaining:
+            started = time.perf_counter()
+            try:
+                response = await request(i)
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "throughput": round(total / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+def build_scenarios(http, ids: List[str], file_ids: List[str], seed: int) -> Dict[str, Callable]:
+    rng = random.Random(seed)
+    payload = bytes(rng.getrandbits(8) for _ in range(1024)) * (UPLOAD_BYTES // 1024)
+
+    async def list_page(i):
+        return await http.get("/api/applications", params={"limit": 100})
+
+    async def get_one(i):
+        return await http.get(f"/api/applications/{rng.choice(ids)}")
+
+    async def update_one(i):
+        return await http.put(f"/api/applications/{rng.choice(ids)}", json={"notes": f"benchmark update {i}"})
+
+    async def export(i):
+        return await http.get("/api/applications/export-for-llm", params={"limit": 100})
+
+    async def upload(i):
+        # Distinct content per request, so uploads aren't deduplicated away
+        return await http.post(
+            f"/api/applications/{rng.choice(ids)}/files",
+            data={"file_type": "resume"},
+            files={"file": (f"bench-{i}.bin", i.to_bytes(8, "big", signed=True) + payload, "application/octet-stream")},
+        )
+
+    async def download(i):
+        return await http.get(f"/api/files/{rng.choice(file_ids)}/download")
+
+    return {
+        "list": list_page, "get": get_one, "update": update_one,
+        "export": export, "upload": upload, "download": download,
+    }
+
+async def benchmark(args) -> dict:
+    import httpx
+
+    import main
+    from services import supabase_client
+    from benchmarks.fake_supabase import Latency, LatencyClient, seed_applications
+
+    client = supabase_client.get_supabase_client()
+    print(f"Seeding {args.rows} applications...", file=sys.stderr)
+    ids = seed_applications(client, args.rows, args.seed)
+    supabase_client.supabase = LatencyClient(client, Latency(args.latency_ms, args.jitter_ms, args.seed))
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.lifespan(main.app), httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        file_ids = []
+        if "download" in args.scenarios:
+            setup = build_scenarios(http, ids[:DOWNLOAD_FILES], [], args.seed)
+            for i in range(DOWNLOAD_FILES):
+                await setup["upload"](i)
+            for app_id in ids[:DOWNLOAD_FILES]:
+                files = await http.get(f"/api/applications/{app_id}/files")
+                file_ids.extend(f["id"] for f in files.json())
+
+        scenarios = build_scenarios(http, ids, file_ids, args.seed)
+        for name in args.scenarios:
+            for concurrency in args.concurrency:
+                # One untimed request warms up imports, connections and caches
+                await scenarios[name](-1)
+                key = f"{name}@{concurrency}"
+                results[key] = await drive(scenarios[name], args.requests, concurrency)
+                print(f"  {key:<14} {results[key]['throughput']:>9.1f} req/s", file=sys.stderr)
+    return results
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Keys whose throughput or tail latency regressed beyond ``tolerance``"""
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        if (current["p95_ms"] > previous["p95_ms"] * (1 + tolerance)
+                or current["throughput"] < previous["throughput"] * (1 - tolerance)):
+            regressions.append(key)
+    return regressions
+
+def _delta(current: float, previous: float) -> str:
+    if not previous:
+        return ""
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+def report(results: dict, baseline: dict, regressions: List[str]):
+    header = f"{'scenario':<14} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'vs baseline':>22}"
+    print(header)
+    print("-" * len(header))
+    for key, r in results.items():
+        previous = baseline.get(key)
+        versus = ""
+        if previous:
+            versus = f"{_delta(r['throughput'], previous['throughput'])} req/s {_delta(r['p95_ms'], previous['p95_ms'])} p95"
+        flag = "  REGRESSION" if key in regressions else ""
+        print(
+            f"{key:<14} {r['throughput']:>9.1f} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} "
+            f"{r['p99_ms']:>9.2f} {r['errors']:>7} {versus:>22}{flag}"
+        )
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    options = {
+        "rows": args.rows, "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms,
+        "requests": args.requests, "cache": args.cache,
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        configure_environment(args, workdir)
+        results = asyncio.run(benchmark(args))
+
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    baseline = stored.get("results", {})
+    if stored and stored.get("options") != options:
+        print(f"Note: baseline was recorded with {stored.get('options')}, not {options}", file=sys.stderr)
+        baseline = {}
+
+    regressions = compare(results, baseline, args.tolerance)
+    report(results, baseline, regressions)
+
+    if args.save_baseline:
+        merged = {**baseline, **results}
+        args.baseline.write_text(json.dumps({"options": options, "results": merged}, indent=2) + "\n")
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+
+    return 1 if regressions and args.fail_on_regression else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,8 +3,99 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Data backend: "supabase", or "sqlite" for a local single-user install
+DATA_BACKEND = os.getenv("DATA_BACKEND", "supabase")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "job_command_center.db")
+LOCAL_STORAGE_PATH = os.getenv("LOCAL_STORAGE_PATH", "storage")
+
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
+# Connection pool and timeouts for Supabase requests
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "20"))
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "30"))
+SUPABASE_CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+
+# Chunk size in bytes for streamed file uploads and downloads
+STORAGE_CHUNK_SIZE = int(os.getenv("STORAGE_CHUNK_SIZE", str(1024 * 1024)))
+
+# Seconds between sweeps for unreferenced file blobs (0 disables them), and
+# how long a blob must have gone unused before it can be removed
+BLOB_GC_INTERVAL = float(os.getenv("BLOB_GC_INTERVAL", "3600"))
+BLOB_GC_GRACE = float(os.getenv("BLOB_GC_GRACE", "3600"))
+
+# Seconds between checks of the in-memory indexes for changes made by other
+# workers (SEARCH_REFRESH_INTERVAL is still read if it is set)
+INDEX_REFRESH_INTERVAL = float(os.getenv("INDEX_REFRESH_INTERVAL", os.getenv("SEARCH_REFRESH_INTERVAL", "5")))
+
+# In-process cache for list endpoints (set the TTL to 0 to disable)
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+
+# Rows per multi-row write and items per request for bulk endpoints
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "10000"))
+
+# Job search providers; each is enabled once its credentials are set. The base
+# URLs can point at local stub servers for testing.
+RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY", "")
+JSEARCH_URL = os.getenv("JSEARCH_URL", "https://jsearch.p.rapidapi.com")
+ADZUNA_APP_ID = os.getenv("ADZUNA_APP_ID", "")
+ADZUNA_API_KEY = os.getenv("ADZUNA_API_KEY", "")
+ADZUNA_COUNTRY = os.getenv("ADZUNA_COUNTRY", "us")
+ADZUNA_URL = os.getenv("ADZUNA_URL", "https://api.adzuna.com/v1/api")
+USAJOBS_API_KEY = os.getenv("USAJOBS_API_KEY", "")
+USAJOBS_EMAIL = os.getenv("USAJOBS_EMAIL", "")
+USAJOBS_URL = os.getenv("USAJOBS_URL", "https://data.usajobs.gov")
+
+# Seconds to cache provider results, and the per-request timeout
+JOB_SEARCH_CACHE_TTL = float(os.getenv("JOB_SEARCH_CACHE_TTL", "900"))
+JOB_SEARCH_TIMEOUT = float(os.getenv("JOB_SEARCH_TIMEOUT", "10"))
+
+# LLM gateway providers. Keys can also be sent per request; OLLAMA_URL can
+# point at any Ollama-compatible server.
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+OPENAI_URL = os.getenv("OPENAI_URL", "https://api.openai.com")
+ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
+ANTHROPIC_URL = os.getenv("ANTHROPIC_URL", "https://api.anthropic.com")
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+GEMINI_URL = os.getenv("GEMINI_URL", "https://generativelanguage.googleapis.com")
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+
+# Deep research: postings per LLM match call, match calls run at once, and
+# the most unanalyzed postings a single run sends to the LLM
+RESEARCH_BATCH_SIZE = int(os.getenv("RESEARCH_BATCH_SIZE", "5"))
+RESEARCH_CONCURRENCY = int(os.getenv("RESEARCH_CONCURRENCY", "3"))
+RESEARCH_MAX_JOBS = int(os.getenv("RESEARCH_MAX_JOBS", "60"))
+
+# Seconds a running research run stays claimed without a heartbeat; a run
+# whose worker died is taken over once its lease has expired
+RESEARCH_LEASE_SECONDS = float(os.getenv("RESEARCH_LEASE_SECONDS", "120"))
+
+# Estimated similarity (0-1) at which two applications count as the same posting
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.7"))
+
+# Seconds between follow-up reminder ticks (0 disables them)
+FOLLOWUP_TICK_INTERVAL = float(os.getenv("FOLLOWUP_TICK_INTERVAL", "300"))
+
+# Texts whose term vectors are kept in memory for match scoring
+MATCH_CACHE_ENTRIES = int(os.getenv("MATCH_CACHE_ENTRIES", "20000"))
+
+# Worker processes for resume and document parsing and PDF reports, and the
+# largest file parsed
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "2"))
+PARSE_MAX_BYTES = int(os.getenv("PARSE_MAX_BYTES", str(20 * 1024 * 1024)))
+
+# Stored files downloaded ahead while writing a backup, and uploaded at once
+# while restoring one
+BACKUP_CONCURRENCY = int(os.getenv("BACKUP_CONCURRENCY", "8"))
+
+# Rendered PDF reports kept in memory, keyed by a hash of their inputs
+REPORT_CACHE_ENTRIES = int(os.getenv("REPORT_CACHE_ENTRIES", "64"))
+
+# Requests taking at least this many seconds are logged as slow
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "1"))
+
+if DATA_BACKEND == "supabase" and (not SUPABASE_URL or not SUPABASE_KEY):
     print("Warning: SUPABASE_URL and SUPABASE_KEY must be set in .env file")
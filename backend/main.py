@@ -1,12 +1,42 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+
+from routes import applications, resumes, companies, files, sync, jobs, llm, matching, analytics, research, followups, reports, backup
+from services import metrics
+from services.supabase_client import close_supabase_client
+from services.storage import close_storage_http_client
+from services.job_search import job_search
+from services.llm import llm_gateway
+from services.documents import shutdown_parser_pool
+from services.blobs import blob_store
+from services.research import research as research_pipeline
+from services.followups import followups as followup_index
 
-from routes import applications, resumes, companies, files
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    blob_store.start()
+    followup_index.start()
+    research_pipeline.start_resuming()
+    yield
+    # Interrupted research runs can be resumed from their last checkpoint
+    await research_pipeline.close()
+    await followup_index.close()
+    # Release pooled Supabase connections on shutdown
+    close_supabase_client()
+    await close_storage_http_client()
+    await job_search.close()
+    await llm_gateway.close()
+    shutdown_parser_pool()
+    await blob_store.close()
 
 app = FastAPI(
     title="Job Command Center API",
     description="Backend API for Job Command Center application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend
@@ -16,13 +46,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Content-Range", "Content-Length", "Accept-Ranges", "X-LLM-Cache", "X-Prompt-Hash", "X-Duplicate-Of", "Content-Disposition", "X-Report-Cache"],
 )
 
+# Per-route latency, status and response size for /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
 app.include_router(applications.router, prefix="/api/applications", tags=["Applications"])
 app.include_router(resumes.router, prefix="/api/resumes", tags=["Resumes"])
 app.include_router(companies.router, prefix="/api/companies", tags=["Companies"])
 app.include_router(files.router, prefix="/api/files", tags=["Files"])
+app.include_router(sync.router, prefix="/api/sync", tags=["Sync"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+app.include_router(llm.router, prefix="/api/llm", tags=["LLM"])
+app.include_router(matching.router, prefix="/api/match", tags=["Matching"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["Analytics"])
+app.include_router(research.router, prefix="/api/research", tags=["Research"])
+app.include_router(followups.router, prefix="/api/followups", tags=["Follow-ups"])
+app.include_router(reports.router, prefix="/api/reports", tags=["Reports"])
+app.include_router(backup.router, prefix="/api", tags=["Backup"])
 
 @app.get("/")
 async def root():
@@ -32,6 +75,10 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,73 @@
+-- Baseline schema for the tables the API reads and writes.
+-- Safe to run against an existing project: every statement is idempotent.
+
+create table if not exists applications (
+    id uuid primary key default gen_random_uuid(),
+    company text not null,
+    title text not null,
+    location text,
+    region text,
+    job_url text,
+    salary text,
+    company_type text,
+    modality jsonb default '[]'::jsonb,
+    date_applied text,
+    status text default 'Applied',
+    status_history jsonb default '[]'::jsonb,
+    job_description text,
+    ai_analysis jsonb,
+    interview_prep jsonb,
+    quality jsonb,
+    tags jsonb default '[]'::jsonb,
+    notes text,
+    referral text,
+    application_source text,
+    resume_version text,
+    created_at timestamptz default now(),
+    updated_at timestamptz default now()
+);
+
+create table if not exists application_files (
+    id uuid primary key default gen_random_uuid(),
+    application_id uuid not null references applications (id) on delete cascade,
+    file_type text,
+    file_name text,
+    file_path text,
+    created_at timestamptz default now()
+);
+
+create table if not exists target_companies (
+    id uuid primary key default gen_random_uuid(),
+    name text not null,
+    category text,
+    priority integer default 3,
+    status text default 'Researching',
+    careers_url text,
+    research jsonb default '{}'::jsonb,
+    connections jsonb default '[]'::jsonb,
+    notes text,
+    created_at timestamptz default now(),
+    updated_at timestamptz default now()
+);
+
+create table if not exists resume_versions (
+    id uuid primary key default gen_random_uuid(),
+    name text not null,
+    description text,
+    target_roles text,
+    content text,
+    file_path text,
+    file_name text,
+    created_at timestamptz default now(),
+    updated_at timestamptz default now()
+);
+
+-- Added for the delta sync endpoint
+alter table resume_versions add column if not exists updated_at timestamptz default now();
+
+create table if not exists deleted_records (
+    id uuid primary key default gen_random_uuid(),
+    table_name text not null,
+    record_id uuid not null,
+    deleted_at timestamptz not null default now()
+);
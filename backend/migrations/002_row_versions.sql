@@ -0,0 +1,66 @@
+-- Row versions for optimistic concurrency, and a single-round-trip update
+-- that appends to status_history under the row lock.
+
+alter table applications add column if not exists version integer not null default 1;
+alter table target_companies add column if not exists version integer not null default 1;
+alter table resume_versions add column if not exists version integer not null default 1;
+
+-- Apply p_changes to one row and bump its version.
+-- Returns the updated row, or null if it does not exist. When
+-- p_expected_version is given and does not match, raises SQLSTATE PT409,
+-- which PostgREST returns as HTTP 409.
+create or replace function apply_row_update(
+    p_table text,
+    p_id uuid,
+    p_changes jsonb,
+    p_expected_version integer default null
+) returns jsonb
+language plpgsql
+as $$
+declare
+    current_row jsonb;
+    columns text;
+    assignments text;
+    result jsonb;
+begin
+    if p_table not in ('applications', 'target_companies', 'resume_versions') then
+        raise exception 'apply_row_update: unsupported table %', p_table;
+    end if;
+
+    execute format('select to_jsonb(t) from %I t where t.id = $1 for update', p_table)
+        into current_row using p_id;
+    if current_row is null then
+        return null;
+    end if;
+
+    if p_expected_version is not null and (current_row->>'version')::integer <> p_expected_version then
+        raise sqlstate 'PT409' using message = 'Row was modified by another request';
+    end if;
+
+    -- A status change appends to the history the row has now, not the one
+    -- the client last saw
+    if p_table = 'applications'
+        and p_changes ? 'status'
+        and (p_changes->>'status') is distinct from (current_row->>'status') then
+        p_changes := p_changes || jsonb_build_object(
+            'status_history',
+            coalesce(current_row->'status_history', '[]'::jsonb) || jsonb_build_array(
+                jsonb_build_object('status', p_changes->>'status', 'date', p_changes->>'updated_at')
+            )
+        );
+    end if;
+
+    p_changes := (p_changes - 'id') || jsonb_build_object('version', (current_row->>'version')::integer + 1);
+
+    select string_agg(quote_ident(key), ', '), string_agg('r.' || quote_ident(key), ', ')
+        into columns, assignments
+        from jsonb_object_keys(p_changes) as key;
+
+    execute format(
+        'update %I t set (%s) = (select %s from jsonb_populate_record(t, $1) r) where t.id = $2 returning to_jsonb(t)',
+        p_table, columns, assignments
+    ) into result using p_changes, p_id;
+
+    return result;
+end;
+$$;
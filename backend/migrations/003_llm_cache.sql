@@ -0,0 +1,11 @@
+-- Responses from the /api/llm gateway, keyed by a hash of the provider,
+-- model, generation settings and normalized messages.
+
+create table if not exists llm_cache (
+    key text primary key,
+    provider text not null,
+    model text not null,
+    content text not null,
+    created_at timestamptz not null default now()
+);
+create index if not exists idx_llm_cache_created on llm_cache (created_at);
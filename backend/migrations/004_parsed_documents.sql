@@ -0,0 +1,14 @@
+-- Text and basic info extracted from uploaded resumes and application files,
+-- keyed by the SHA-256 of the file so identical uploads are parsed once.
+
+create table if not exists parsed_documents (
+    sha256 text primary key,
+    file_name text,
+    text text not null,
+    info jsonb,
+    created_at timestamptz not null default now()
+);
+
+alter table resume_versions add column if not exists parsed_info jsonb;
+alter table resume_versions add column if not exists content_hash text;
+alter table application_files add column if not exists content_hash text;
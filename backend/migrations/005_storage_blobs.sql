@@ -0,0 +1,18 @@
+-- Content-addressed file storage. Each stored object lives at
+-- blobs/<aa>/<sha256> in its bucket and is referenced by the file_path of
+-- the application_files and resume_versions rows that use it.
+
+create table if not exists storage_blobs (
+    bucket text not null,
+    sha256 text not null,
+    size bigint,
+    content_type text,
+    created_at timestamptz not null default now(),
+    last_used_at timestamptz not null default now(),
+    primary key (bucket, sha256)
+);
+create index if not exists idx_storage_blobs_last_used on storage_blobs (last_used_at);
+
+-- Reference lookups when collecting unreferenced blobs
+create index if not exists idx_application_files_path on application_files (file_path);
+create index if not exists idx_resume_versions_path on resume_versions (file_path);
@@ -0,0 +1,22 @@
+-- Indexes for the queries the API runs. Lists page by keyset on
+-- (sort column, id), sync and the in-memory indexes pull rows by
+-- updated_at, and tags/modality get GIN indexes for containment filters
+-- (PostgREST `cs`, i.e. `tags @> '["remote"]'`).
+-- Run `python migrations/check_plans.py` to confirm no query seq-scans.
+
+create index if not exists idx_applications_created on applications (created_at, id);
+create index if not exists idx_applications_updated on applications (updated_at);
+create index if not exists idx_applications_status on applications (status, created_at);
+create index if not exists idx_applications_tags on applications using gin (tags jsonb_path_ops);
+create index if not exists idx_applications_modality on applications using gin (modality jsonb_path_ops);
+
+create index if not exists idx_application_files_application on application_files (application_id);
+create index if not exists idx_application_files_created on application_files (created_at);
+
+create index if not exists idx_target_companies_priority on target_companies (priority, id);
+create index if not exists idx_target_companies_updated on target_companies (updated_at);
+
+create index if not exists idx_resume_versions_created on resume_versions (created_at, id);
+create index if not exists idx_resume_versions_updated on resume_versions (updated_at);
+
+create index if not exists idx_deleted_records_deleted on deleted_records (deleted_at);
@@ -0,0 +1,38 @@
+-- Deep research runs and the postings they have already seen.
+--
+-- A run records the output of each completed stage in checkpoints, so an
+-- interrupted run picks up after its last finished stage. Seen postings are
+-- keyed by the resume they were analyzed against (a hash of its text) and a
+-- fingerprint of the normalized company, title and location; a posting
+-- whose analysis is already stored isn't sent to the LLM again.
+
+create table if not exists research_runs (
+    id uuid primary key default gen_random_uuid(),
+    resume_id uuid references resume_versions (id) on delete set null,
+    resume_text text not null,
+    scope text not null,
+    params jsonb not null default '{}'::jsonb,
+    status text not null default 'pending',
+    stage text,
+    checkpoints jsonb not null default '{}'::jsonb,
+    stats jsonb,
+    error text,
+    created_at timestamptz not null default now(),
+    updated_at timestamptz not null default now()
+);
+create index if not exists idx_research_runs_created on research_runs (created_at desc, id desc);
+-- Runs resumed when the server starts
+create index if not exists idx_research_runs_interrupted on research_runs (status) where status = 'interrupted';
+
+create table if not exists research_seen_jobs (
+    scope text not null,
+    fingerprint text not null,
+    posting jsonb not null,
+    analysis jsonb,
+    first_run_id uuid,
+    first_seen_at timestamptz not null default now(),
+    last_seen_at timestamptz not null default now(),
+    analyzed_at timestamptz,
+    primary key (scope, fingerprint)
+);
+create index if not exists idx_research_seen_jobs_last_seen on research_seen_jobs (last_seen_at);
@@ -0,0 +1,18 @@
+-- Follow-up reminders saved by the background tick (services.followups).
+--
+-- A reminder's id is a uuid5 of the record and its due time, so ticks
+-- from several workers, or a repeated tick, don't save it twice. The open
+-- reminder list pages through undismissed rows in (due_at, id) order.
+
+create table if not exists followup_reminders (
+    id uuid primary key,
+    kind text not null,
+    record_id uuid not null,
+    status text,
+    reason text,
+    due_at timestamptz not null,
+    created_at timestamptz not null default now(),
+    dismissed_at timestamptz
+);
+create index if not exists idx_followup_reminders_open on followup_reminders (due_at, id)
+    where dismissed_at is null;
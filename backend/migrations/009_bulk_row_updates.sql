@@ -0,0 +1,50 @@
+-- Bulk updates with the same per-row semantics as apply_row_update.
+--
+-- p_updates is a JSON array of {"id", "changes", "expected_version"}. Each
+-- item is applied with apply_row_update in its own subtransaction, in
+-- order, so a later item for the same id sees the earlier one's write and
+-- a failing item doesn't undo its neighbours. Returns one
+-- {"id", "status", "row", "error"} per item, where status is 'updated',
+-- 'not_found', 'conflict' (expected_version didn't match) or 'error'.
+create or replace function apply_row_updates(
+    p_table text,
+    p_updates jsonb
+) returns jsonb
+language plpgsql
+as $$
+declare
+    item jsonb;
+    updated jsonb;
+    results jsonb := '[]'::jsonb;
+begin
+    for item in select value from jsonb_array_elements(p_updates) loop
+        begin
+            updated := apply_row_update(
+                p_table,
+                (item->>'id')::uuid,
+                coalesce(item->'changes', '{}'::jsonb),
+                (item->>'expected_version')::integer
+            );
+            results := results || jsonb_build_array(jsonb_build_object(
+                'id', item->>'id',
+                'status', case when updated is null then 'not_found' else 'updated' end,
+                'row', updated
+            ));
+        exception
+            when sqlstate 'PT409' then
+                results := results || jsonb_build_array(jsonb_build_object(
+                    'id', item->>'id', 'status', 'conflict', 'error', 'Row was modified by another request'
+                ));
+            when invalid_text_representation then
+                results := results || jsonb_build_array(jsonb_build_object(
+                    'id', item->>'id', 'status', 'not_found'
+                ));
+            when others then
+                results := results || jsonb_build_array(jsonb_build_object(
+                    'id', item->>'id', 'status', 'error', 'error', sqlerrm
+                ));
+        end;
+    end loop;
+    return results;
+end;
+$$;
@@ -0,0 +1,4 @@
+-- Restoring a backup removes the sync tombstones of the rows it brings
+-- back, looking them up by the restored ids.
+
+create index if not exists idx_deleted_records_record on deleted_records (record_id);
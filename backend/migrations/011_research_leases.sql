@@ -0,0 +1,10 @@
+-- Leases on running research runs.
+--
+-- The worker executing a run renews heartbeat_at while it runs. A run left
+-- running by a worker that died without shutting down is taken over once
+-- its heartbeat is older than RESEARCH_LEASE_SECONDS; runs claimed before
+-- this migration have no heartbeat and are taken over at once.
+
+alter table research_runs add column if not exists heartbeat_at timestamptz;
+-- Running runs whose lease expired, resumed periodically
+create index if not exists idx_research_runs_lease on research_runs (heartbeat_at) where status = 'running';
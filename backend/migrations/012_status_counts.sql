@@ -0,0 +1,17 @@
+-- Applications per status in one grouped query, for the LLM export and the
+-- search summary report. Optionally limited to applications created since
+-- p_since and to the statuses in p_statuses. Applications without a status
+-- are counted under 'Unknown'.
+create or replace function application_status_counts(
+    p_since timestamptz default null,
+    p_statuses text[] default null
+) returns table (status text, count bigint)
+language sql
+stable
+as $$
+    select coalesce(a.status, 'Unknown'), count(*)
+    from applications a
+    where (p_since is null or a.created_at >= p_since)
+      and (p_statuses is null or a.status = any(p_statuses))
+    group by a.status
+$$;
@@ -0,0 +1,80 @@
+-- When each target company last changed status.
+--
+-- Company follow-ups were timed from updated_at, so any edit (a note, a new
+-- connection) pushed the next follow-up back. apply_row_update now stamps
+-- status_changed_at when a company's status changes, the way it appends to
+-- an application's status_history. Existing rows start from their last
+-- update, the best record of a status change they have.
+
+alter table target_companies add column if not exists status_changed_at timestamptz;
+update target_companies set status_changed_at = coalesce(updated_at, created_at) where status_changed_at is null;
+
+-- Apply p_changes to one row and bump its version.
+-- Returns the updated row, or null if it does not exist. When
+-- p_expected_version is given and does not match, raises SQLSTATE PT409,
+-- which PostgREST returns as HTTP 409.
+create or replace function apply_row_update(
+    p_table text,
+    p_id uuid,
+    p_changes jsonb,
+    p_expected_version integer default null
+) returns jsonb
+language plpgsql
+as $$
+declare
+    current_row jsonb;
+    columns text;
+    assignments text;
+    result jsonb;
+begin
+    if p_table not in ('applications', 'target_companies', 'resume_versions') then
+        raise exception 'apply_row_update: unsupported table %', p_table;
+    end if;
+
+    execute format('select to_jsonb(t) from %I t where t.id = $1 for update', p_table)
+        into current_row using p_id;
+    if current_row is null then
+        return null;
+    end if;
+
+    if p_expected_version is not null and (current_row->>'version')::integer <> p_expected_version then
+        raise sqlstate 'PT409' using message = 'Row was modified by another request';
+    end if;
+
+    -- A status change appends to the history the row has now, not the one
+    -- the client last saw
+    if p_table = 'applications'
+        and p_changes ? 'status'
+        and (p_changes->>'status') is distinct from (current_row->>'status') then
+        p_changes := p_changes || jsonb_build_object(
+            'status_history',
+            coalesce(current_row->'status_history', '[]'::jsonb) || jsonb_build_array(
+                jsonb_build_object('status', p_changes->>'status', 'date', p_changes->>'updated_at')
+            )
+        );
+    end if;
+
+    -- Company follow-ups are timed from the last status change, so other
+    -- edits must not move it
+    if p_table = 'target_companies'
+        and p_changes ? 'status'
+        and (p_changes->>'status') is distinct from (current_row->>'status') then
+        p_changes := p_changes || jsonb_build_object(
+            'status_changed_at', coalesce(p_changes->>'updated_at', now()::text)
+        );
+    end if;
+
+    p_changes := (p_changes - 'id') || jsonb_build_object('version', (current_row->>'version')::integer + 1);
+
+    select string_agg(quote_ident(key), ', '), string_agg('r.' || quote_ident(key), ', ')
+        into columns, assignments
+        from jsonb_object_keys(p_changes) as key;
+
+    execute format(
+        'update %I t set (%s) = (select %s from jsonb_populate_record(t, $1) r) where t.id = $2 returning to_jsonb(t)',
+        p_table, columns, assignments
+    ) into result using p_changes, p_id;
+
+    return result;
+end;
+$$;
@@ -0,0 +1,207 @@
+"""Query-plan check for the API's database queries.
+
+Runs EXPLAIN on the SQL that each router and service sends through
+PostgREST, against a Postgres database with the migrations applied, and
+fails if any plan still reads a table with a sequential scan. Sequential
+scans are disabled for the session first, so the planner only picks one
+when no index can serve the query; an empty scratch database is enough.
+Queries that read a whole table by design (a full sync, counting every
+row) are marked and reported but don't fail the check.
+
+Run from backend/ against a scratch database (needs psycopg, from
+requirements-dev.txt):
+
+    python migrations/check_plans.py --dsn postgresql://localhost/jcc_check --apply
+    python migrations/check_plans.py --verbose
+
+--apply runs every migrations/*.sql file first. The DSN defaults to
+DATABASE_URL. Add a PlanCheck here when a route gains a new query shape.
+The test suite runs the check when TEST_DATABASE_URL names a scratch
+database.
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List
+
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+MIGRATIONS_DIR = Path(__file__).parent
+
+ID = "'00000000-0000-0000-0000-000000000001'"
+IDS = f"array[{ID}, '00000000-0000-0000-0000-000000000002']::uuid[]"
+TIME = "'2024-01-01T00:00:00'"
+HASH = "'" + "0" * 64 + "'"
+
+@dataclass
+class PlanCheck:
+    source: str  # the route or service that issues the query
+    sql: str
+    full_scan: bool = False  # reads the whole table by design
+
+def _pages(table: str, column: str, source: str) -> List[PlanCheck]:
+    """First and later pages of a keyset-paginated list (services.pagination)"""
+    order = f"order by {column} desc, id desc limit 101"
+    return [
+        PlanCheck(source, f"select * from {table} {order}"),
+        PlanCheck(
+            source,
+            f"select * from {table} where {column} < {TIME} or ({column} = {TIME} and id < {ID}) {order}"
+            if column != "priority" else
+            f"select * from {table} where priority < 3 or (priority = 3 and id < {ID}) {order}",
+        ),
+    ]
+
+CHECKS = [
+    *_pages("applications", "created_at", "GET /api/applications"),
+    PlanCheck("GET /api/applications/{id}", f"select * from applications where id = {ID}"),
+    PlanCheck("PUT /api/applications/bulk", f"select * from applications where id = any({IDS})"),
+    PlanCheck("POST /api/applications/bulk/delete", f"delete from applications where id = any({IDS})"),
+    PlanCheck("POST /api/applications/bulk/delete",
+              f"delete from application_files where application_id = any({IDS})"),
+    PlanCheck("GET /api/applications/{id}/files", f"select * from application_files where application_id = {ID}"),
+    PlanCheck("DELETE /api/applications/{id}", f"delete from application_files where application_id = {ID}"),
+    PlanCheck("GET /api/applications/export-for-llm",
+              "select company, title, status from applications "
+              f"where created_at >= {TIME} and status in ('Applied', 'Onsite') order by created_at desc limit 20"),
+    PlanCheck("services.stats.status_counts",
+              f"select status, count(*) from applications where created_at >= {TIME} group by status"),
+    PlanCheck("services.stats.status_counts",
+              "select status, count(*) from applications where status = any(array['Applied', 'Offer']) group by status"),
+    PlanCheck("services.stats.status_counts", "select status, count(*) from applications group by status",
+              full_scan=True),
+    PlanCheck("applications tag filter (PostgREST cs)", """select id from applications where tags @> '["remote"]'"""),
+    PlanCheck("applications modality filter (PostgREST cs)",
+              """select id from applications where modality @> '["Hybrid"]'"""),
+    PlanCheck("services.search / services.analytics refresh",
+              f"select id, status, status_history from applications where updated_at >= {TIME}"),
+    PlanCheck("services.search / services.analytics refresh",
+              f"select record_id from deleted_records where table_name = 'applications' and deleted_at >= {TIME}"),
+
+    *_pages("resume_versions", "created_at", "GET /api/resumes"),
+    PlanCheck("GET /api/resumes/{id}", f"select * from resume_versions where id = {ID}"),
+    PlanCheck("POST /api/match", f"select id, name, content from resume_versions where id = any({IDS})"),
+    PlanCheck("POST /api/match", "select id, name, content from resume_versions", full_scan=True),
+
+    *_pages("target_companies", "priority", "GET /api/companies"),
+    PlanCheck("GET /api/companies/{id}", f"select * from target_companies where id = {ID}"),
+
+    PlanCheck("GET /api/files/{id}", f"select * from application_files where id = {ID}"),
+    PlanCheck("GET /api/files/{id}/parsed", f"select sha256, text, info from parsed_documents where sha256 = {HASH}"),
+
+    PlanCheck("GET /api/sync", "select * from applications", full_scan=True),
+    PlanCheck("GET /api/sync?since", f"select * from applications where updated_at >= {TIME}"),
+    PlanCheck("GET /api/sync?since", f"select * from target_companies where updated_at >= {TIME}"),
+    PlanCheck("GET /api/sync?since",
+              f"select * from resume_versions where updated_at >= {TIME} "
+              f"or (updated_at is null and created_at >= {TIME})"),
+    PlanCheck("GET /api/sync?since", f"select * from application_files where created_at >= {TIME}"),
+    PlanCheck("GET /api/sync?since", f"select table_name, record_id from deleted_records where deleted_at >= {TIME}"),
+
+    PlanCheck("POST /api/llm", f"select content from llm_cache where key = {HASH}"),
+    PlanCheck("GET /api/research", "select id, status from research_runs order by created_at desc limit 20"),
+    PlanCheck("GET /api/research/{id}", f"select * from research_runs where id = {ID}"),
+    PlanCheck("POST /api/research/{id}/resume",
+              f"update research_runs set status = 'running' where id = {ID} "
+              "and (status = any(array['pending', 'interrupted', 'failed']) "
+              "or (status = 'running' and (heartbeat_at is null or heartbeat_at < now() - interval '2 minutes')))"),
+    PlanCheck("services.research.resume_interrupted",
+              "select * from research_runs where status = 'interrupted' "
+              "or (status = 'running' and (heartbeat_at is null or heartbeat_at < now() - interval '2 minutes'))"),
+    PlanCheck("services.research",
+              f"update research_runs set heartbeat_at = now() where id = {ID} and heartbeat_at = now()"),
+    PlanCheck("services.research",
+              f"select fingerprint, analysis from research_seen_jobs where scope = {HASH} "
+              f"and fingerprint = any(array[{HASH}, {HASH}])"),
+    PlanCheck("GET /api/reports/search-summary",
+              "select id, company, title, status from applications "
+              "where status = any(array['Applied', 'Offer']) order by created_at desc limit 15"),
+    PlanCheck("GET /api/backup", f"select * from applications where id > {ID} order by id limit 1000"),
+    PlanCheck("GET /api/backup",
+              f"select * from storage_blobs where bucket > 'resumes' or (bucket = 'resumes' and sha256 > {HASH}) "
+              "order by bucket, sha256 limit 1000"),
+    PlanCheck("GET /api/backup",
+              f"select * from research_seen_jobs where scope > {HASH} or (scope = {HASH} and fingerprint > {HASH}) "
+              "order by scope, fingerprint limit 1000"),
+    PlanCheck("GET /api/backup", f"select * from parsed_documents where sha256 > {HASH} order by sha256 limit 1000"),
+    PlanCheck("POST /api/restore", f"select id, version from applications where id = any({IDS})"),
+    PlanCheck("POST /api/restore",
+              f"delete from deleted_records where table_name = 'applications' and record_id = any({IDS})"),
+    PlanCheck("GET /api/followups/reminders",
+              "select * from followup_reminders where dismissed_at is null order by due_at, id limit 101"),
+    PlanCheck("GET /api/followups/reminders",
+              f"select * from followup_reminders where dismissed_at is null "
+              f"and (due_at > {TIME} or (due_at = {TIME} and id > {ID})) order by due_at, id limit 101"),
+    PlanCheck("POST /api/followups/reminders/{id}/dismiss",
+              f"update followup_reminders set dismissed_at = now() where id = {ID}"),
+    PlanCheck("services.followups.tick", f"select id from followup_reminders where id = any({IDS})"),
+    PlanCheck("services.blobs.store",
+              f"update storage_blobs set last_used_at = now() where bucket = 'resumes' and sha256 = {HASH}"),
+    PlanCheck("services.blobs.collect", f"select bucket, sha256 from storage_blobs where last_used_at < {TIME}"),
+    PlanCheck("services.blobs.collect",
+              "select file_path from application_files where file_path = any(array['blobs/00/0'])"),
+    PlanCheck("services.blobs.collect",
+              "select file_path from resume_versions where file_path = any(array['blobs/00/0'])"),
+]
+
+def seq_scans(plan: dict) -> Iterator[str]:
+    """Tables read by a Seq Scan anywhere in an EXPLAIN (FORMAT JSON) plan"""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from seq_scans(child)
+
+def apply_migrations(conn):
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        print(f"Applying {path.name}", file=sys.stderr)
+        conn.execute(path.read_text())
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL"), help="Postgres connection string")
+    parser.add_argument("--apply", action="store_true", help="run the migrations before checking")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args(argv)
+    if not args.dsn:
+        parser.error("pass --dsn or set DATABASE_URL")
+    return args
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if psycopg is None:
+        print("The plan check needs psycopg: pip install 'psycopg[binary]'", file=sys.stderr)
+        return 2
+
+    with psycopg.connect(args.dsn, autocommit=True) as conn:
+        if args.apply:
+            apply_migrations(conn)
+
+        failures = 0
+        conn.autocommit = False
+        conn.execute("set local enable_seqscan = off")
+        for check in CHECKS:
+            plan = conn.execute(f"explain (format json) {check.sql}").fetchone()[0][0]["Plan"]
+            scanned = sorted(set(seq_scans(plan)))
+            if not scanned:
+                status = "ok"
+            elif check.full_scan:
+                status = "full scan (expected)"
+            else:
+                status = "SEQ SCAN on " + ", ".join(scanned)
+                failures += 1
+            print(f"{status:<32} {check.source}: {check.sql}")
+            if args.verbose:
+                print(json.dumps(plan, indent=2))
+        conn.rollback()
+
+    print(f"\n{len(CHECKS)} queries checked, {failures} with sequential scans", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,12 @@
-from .application import Application, ApplicationCreate, ApplicationUpdate
+from .application import Application, ApplicationCreate, ApplicationUpdate, ApplicationBulkUpdate
 from .resume import ResumeVersion, ResumeVersionCreate, ResumeVersionUpdate
-from .company import TargetCompany, TargetCompanyCreate, TargetCompanyUpdate
+from .company import TargetCompany, TargetCompanyCreate, TargetCompanyUpdate, TargetCompanyBulkUpdate
+from .bulk import BulkDelete, BulkItemResult, BulkResult
+from .job import JobPosting, JobSearchError, JobSearchResult
+from .llm import LLMMessage, LLMRequest, LLMResponse
+from .match import MatchJob, MatchRequest, MatchResult, ResumeMatches, MatchResponse
+from .analytics import FunnelStage, StageTime, GroupRate, WeeklyVelocity, AnalyticsResponse
+from .research import ResearchRequest, ResearchResume, ResearchRunSummary, ResearchResult, ResearchRun
+from .duplicate import DuplicateApplication, DuplicateMatch, DuplicatePair, DuplicateGroup, DuplicateReport
+from .followup import Followup, FollowupsDue, FollowupReminder
+from .backup import RestoreResult
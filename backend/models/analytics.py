@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+
+class FunnelStage(BaseModel):
+    stage: str
+    count: int  # applications that reached this stage or a later one
+    conversion: float  # share of the previous stage's count
+
+class StageTime(BaseModel):
+    status: str
+    median_days: Optional[float] = None
+    transitions: int  # completed stays the median is taken over
+
+class GroupRate(BaseModel):
+    value: str
+    total: int
+    responded: int
+    response_rate: float
+    interview_rate: float
+
+class WeeklyVelocity(BaseModel):
+    week_start: str  # Monday
+    applications: int
+    responses: int
+    interviews: int
+
+class AnalyticsResponse(BaseModel):
+    total: int
+    status_counts: Dict[str, int]
+    response_rate: float
+    median_days_to_response: Optional[float] = None
+    responses: int
+    funnel: List[FunnelStage]
+    time_in_stage: List[StageTime]
+    response_rates: Dict[str, List[GroupRate]]  # by company_type, region, application_source, resume_version
+    velocity: List[WeeklyVelocity]
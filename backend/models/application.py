@@ -1,7 +1,15 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime, date
 
+# Mirrors STATUS_OPTIONS in src/constants/statusOptions.js
+STATUS_OPTIONS = [
+    "Applied", "Reviewed", "Phone Screen", "Technical", "Onsite",
+    "Offer", "Rejected", "Ghost", "Withdrawn",
+]
+ACTIVE_STATUSES = ["Applied", "Reviewed", "Phone Screen", "Technical", "Onsite"]
+INTERVIEW_STATUSES = ["Phone Screen", "Technical", "Onsite"]
+
 class StatusHistoryItem(BaseModel):
     status: str
     date: str
@@ -57,14 +65,33 @@ class ApplicationUpdate(BaseModel):
     application_source: Optional[str] = None
     resume_version: Optional[str] = None
 
+class ApplicationBulkUpdate(ApplicationUpdate):
+    id: str
+    # The row version last read; a stale one is reported as a conflict
+    version: Optional[int] = None
+
 class Application(ApplicationBase):
     id: str
     status_history: Optional[List[dict]] = []
     ai_analysis: Optional[dict] = None
     interview_prep: Optional[dict] = None
     quality: Optional[dict] = None
+    version: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+class ApplicationFileLink(BaseModel):
+    """Attaches already stored content to an application by its hash"""
+    sha256: str = Field(..., pattern="^[0-9a-f]{64}$")
+    file_type: str  # 'resume' or 'cover_letter'
+    file_name: str
+
+# Columns returned by the "summary" list shape (no large text/JSON blobs)
+APPLICATION_SUMMARY_FIELDS = [
+    "id", "company", "title", "location", "region", "salary", "company_type",
+    "modality", "date_applied", "status", "tags", "referral",
+    "application_source", "resume_version", "version", "created_at", "updated_at",
+]
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+class RestoreResult(BaseModel):
+    tables: Dict[str, int]  # rows written per table
+    files: Dict[str, int]  # files uploaded per bucket
+    errors: List[str] = []
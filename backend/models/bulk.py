@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class BulkDelete(BaseModel):
+    ids: List[str]
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    status: str  # 'created', 'updated', 'deleted', 'not_found', 'conflict' or 'error'
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
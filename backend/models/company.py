@@ -23,12 +23,25 @@ class TargetCompanyUpdate(BaseModel):
     connections: Optional[List[dict]] = None
     notes: Optional[str] = None
 
+class TargetCompanyBulkUpdate(TargetCompanyUpdate):
+    id: str
+    # The row version last read; a stale one is reported as a conflict
+    version: Optional[int] = None
+
 class TargetCompany(TargetCompanyBase):
     id: str
     research: Optional[dict] = None
     connections: Optional[List[dict]] = []
+    version: Optional[int] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    status_changed_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+# Columns returned by the "summary" list shape (no research/connections blobs)
+COMPANY_SUMMARY_FIELDS = [
+    "id", "name", "category", "priority", "status", "careers_url",
+    "version", "created_at", "updated_at", "status_changed_at",
+]
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class DuplicateApplication(BaseModel):
+    id: str
+    company: Optional[str] = None
+    title: Optional[str] = None
+    status: Optional[str] = None
+    created_at: Optional[str] = None
+
+class DuplicateMatch(DuplicateApplication):
+    similarity: float  # estimated Jaccard similarity of the postings' shingles
+
+class DuplicatePair(BaseModel):
+    a: str
+    b: str
+    similarity: float
+
+class DuplicateGroup(BaseModel):
+    similarity: float  # of the group's closest pair
+    applications: List[DuplicateApplication]  # oldest first
+    pairs: List[DuplicatePair]  # pairs at or above the threshold that link the group
+
+class DuplicateReport(BaseModel):
+    threshold: float
+    total: int
+    groups: List[DuplicateGroup]
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class Followup(BaseModel):
+    kind: str  # application or company
+    id: str  # the application or company
+    name: Optional[str] = None  # company name
+    title: Optional[str] = None  # job title, for applications
+    status: Optional[str] = None
+    reason: str
+    due_at: str
+    overdue: bool
+
+class FollowupsDue(BaseModel):
+    before: str
+    total: int
+    followups: List[Followup]  # soonest first
+
+class FollowupReminder(BaseModel):
+    id: str
+    kind: str
+    record_id: str
+    status: Optional[str] = None
+    reason: Optional[str] = None
+    due_at: str
+    created_at: Optional[str] = None
+    dismissed_at: Optional[str] = None
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class JobPosting(BaseModel):
+    id: str
+    title: str
+    company: str
+    location: Optional[str] = None
+    description: Optional[str] = None
+    salary: Optional[str] = None
+    job_type: Optional[str] = None
+    posted_date: Optional[str] = None
+    apply_url: Optional[str] = None
+    company_logo: Optional[str] = None
+    source: str
+    sources: List[str] = []  # every provider that returned this posting
+
+class JobSearchError(BaseModel):
+    provider: str
+    query: str
+    detail: str
+
+class JobSearchResult(BaseModel):
+    total: int
+    results: List[JobPosting]
+    errors: List[JobSearchError]
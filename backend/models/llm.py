@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+class LLMMessage(BaseModel):
+    role: str = Field(..., pattern="^(system|user|assistant)$")
+    content: str
+
+class LLMRequest(BaseModel):
+    provider: str  # 'openai', 'anthropic', 'gemini' or 'ollama'
+    model: Optional[str] = None  # provider default when omitted
+    messages: List[LLMMessage] = Field(..., min_length=1)
+    temperature: float = Field(0.7, ge=0, le=2)
+    max_tokens: int = Field(2000, ge=1, le=32000)
+    stream: bool = False
+    api_key: Optional[str] = None  # overrides the server's key for this provider
+    # Save the result into this application's ai_analysis under analysis_key
+    application_id: Optional[str] = None
+    analysis_key: str = Field("llm", pattern=r"^[A-Za-z0-9_]+$")
+
+class LLMResponse(BaseModel):
+    content: str
+    provider: str
+    model: str
+    prompt_hash: str
+    cached: bool
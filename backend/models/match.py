@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+class MatchJob(BaseModel):
+    """A posting to score that isn't saved as an application (e.g. from /api/jobs/search)"""
+    id: str
+    title: str
+    company: Optional[str] = None
+    description: Optional[str] = None
+
+class MatchRequest(BaseModel):
+    resume_ids: Optional[List[str]] = None  # default: every resume version with content
+    application_ids: Optional[List[str]] = None  # default: all applications unless jobs are given
+    jobs: List[MatchJob] = []
+    top_n: int = Field(20, ge=1, le=500)
+
+class MatchResult(BaseModel):
+    id: str
+    source: str  # 'application' or 'job'
+    title: Optional[str] = None
+    company: Optional[str] = None
+    score: float
+    matched_terms: List[str]
+
+class ResumeMatches(BaseModel):
+    resume_id: str
+    resume_name: str
+    results: List[MatchResult]
+
+class MatchResponse(BaseModel):
+    scored: int
+    resumes: List[ResumeMatches]
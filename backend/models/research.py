@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Any
+
+class ResearchRequest(BaseModel):
+    # The resume to research for: a saved version, or text sent directly
+    resume_id: Optional[str] = None
+    resume_text: Optional[str] = None
+    provider: str  # LLM provider, as for /api/llm
+    model: Optional[str] = None
+    api_key: Optional[str] = None  # used for this run only, never stored
+    location: str = ""  # default: the first target location from the resume analysis
+    providers: Optional[List[str]] = None  # job search providers (default: all configured)
+
+class ResearchResume(BaseModel):
+    api_key: Optional[str] = None
+
+class ResearchRunSummary(BaseModel):
+    id: str
+    resume_id: Optional[str] = None
+    status: str  # pending, running, completed, failed or interrupted
+    stage: Optional[str] = None  # last completed stage
+    stats: Optional[Dict[str, int]] = None
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    heartbeat_at: Optional[str] = None  # last lease renewal while running
+
+class ResearchResult(BaseModel):
+    fingerprint: str
+    posting: Dict[str, Any]
+    analysis: Optional[Dict[str, Any]] = None  # None until a run analyzes the posting
+    is_new: bool  # first found by this run
+    first_seen_at: Optional[str] = None
+
+class ResearchRun(ResearchRunSummary):
+    params: Dict[str, Any]
+    checkpoints: Dict[str, Any]
+    results: List[ResearchResult] = []
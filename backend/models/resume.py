@@ -23,7 +23,17 @@ class ResumeVersion(ResumeVersionBase):
     id: str
     file_path: Optional[str] = None
     file_name: Optional[str] = None
+    parsed_info: Optional[dict] = None
+    content_hash: Optional[str] = None
+    version: Optional[int] = None
     created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+# Columns returned by the "summary" list shape (no resume content)
+RESUME_SUMMARY_FIELDS = [
+    "id", "name", "description", "target_roles", "file_path", "file_name",
+    "version", "created_at", "updated_at",
+]
@@ -0,0 +1,31 @@
+from datetime import date
+
+from anyio import to_thread
+from fastapi import APIRouter, HTTPException, Query
+
+from models.analytics import AnalyticsResponse
+from services import analytics as analytics_service
+from services.analytics import analytics
+
+router = APIRouter()
+
+@router.get("", response_model=AnalyticsResponse)
+async def get_analytics(weeks: int = Query(8, ge=1, le=104)):
+    """Conversion funnel, median time in each status, response and interview
+    rates by company type, region, source and resume version, and weekly
+    velocity over the last `weeks` weeks.
+
+    Built from status_history, which is kept parsed in memory, and reused
+    until an application changes.
+    """
+    if not analytics_service.available():
+        raise HTTPException(status_code=503, detail="Analytics require numpy")
+
+    await analytics.ensure_current()
+    version, records = analytics.snapshot()
+    key = (version, weeks, date.today())
+    result = analytics.result(key)
+    if result is None:
+        result = await to_thread.run_sync(analytics_service.compute, records, weeks, key[2])
+        analytics.remember(key, result)
+    return result
@@ -1,153 +1,309 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Request, Response, Header
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
+import asyncio
 import uuid
 
-from models.application import Application, ApplicationCreate, ApplicationUpdate
+from models.application import (
+    Application, ApplicationCreate, ApplicationUpdate, ApplicationBulkUpdate, ApplicationFileLink,
+    APPLICATION_SUMMARY_FIELDS, ACTIVE_STATUSES, INTERVIEW_STATUSES,
+)
+from models.bulk import BulkDelete, BulkResult, BulkItemResult
+from models.duplicate import DuplicateReport
 from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.pagination import (
+    MAX_PAGE_SIZE, NDJSON_RESPONSES, JSON_MEDIA_TYPE, select_columns, paginate, split_page, encode_page,
+    page_headers, page_media_type,
+)
+from services.cache import response_cache, conditional_response
+from services.sync import record_deletions
+from services.stats import status_counts
+from services.blobs import blob_store
+from services.documents import parse_in_background
+from services import indexes
+from services.search import search_index
+from services import duplicates as duplicate_service
+from services.duplicates import duplicate_index
+from services.versioning import apply_update, version_etag
+from services.bulk import check_size, insert_many, update_many, delete_many, summarize
 
 router = APIRouter()
 
-@router.get("", response_model=List[Application])
-async def list_applications():
-    """Get all applications"""
-    supabase = get_supabase_client()
-    response = supabase.table("applications").select("*").order("created_at", desc=True).execute()
-    return response.data
-
-@router.post("", response_model=Application)
-async def create_application(application: ApplicationCreate):
-    """Create a new application"""
-    supabase = get_supabase_client()
-
+def _new_application_row(application: ApplicationCreate) -> dict:
     data = application.model_dump()
     data["id"] = str(uuid.uuid4())
     data["created_at"] = datetime.utcnow().isoformat()
     data["updated_at"] = datetime.utcnow().isoformat()
     data["status_history"] = [{"status": data.get("status", "Applied"), "date": datetime.utcnow().isoformat()}]
+    return data
+
+def _reindex(rows: List[dict], results: List[BulkItemResult], status: str):
+    """Update the in-memory indexes with the rows a bulk write accepted"""
+    written = {r.id for r in results if r.status == status}
+    for row in rows:
+        if row["id"] in written:
+            indexes.upsert("applications", row)
+
+@router.get("", response_model=List[Application], responses=NDJSON_RESPONSES)
+async def list_applications(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    shape: Optional[str] = Query(None, pattern="^(full|summary)$")
+):
+    """Get applications, newest first. Pass `limit` to page; the next page's
+    cursor is returned in the X-Next-Cursor header. Send
+    `Accept: application/x-ndjson` for one row per line."""
+    media_type = page_media_type(request)
+    cache_key = f"{media_type}?{request.url.query}"
+    entry = response_cache.get("applications", cache_key)
+    if entry is None:
+        generation = response_cache.generation("applications")
+        supabase = get_supabase_client()
+        columns = select_columns(Application, fields, shape, APPLICATION_SUMMARY_FIELDS, "created_at")
+        query = paginate(supabase.table("applications").select(columns), "created_at", cursor, limit)
+        result = await execute(query)
+        rows, next_cursor = split_page(result.data, "created_at", limit)
+        body = encode_page(rows, Application, columns, media_type)
+        entry = response_cache.put(
+            "applications", cache_key, body, page_headers(next_cursor), media_type, generation
+        )
+    return conditional_response(request, entry)
+
+def _duplicate_details(matches) -> List[dict]:
+    return [{**duplicate_index.docs[id], "similarity": round(similarity, 4)} for id, similarity in matches]
+
+@router.post("", response_model=Application, responses={409: {"description": "Near-duplicate rejected"}})
+async def create_application(
+    application: ApplicationCreate,
+    response: Response,
+    duplicates: str = Query("flag", pattern="^(flag|reject|allow)$",
+                            description="What to do when the posting looks like an existing application")
+):
+    """Create a new application.
 
-    response = supabase.table("applications").insert(data).execute()
-    return response.data[0]
-
-@router.get("/export-for-llm")
-async def export_for_llm():
-    """Export application data formatted for LLM chatbot feedback"""
+    The posting is checked against existing applications' company, title and
+    description. With `duplicates=flag` (the default) near-duplicates are
+    listed in the X-Duplicate-Of header; with `reject` the application isn't
+    created and the 409 lists them; `allow` skips the check.
+    """
     supabase = get_supabase_client()
 
-    # Get all applications
-    apps_response = supabase.table("applications").select("*").execute()
-    applications = apps_response.data
-
-    # Get all resumes
-    resumes_response = supabase.table("resume_versions").select("*").execute()
-    resumes = resumes_response.data
-
-    # Format for LLM
-    export_text = """# Job Search Summary for AI Feedback
+    data = _new_application_row(application)
+
+    matches = []
+    if duplicates != "allow" and duplicate_service.available():
+        await duplicate_index.ensure_current()
+        matches = duplicate_index.matches(data)
+        if matches and duplicates == "reject":
+            return JSONResponse(status_code=409, content={
+                "detail": "This posting looks like an application that already exists",
+                "duplicates": _duplicate_details(matches),
+            })
+
+    result = await execute(supabase.table("applications").insert(data))
+    response_cache.invalidate("applications")
+    indexes.upsert("applications", result.data[0])
+    if matches:
+        response.headers["X-Duplicate-Of"] = ",".join(id for id, _ in matches)
+    return result.data[0]
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_applications(applications: List[ApplicationCreate]):
+    """Create many applications with chunked multi-row inserts"""
+    check_size(applications)
+    rows = [_new_application_row(application) for application in applications]
+    results = await insert_many("applications", rows)
+    response_cache.invalidate("applications")
+    _reindex(rows, results, "created")
+    return summarize(results)
+
+@router.put("/bulk", response_model=BulkResult)
+async def bulk_update_applications(applications: List[ApplicationBulkUpdate]):
+    """Update many applications; each item names its application by `id`.
+    Items are applied like single PUTs, in order. An item that sends the
+    `version` it last read is reported as a `conflict` if the row has
+    changed since, instead of overwriting it."""
+    check_size(applications)
+    updated_at = datetime.utcnow().isoformat()
+    updates = [
+        (a.id, {**a.model_dump(exclude={"id", "version"}, exclude_none=True), "updated_at": updated_at}, a.version)
+        for a in applications
+    ]
+    results, rows = await update_many("applications", updates)
+    response_cache.invalidate("applications")
+    _reindex(rows, results, "updated")
+    return summarize(results)
+
+@router.post("/bulk/delete", response_model=BulkResult)
+async def bulk_delete_applications(request: BulkDelete):
+    """Delete many applications and their file records"""
+    check_size(request.ids)
+
+    files = await delete_many("application_files", request.ids, column="application_id")
+    deleted = {a["id"] for a in await delete_many("applications", request.ids)}
+    await blob_store.release("application-files", [f.get("file_path") for f in files])
+    response_cache.invalidate("applications")
+    for application_id in deleted:
+        indexes.remove("applications", application_id)
+
+    await record_deletions("application_files", [f["id"] for f in files])
+    await record_deletions("applications", deleted)
+
+    return summarize([
+        BulkItemResult(index=i, id=id, status="deleted" if id in deleted else "not_found")
+        for i, id in enumerate(request.ids)
+    ])
+
+EXPORT_DETAIL_FIELDS = "company,title,status,date_applied,location,company_type,job_description"
+
+def _render_export(total, status_counts, applications, resumes, description_chars):
+    """Yield the LLM export as markdown, one section at a time"""
+    active_count = sum(status_counts.get(s, 0) for s in ACTIVE_STATUSES)
+    interview_count = sum(status_counts.get(s, 0) for s in INTERVIEW_STATUSES)
+
+    yield f"""# Job Search Summary for AI Feedback
 
 ## Overview
-Total Applications: {total_apps}
-Active Applications: {active_apps}
-Interview Stage: {interview_apps}
-Offers: {offers}
-Rejections: {rejections}
+Total Applications: {total}
+Active Applications: {active_count}
+Interview Stage: {interview_count}
+Offers: {status_counts.get("Offer", 0)}
+Rejections: {status_counts.get("Rejected", 0)}
 
 ## Applications by Status
-{status_breakdown}
-
-## Detailed Application List
-{applications_detail}
-
-## Resume Versions
-{resumes_detail}
-
-## Questions for AI Feedback:
-1. Based on my application patterns, what should I focus on?
-2. Are there any gaps in my job search strategy?
-3. What can I improve in my approach?
-4. Which applications should I prioritize for follow-up?
 """
+    yield "\n".join([f"- {status}: {count}" for status, count in status_counts.items()])
 
-    # Calculate stats
-    status_counts = {}
+    yield "\n\n## Detailed Application List\n"
+    if not applications:
+        yield "No applications yet"
     for app in applications:
-        status = app.get("status", "Unknown")
-        status_counts[status] = status_counts.get(status, 0) + 1
-
-    active_statuses = ["Applied", "Reviewed", "Phone Screen", "Technical", "Onsite"]
-    active_count = sum(status_counts.get(s, 0) for s in active_statuses)
-    interview_count = sum(status_counts.get(s, 0) for s in ["Phone Screen", "Technical", "Onsite"])
-
-    # Format status breakdown
-    status_breakdown = "\n".join([f"- {status}: {count}" for status, count in status_counts.items()])
-
-    # Format applications detail
-    apps_detail = []
-    for app in applications[:20]:  # Limit to 20 most recent
-        apps_detail.append(f"""
+        description = app.get('job_description', '') or ''
+        yield f"""
 ### {app.get('company', 'Unknown')} - {app.get('title', 'Unknown')}
 - Status: {app.get('status', 'Unknown')}
 - Applied: {app.get('date_applied', 'Unknown')}
 - Location: {app.get('location', 'Not specified')}
 - Company Type: {app.get('company_type', 'Not specified')}
-- Job Description: {(app.get('job_description', '') or '')[:500]}{'...' if len(app.get('job_description', '') or '') > 500 else ''}
-""")
+- Job Description: {description[:description_chars]}{'...' if len(description) > description_chars else ''}
+"""
 
-    # Format resumes
-    resumes_detail = []
+    yield "\n\n## Resume Versions\n"
+    if not resumes:
+        yield "No resumes uploaded"
     for resume in resumes:
-        resumes_detail.append(f"""
+        yield f"""
 ### {resume.get('name', 'Unnamed Resume')}
 - Target Roles: {resume.get('target_roles', 'Not specified')}
 - Description: {resume.get('description', 'No description')}
-""")
-
-    formatted_export = export_text.format(
-        total_apps=len(applications),
-        active_apps=active_count,
-        interview_apps=interview_count,
-        offers=status_counts.get("Offer", 0),
-        rejections=status_counts.get("Rejected", 0),
-        status_breakdown=status_breakdown,
-        applications_detail="\n".join(apps_detail) if apps_detail else "No applications yet",
-        resumes_detail="\n".join(resumes_detail) if resumes_detail else "No resumes uploaded"
+"""
+
+    yield """
+
+## Questions for AI Feedback:
+1. Based on my application patterns, what should I focus on?
+2. Are there any gaps in my job search strategy?
+3. What can I improve in my approach?
+4. Which applications should I prioritize for follow-up?
+"""
+
+@router.get("/export-for-llm")
+async def export_for_llm(
+    request: Request,
+    days: Optional[int] = Query(None, ge=1, description="Only include applications created in the last N days"),
+    status: Optional[List[str]] = Query(None, description="Only include these statuses"),
+    limit: int = Query(20, ge=0, le=200, description="Number of applications to detail"),
+    description_chars: int = Query(500, ge=0, le=10000, description="Job description characters per application")
+):
+    """Export application data formatted for LLM chatbot feedback, streamed as
+    markdown. Clients sending `Accept: application/json` get the earlier
+    `{"text", "format"}` object instead."""
+    supabase = get_supabase_client()
+    since = (datetime.utcnow() - timedelta(days=days)).isoformat() if days else None
+
+    # Only the most recent applications are detailed, so only those are fetched
+    detail_query = supabase.table("applications").select(EXPORT_DETAIL_FIELDS)
+    if since:
+        detail_query = detail_query.gte("created_at", since)
+    if status:
+        detail_query = detail_query.in_("status", status)
+    detail_query = detail_query.order("created_at", desc=True).limit(limit)
+
+    (total, counts), details, resumes = await asyncio.gather(
+        status_counts(since, status),
+        execute(detail_query),
+        execute(supabase.table("resume_versions").select("name,target_roles,description").order("created_at", desc=True))
     )
 
-    return {"text": formatted_export, "format": "markdown"}
+    sections = _render_export(total, counts, details.data, resumes.data, description_chars)
+    headers = {"Vary": "Accept"}
+    if JSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return JSONResponse({"text": "".join(sections), "format": "markdown"}, headers=headers)
+    return StreamingResponse(sections, media_type="text/markdown", headers=headers)
+
+@router.get("/search")
+async def search_applications(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """Ranked full-text search over company, title, tags, notes and job
+    description. Matches are wrapped in <mark> in `highlights`."""
+    await search_index.ensure_current()
+    total, results = search_index.search(q, limit, offset)
+    return {"total": total, "limit": limit, "offset": offset, "results": results}
+
+@router.get("/duplicates", response_model=DuplicateReport)
+async def duplicate_report(
+    threshold: Optional[float] = Query(None, ge=0.3, le=1.0, description="Minimum similarity (default: server setting)")
+):
+    """Groups of applications that look like the same posting, closest first.
+    Candidates come from the near-duplicate index's LSH buckets, so this
+    doesn't compare every pair of applications."""
+    if not duplicate_service.available():
+        raise HTTPException(status_code=503, detail="Duplicate detection requires numpy")
+    await duplicate_index.ensure_current()
+    threshold = threshold if threshold is not None else duplicate_service.DUPLICATE_THRESHOLD
+    groups = duplicate_index.groups(threshold)
+    return {"threshold": threshold, "total": len(groups), "groups": groups}
 
 @router.get("/{application_id}", response_model=Application)
-async def get_application(application_id: str):
-    """Get a single application"""
+async def get_application(application_id: str, response: Response):
+    """Get a single application; the ETag is its row version"""
     supabase = get_supabase_client()
-    response = supabase.table("applications").select("*").eq("id", application_id).execute()
+    result = await execute(supabase.table("applications").select("*").eq("id", application_id))
 
-    if not response.data:
+    if not result.data:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    return response.data[0]
+    response.headers["ETag"] = version_etag(result.data[0])
+    return result.data[0]
 
 @router.put("/{application_id}", response_model=Application)
-async def update_application(application_id: str, application: ApplicationUpdate):
-    """Update an application"""
-    supabase = get_supabase_client()
-
-    # Get existing application
-    existing = supabase.table("applications").select("*").eq("id", application_id).execute()
-    if not existing.data:
-        raise HTTPException(status_code=404, detail="Application not found")
-
+async def update_application(
+    application_id: str,
+    application: ApplicationUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """Update an application in one round trip. A status change is appended
+    to status_history atomically. Send the ETag from a previous read as
+    If-Match to get a 409 instead of overwriting a newer version."""
     data = {k: v for k, v in application.model_dump().items() if v is not None}
     data["updated_at"] = datetime.utcnow().isoformat()
 
-    # If status changed, update status history
-    if "status" in data and data["status"] != existing.data[0].get("status"):
-        history = existing.data[0].get("status_history", []) or []
-        history.append({"status": data["status"], "date": datetime.utcnow().isoformat()})
-        data["status_history"] = history
+    row = await apply_update("applications", application_id, data, if_match)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Application not found")
 
-    response = supabase.table("applications").update(data).eq("id", application_id).execute()
-    return response.data[0]
+    response_cache.invalidate("applications")
+    indexes.upsert("applications", row)
+    response.headers["ETag"] = version_etag(row)
+    return row
 
 @router.delete("/{application_id}")
 async def delete_application(application_id: str):
@@ -155,10 +311,17 @@ async def delete_application(application_id: str):
     supabase = get_supabase_client()
 
     # Delete associated files first
-    supabase.table("application_files").delete().eq("application_id", application_id).execute()
+    files = await execute(supabase.table("application_files").delete().eq("application_id", application_id))
 
     # Delete the application
-    response = supabase.table("applications").delete().eq("id", application_id).execute()
+    response = await execute(supabase.table("applications").delete().eq("id", application_id))
+    response_cache.invalidate("applications")
+    indexes.remove("applications", application_id)
+    await blob_store.release("application-files", [f.get("file_path") for f in files.data])
+
+    # Leave tombstones for clients that sync later
+    await record_deletions("application_files", [f["id"] for f in files.data])
+    await record_deletions("applications", [a["id"] for a in response.data])
 
     return {"message": "Application deleted"}
 
@@ -168,36 +331,50 @@ async def upload_application_file(
     file: UploadFile = File(...),
     file_type: str = Form(...)  # 'resume' or 'cover_letter'
 ):
-    """Upload a file to an application"""
+    """Upload a file to an application. The file is parsed in the
+    background once it is stored."""
     supabase = get_supabase_client()
 
     # Verify application exists
-    app_check = supabase.table("applications").select("id").eq("id", application_id).execute()
+    app_check = await execute(supabase.table("applications").select("id").eq("id", application_id))
     if not app_check.data:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    # Read file content
-    content = await file.read()
-    file_path = f"applications/{application_id}/{file_type}/{file.filename}"
+    # Stream to Supabase Storage unless the same content is already stored
+    content_hash, file_path = await blob_store.store("application-files", file)
+    return await _attach_file(application_id, file_type, file.filename, file_path, content_hash)
 
-    # Upload to Supabase Storage
-    storage_response = supabase.storage.from_("application-files").upload(
-        file_path,
-        content,
-        {"content-type": file.content_type}
-    )
+@router.post("/{application_id}/files/by-hash")
+async def attach_application_file(application_id: str, link: ApplicationFileLink):
+    """Attach content that is already stored, without uploading it again.
+    Returns 404 if the content isn't stored; upload the file instead."""
+    supabase = get_supabase_client()
+
+    app_check = await execute(supabase.table("applications").select("id").eq("id", application_id))
+    if not app_check.data:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    file_path = await blob_store.reuse("application-files", link.sha256)
+    if file_path is None:
+        raise HTTPException(status_code=404, detail="Content not stored")
+    return await _attach_file(application_id, link.file_type, link.file_name, file_path, link.sha256)
+
+async def _attach_file(application_id: str, file_type: str, file_name: str, file_path: str, content_hash: str) -> dict:
+    supabase = get_supabase_client()
+    parse_in_background("application-files", file_path, content_hash, file_name)
 
     # Save file record to database
     file_record = {
         "id": str(uuid.uuid4()),
         "application_id": application_id,
         "file_type": file_type,
-        "file_name": file.filename,
+        "file_name": file_name,
         "file_path": file_path,
+        "content_hash": content_hash,
         "created_at": datetime.utcnow().isoformat()
     }
 
-    supabase.table("application_files").insert(file_record).execute()
+    await execute(supabase.table("application_files").insert(file_record))
 
     return {"message": "File uploaded", "file_path": file_path}
 
@@ -205,5 +382,5 @@ async def upload_application_file(
 async def list_application_files(application_id: str):
     """List files for an application"""
     supabase = get_supabase_client()
-    response = supabase.table("application_files").select("*").eq("application_id", application_id).execute()
+    response = await execute(supabase.table("application_files").select("*").eq("application_id", application_id))
     return response.data
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from models.backup import RestoreResult
+from services.backup import archive, restore, InvalidArchive
+
+router = APIRouter()
+
+@router.get("/backup")
+async def backup():
+    """Download everything as a .tar.gz: one NDJSON file per table page and
+    every stored resume and application file. The archive is streamed as it
+    is built."""
+    file_name = f"job-command-center-backup-{datetime.utcnow().date().isoformat()}.tar.gz"
+    return StreamingResponse(
+        archive(),
+        media_type="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"', "Cache-Control": "no-store"},
+    )
+
+@router.post("/restore", response_model=RestoreResult)
+async def restore_backup(request: Request):
+    """Restore a backup sent as the request body (the .tar.gz from
+    GET /api/backup). Rows are upserted in chunks by primary key, so rows
+    not in the backup are kept; files are uploaded in parallel. Rows or
+    files that fail are listed in `errors`."""
+    try:
+        return await restore(request.stream())
+    except InvalidArchive as e:
+        raise HTTPException(status_code=400, detail=f"Not a valid backup: {e}")
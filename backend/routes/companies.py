@@ -1,64 +1,159 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response, Header
+from typing import List, Optional
 from datetime import datetime
 import uuid
 
-from models.company import TargetCompany, TargetCompanyCreate, TargetCompanyUpdate
+from models.company import TargetCompany, TargetCompanyCreate, TargetCompanyUpdate, TargetCompanyBulkUpdate, COMPANY_SUMMARY_FIELDS
+from models.bulk import BulkDelete, BulkResult, BulkItemResult
 from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.pagination import (
+    MAX_PAGE_SIZE, NDJSON_RESPONSES, select_columns, paginate, split_page, encode_page, page_headers, page_media_type,
+)
+from services.cache import response_cache, conditional_response
+from services.sync import record_deletions
+from services.versioning import apply_update, version_etag
+from services.bulk import check_size, insert_many, update_many, delete_many, summarize
+from services import indexes
 
 router = APIRouter()
 
-@router.get("", response_model=List[TargetCompany])
-async def list_companies():
-    """Get all target companies"""
-    supabase = get_supabase_client()
-    response = supabase.table("target_companies").select("*").order("priority", desc=True).execute()
-    return response.data
-
-@router.post("", response_model=TargetCompany)
-async def create_company(company: TargetCompanyCreate):
-    """Create a new target company"""
-    supabase = get_supabase_client()
-
+def _new_company_row(company: TargetCompanyCreate) -> dict:
     data = company.model_dump()
     data["id"] = str(uuid.uuid4())
     data["created_at"] = datetime.utcnow().isoformat()
     data["updated_at"] = datetime.utcnow().isoformat()
+    data["status_changed_at"] = data["created_at"]
     data["connections"] = []
     data["research"] = {}
+    return data
 
-    response = supabase.table("target_companies").insert(data).execute()
-    return response.data[0]
+def _reindex(rows: List[dict], results: List[BulkItemResult], status: str):
+    """Update the in-memory indexes with the rows a bulk write accepted"""
+    written = {r.id for r in results if r.status == status}
+    for row in rows:
+        if row["id"] in written:
+            indexes.upsert("target_companies", row)
 
-@router.get("/{company_id}", response_model=TargetCompany)
-async def get_company(company_id: str):
-    """Get a single target company"""
+@router.get("", response_model=List[TargetCompany], responses=NDJSON_RESPONSES)
+async def list_companies(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    shape: Optional[str] = Query(None, pattern="^(full|summary)$")
+):
+    """Get target companies by priority. Pass `limit` to page; the next page's
+    cursor is returned in the X-Next-Cursor header. Send
+    `Accept: application/x-ndjson` for one row per line."""
+    media_type = page_media_type(request)
+    cache_key = f"{media_type}?{request.url.query}"
+    entry = response_cache.get("target_companies", cache_key)
+    if entry is None:
+        generation = response_cache.generation("target_companies")
+        supabase = get_supabase_client()
+        columns = select_columns(TargetCompany, fields, shape, COMPANY_SUMMARY_FIELDS, "priority")
+        query = paginate(supabase.table("target_companies").select(columns), "priority", cursor, limit)
+        result = await execute(query)
+        rows, next_cursor = split_page(result.data, "priority", limit)
+        body = encode_page(rows, TargetCompany, columns, media_type)
+        entry = response_cache.put(
+            "target_companies", cache_key, body, page_headers(next_cursor), media_type, generation
+        )
+    return conditional_response(request, entry)
+
+@router.post("", response_model=TargetCompany)
+async def create_company(company: TargetCompanyCreate):
+    """Create a new target company"""
     supabase = get_supabase_client()
-    response = supabase.table("target_companies").select("*").eq("id", company_id).execute()
 
-    if not response.data:
-        raise HTTPException(status_code=404, detail="Company not found")
+    data = _new_company_row(company)
 
+    response = await execute(supabase.table("target_companies").insert(data))
+    response_cache.invalidate("target_companies")
+    indexes.upsert("target_companies", response.data[0])
     return response.data[0]
 
-@router.put("/{company_id}", response_model=TargetCompany)
-async def update_company(company_id: str, company: TargetCompanyUpdate):
-    """Update a target company"""
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_companies(companies: List[TargetCompanyCreate]):
+    """Create many target companies with chunked multi-row inserts"""
+    check_size(companies)
+    rows = [_new_company_row(company) for company in companies]
+    results = await insert_many("target_companies", rows)
+    response_cache.invalidate("target_companies")
+    _reindex(rows, results, "created")
+    return summarize(results)
+
+@router.put("/bulk", response_model=BulkResult)
+async def bulk_update_companies(companies: List[TargetCompanyBulkUpdate]):
+    """Update many target companies; each item names its company by `id`.
+    An item that sends the `version` it last read is reported as a
+    `conflict` if the row has changed since, instead of overwriting it."""
+    check_size(companies)
+    updated_at = datetime.utcnow().isoformat()
+    updates = [
+        (c.id, {**c.model_dump(exclude={"id", "version"}, exclude_none=True), "updated_at": updated_at}, c.version)
+        for c in companies
+    ]
+    results, rows = await update_many("target_companies", updates)
+    response_cache.invalidate("target_companies")
+    _reindex(rows, results, "updated")
+    return summarize(results)
+
+@router.post("/bulk/delete", response_model=BulkResult)
+async def bulk_delete_companies(request: BulkDelete):
+    """Delete many target companies"""
+    check_size(request.ids)
+    deleted = {c["id"] for c in await delete_many("target_companies", request.ids)}
+    response_cache.invalidate("target_companies")
+    for company_id in deleted:
+        indexes.remove("target_companies", company_id)
+    await record_deletions("target_companies", deleted)
+
+    return summarize([
+        BulkItemResult(index=i, id=id, status="deleted" if id in deleted else "not_found")
+        for i, id in enumerate(request.ids)
+    ])
+
+@router.get("/{company_id}", response_model=TargetCompany)
+async def get_company(company_id: str, response: Response):
+    """Get a single target company; the ETag is its row version"""
     supabase = get_supabase_client()
+    result = await execute(supabase.table("target_companies").select("*").eq("id", company_id))
 
-    existing = supabase.table("target_companies").select("*").eq("id", company_id).execute()
-    if not existing.data:
+    if not result.data:
         raise HTTPException(status_code=404, detail="Company not found")
 
+    response.headers["ETag"] = version_etag(result.data[0])
+    return result.data[0]
+
+@router.put("/{company_id}", response_model=TargetCompany)
+async def update_company(
+    company_id: str,
+    company: TargetCompanyUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """Update a target company in one round trip. Send the ETag from a
+    previous read as If-Match to get a 409 instead of overwriting."""
     data = {k: v for k, v in company.model_dump().items() if v is not None}
     data["updated_at"] = datetime.utcnow().isoformat()
 
-    response = supabase.table("target_companies").update(data).eq("id", company_id).execute()
-    return response.data[0]
+    row = await apply_update("target_companies", company_id, data, if_match)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    response_cache.invalidate("target_companies")
+    indexes.upsert("target_companies", row)
+    response.headers["ETag"] = version_etag(row)
+    return row
 
 @router.delete("/{company_id}")
 async def delete_company(company_id: str):
     """Delete a target company"""
     supabase = get_supabase_client()
-    supabase.table("target_companies").delete().eq("id", company_id).execute()
+    response = await execute(supabase.table("target_companies").delete().eq("id", company_id))
+    response_cache.invalidate("target_companies")
+    indexes.remove("target_companies", company_id)
+    await record_deletions("target_companies", [c["id"] for c in response.data])
     return {"message": "Company deleted"}
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-import io
+from fastapi import APIRouter, HTTPException, Request
 
 from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.sync import record_deletions
+from services.storage import download_stream
+from services.blobs import blob_store
+from services.documents import cached_parse
 
 router = APIRouter()
 
@@ -10,20 +13,36 @@ router = APIRouter()
 async def get_file_info(file_id: str):
     """Get file metadata"""
     supabase = get_supabase_client()
-    response = supabase.table("application_files").select("*").eq("id", file_id).execute()
+    response = await execute(supabase.table("application_files").select("*").eq("id", file_id))
 
     if not response.data:
         raise HTTPException(status_code=404, detail="File not found")
 
     return response.data[0]
 
+@router.get("/{file_id}/parsed")
+async def get_parsed_file(file_id: str):
+    """Get the text and basic info extracted from a file when it was uploaded"""
+    supabase = get_supabase_client()
+    file_info = await execute(supabase.table("application_files").select("content_hash").eq("id", file_id))
+
+    if not file_info.data:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    content_hash = file_info.data[0].get("content_hash")
+    parsed = await cached_parse(content_hash) if content_hash else None
+    if parsed is None:
+        raise HTTPException(status_code=404, detail="No parsed text for this file")
+
+    return parsed
+
 @router.get("/{file_id}/download")
-async def download_file(file_id: str):
-    """Download a file"""
+async def download_file(file_id: str, request: Request):
+    """Download a file (supports Range requests)"""
     supabase = get_supabase_client()
 
     # Get file info
-    file_info = supabase.table("application_files").select("*").eq("id", file_id).execute()
+    file_info = await execute(supabase.table("application_files").select("*").eq("id", file_id))
 
     if not file_info.data:
         raise HTTPException(status_code=404, detail="File not found")
@@ -31,14 +50,8 @@ async def download_file(file_id: str):
     file_path = file_info.data[0]["file_path"]
     file_name = file_info.data[0]["file_name"]
 
-    # Download from storage
-    file_data = supabase.storage.from_("application-files").download(file_path)
-
-    return StreamingResponse(
-        io.BytesIO(file_data),
-        media_type="application/octet-stream",
-        headers={"Content-Disposition": f"attachment; filename={file_name}"}
-    )
+    # Stream from storage
+    return await download_stream("application-files", file_path, file_name, request.headers.get("range"))
 
 @router.delete("/{file_id}")
 async def delete_file(file_id: str):
@@ -46,20 +59,14 @@ async def delete_file(file_id: str):
     supabase = get_supabase_client()
 
     # Get file info
-    file_info = supabase.table("application_files").select("*").eq("id", file_id).execute()
+    file_info = await execute(supabase.table("application_files").select("*").eq("id", file_id))
 
     if not file_info.data:
         raise HTTPException(status_code=404, detail="File not found")
 
-    file_path = file_info.data[0]["file_path"]
-
-    # Delete from storage
-    try:
-        supabase.storage.from_("application-files").remove([file_path])
-    except:
-        pass  # File might not exist in storage
-
-    # Delete database record
-    supabase.table("application_files").delete().eq("id", file_id).execute()
+    # Delete database record; shared content is collected once unreferenced
+    await execute(supabase.table("application_files").delete().eq("id", file_id))
+    await blob_store.release("application-files", [file_info.data[0]["file_path"]])
+    await record_deletions("application_files", [file_id])
 
     return {"message": "File deleted"}
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from datetime import datetime, time, timezone
+
+from models.followup import FollowupsDue, FollowupReminder
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.pagination import paginate, split_page
+from services.followups import followups, REMINDER_TABLE
+
+router = APIRouter()
+
+def _end_of_today() -> datetime:
+    return datetime.combine(datetime.now(timezone.utc).date(), time.max, tzinfo=timezone.utc)
+
+@router.get("/due", response_model=FollowupsDue)
+async def due_followups(
+    before: Optional[datetime] = Query(None, description="ISO time (default: end of today, UTC)"),
+    kind: Optional[str] = Query(None, pattern="^(application|company)$"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Applications and target companies due a follow-up before a time,
+    soonest (most overdue) first. Reads a due-time index, so the cost
+    depends on how many are due rather than on how many records exist."""
+    before = before or _end_of_today()
+    if before.tzinfo is None:
+        before = before.replace(tzinfo=timezone.utc)
+    await followups.ensure_current()
+    total, items = followups.due(before.timestamp(), limit, kind)
+    return {"before": before.isoformat(), "total": total, "followups": items}
+
+@router.get("/reminders", response_model=List[FollowupReminder])
+async def list_reminders(limit: int = Query(100, ge=1, le=1000)):
+    """Undismissed reminders saved by the background tick, oldest due first.
+    Reminders for records that have since moved on (a new status, or
+    deleted) are left out, and further pages are read until `limit`
+    current ones are found."""
+    supabase = get_supabase_client()
+    await followups.ensure_current()
+    reminders, cursor = [], None
+    while len(reminders) < limit:
+        query = supabase.table(REMINDER_TABLE).select("*").is_("dismissed_at", "null")
+        result = await execute(paginate(query, "due_at", cursor, limit, desc=False))
+        rows, cursor = split_page(result.data, "due_at", limit)
+        reminders.extend(r for r in rows if followups.is_current(r))
+        if not cursor:
+            break
+    return reminders[:limit]
+
+@router.post("/reminders/{reminder_id}/dismiss", response_model=FollowupReminder)
+async def dismiss_reminder(reminder_id: str):
+    """Dismiss a reminder"""
+    supabase = get_supabase_client()
+    result = await execute(
+        supabase.table(REMINDER_TABLE)
+        .update({"dismissed_at": datetime.utcnow().isoformat()})
+        .eq("id", reminder_id)
+    )
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Reminder not found")
+    return result.data[0]
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+
+from models.job import JobSearchResult
+from services.job_search import job_search
+
+router = APIRouter()
+
+DEFAULT_KEYWORDS = ["pharmaceutical scientist", "biotech"]
+MAX_KEYWORDS = 5
+
+@router.get("/providers")
+async def list_providers():
+    """List job search providers and whether each is configured"""
+    return [
+        {"name": name, "label": provider.label, "configured": provider.configured()}
+        for name, provider in job_search.providers.items()
+    ]
+
+@router.get("/search", response_model=JobSearchResult)
+async def search_jobs(
+    keywords: Optional[List[str]] = Query(None, description="Search terms, each searched separately"),
+    location: str = "",
+    page: int = Query(1, ge=1, le=50),
+    providers: Optional[List[str]] = Query(None, description="Providers to search (default: all configured)")
+):
+    """Search every selected provider for every keyword concurrently.
+    Postings found by more than one provider are merged; failed provider
+    searches are listed in `errors` rather than failing the request."""
+    keywords = [k.strip() for k in keywords or DEFAULT_KEYWORDS if k.strip()]
+    if not keywords or len(keywords) > MAX_KEYWORDS:
+        raise HTTPException(status_code=400, detail=f"Pass between 1 and {MAX_KEYWORDS} keywords")
+
+    if providers:
+        unknown = [p for p in providers if p not in job_search.providers]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown providers: {', '.join(unknown)}")
+        unconfigured = [p for p in providers if not job_search.providers[p].configured()]
+        if unconfigured:
+            raise HTTPException(status_code=400, detail=f"Providers not configured: {', '.join(unconfigured)}")
+    elif not job_search.available():
+        raise HTTPException(status_code=503, detail="No job search providers are configured")
+
+    results, errors = await job_search.search(keywords, location, page, providers)
+    return {"total": len(results), "results": results, "errors": errors}
@@ -0,0 +1,124 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+
+from models.llm import LLMRequest, LLMResponse
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.cache import response_cache
+from services.llm import llm_gateway, prompt_hash, LLMError
+from services.versioning import apply_update, version_etag
+
+router = APIRouter()
+
+# Attempts to merge into ai_analysis when another write keeps winning the race
+SAVE_ATTEMPTS = 3
+
+async def _require_application(application_id: str):
+    supabase = get_supabase_client()
+    result = await execute(supabase.table("applications").select("id").eq("id", application_id))
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Application not found")
+
+async def _save_analysis(application_id: str, analysis_key: str, entry: dict):
+    """Merge entry into the application's ai_analysis under analysis_key"""
+    supabase = get_supabase_client()
+    for attempt in range(SAVE_ATTEMPTS):
+        result = await execute(supabase.table("applications").select("ai_analysis,version").eq("id", application_id))
+        if not result.data:
+            raise HTTPException(status_code=404, detail="Application not found")
+        row = result.data[0]
+        current = row.get("ai_analysis") or {}
+        if (current.get(analysis_key) or {}).get("prompt_hash") == entry["prompt_hash"]:
+            # Already saved, e.g. by a coalesced request for the same prompt
+            return
+        analysis = {**current, analysis_key: entry}
+        changes = {"ai_analysis": analysis, "updated_at": datetime.utcnow().isoformat()}
+        try:
+            await apply_update("applications", application_id, changes, if_match=version_etag(row))
+            break
+        except HTTPException as e:
+            if e.status_code != 409 or attempt == SAVE_ATTEMPTS - 1:
+                raise
+    response_cache.invalidate("applications")
+
+def _analysis_entry(content: str, provider: str, model: str, key: str) -> dict:
+    return {
+        "content": content,
+        "provider": provider,
+        "model": model,
+        "prompt_hash": key,
+        "analyzed_at": datetime.utcnow().isoformat(),
+    }
+
+async def _replay(content: str):
+    yield content
+
+@router.get("/providers")
+async def list_providers():
+    """List LLM providers, their default models and whether the server has credentials"""
+    return [
+        {"name": name, "label": p.label, "default_model": p.default_model, "configured": p.configured()}
+        for name, p in llm_gateway.providers.items()
+    ]
+
+@router.post("", response_model=LLMResponse)
+async def complete(request: LLMRequest):
+    """Run a chat completion through the gateway.
+
+    Responses are cached by provider, model, settings and normalized prompt,
+    so repeating a prompt doesn't call the provider again. With `stream` the
+    text is returned as it is generated (X-LLM-Cache says whether it came
+    from the cache). With `application_id` the result is also saved into the
+    application's ai_analysis under `analysis_key`.
+    """
+    provider = llm_gateway.provider(request.provider, request.api_key)
+    model = request.model or provider.default_model
+    messages = [m.model_dump() for m in request.messages]
+    if request.application_id:
+        await _require_application(request.application_id)
+
+    if not request.stream:
+        try:
+            content, key, cached = await llm_gateway.complete(
+                provider, model, messages, request.temperature, request.max_tokens, request.api_key
+            )
+        except LLMError as e:
+            raise HTTPException(status_code=502, detail=str(e))
+        if request.application_id:
+            await _save_analysis(request.application_id, request.analysis_key,
+                                 _analysis_entry(content, provider.name, model, key))
+        return {"content": content, "provider": provider.name, "model": model, "prompt_hash": key, "cached": cached}
+
+    key = prompt_hash(provider.name, model, messages, request.temperature, request.max_tokens)
+    cached = await llm_gateway.cached(key)
+    if cached is not None:
+        pieces = _replay(cached)
+    else:
+        pieces = llm_gateway.stream(
+            provider, key, model, messages, request.temperature, request.max_tokens, request.api_key
+        )
+
+    # Pull the first piece here so provider errors still become a 502
+    try:
+        first = await pieces.__anext__()
+    except StopAsyncIteration:
+        first = ""
+    except LLMError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    async def body():
+        text = [first]
+        yield first
+        async for piece in pieces:
+            text.append(piece)
+            yield piece
+        if request.application_id:
+            await _save_analysis(request.application_id, request.analysis_key,
+                                 _analysis_entry("".join(text), provider.name, model, key))
+
+    return StreamingResponse(
+        body(),
+        media_type="text/plain; charset=utf-8",
+        headers={"X-LLM-Cache": "hit" if cached is not None else "miss", "X-Prompt-Hash": key},
+    )
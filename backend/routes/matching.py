@@ -0,0 +1,66 @@
+from anyio import to_thread
+from fastapi import APIRouter, HTTPException
+
+from models.match import MatchRequest, MatchResponse
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.search import search_index
+from services import matching
+
+router = APIRouter()
+
+def _job_text(title, description) -> str:
+    return f"{title or ''}\n{description or ''}"
+
+@router.post("", response_model=MatchResponse)
+async def match(request: MatchRequest):
+    """Rank applications and/or posted jobs against resume versions.
+
+    Scores are TF-IDF cosine similarities between 0 and 1, computed locally,
+    with the shared terms that contributed most. Applications are scored
+    when `application_ids` is given or no `jobs` are sent. Use the top of
+    each ranking as the shortlist for LLM analysis.
+    """
+    if not matching.available():
+        raise HTTPException(status_code=503, detail="Match scoring requires numpy")
+
+    supabase = get_supabase_client()
+    query = supabase.table("resume_versions").select("id,name,content")
+    if request.resume_ids:
+        query = query.in_("id", request.resume_ids)
+    resumes = [r for r in (await execute(query)).data if (r.get("content") or "").strip()]
+    if not resumes:
+        raise HTTPException(status_code=400, detail="No resume versions with content to match against")
+
+    # Application descriptions come from the search index, which is already in memory
+    candidates = []
+    if request.application_ids is not None or not request.jobs:
+        await search_index.ensure_current()
+        wanted = set(request.application_ids) if request.application_ids is not None else None
+        for doc in search_index.docs.values():
+            if wanted is None or doc["id"] in wanted:
+                candidates.append(("application", doc["id"], doc["title"], doc["company"], doc.get("job_description")))
+    candidates.extend(("job", j.id, j.title, j.company, j.description) for j in request.jobs)
+
+    # Tokenizing uncached texts is CPU work, so it runs off the event loop
+    scores = await to_thread.run_sync(
+        matching.score,
+        [r["content"] for r in resumes],
+        [_job_text(title, description) for _, _, title, _, description in candidates],
+    )
+
+    ranked = []
+    for r, resume in enumerate(resumes):
+        results = []
+        for j in scores.top(r, request.top_n):
+            source, job_id, title, company, _ = candidates[j]
+            results.append({
+                "id": job_id,
+                "source": source,
+                "title": title,
+                "company": company,
+                "score": round(float(scores.matrix[j, r]), 4),
+                "matched_terms": scores.matched_terms(j, r),
+            })
+        ranked.append({"resume_id": resume["id"], "resume_name": resume["name"], "results": results})
+    return {"scored": len(candidates), "resumes": ranked}
@@ -0,0 +1,98 @@
+import re
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from models.application import STATUS_OPTIONS
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.cache import etag_matches
+from services.stats import status_counts
+from services import report_pdf
+from services import reports
+from services.reports import report_cache, report_key
+
+router = APIRouter()
+
+PREP_COLUMNS = ("id,company,title,location,date_applied,status,status_history,referral,"
+                "resume_version,interview_prep,job_description,updated_at")
+SUMMARY_COLUMNS = "id,company,title,status,created_at"
+
+# Active applications listed on the summary, most recent first
+SUMMARY_ACTIVE_LIMIT = 15
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^\w-]+", "-", value.strip().lower()).strip("-") or "application"
+
+def _is_uuid(value) -> bool:
+    try:
+        uuid.UUID(str(value))
+        return True
+    except ValueError:
+        return False
+
+async def _pdf_response(request: Request, kind: str, inputs: tuple, file_name: str, render, *args):
+    if not reports.available():
+        raise HTTPException(status_code=503, detail="PDF reports require reportlab")
+    key = report_key(kind, *inputs)
+    etag = f'"{key[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    # The PDF is already in memory, so it is sent in one body with its length
+    pdf, cached = await report_cache.render(key, render, *args)
+    return Response(pdf, media_type="application/pdf", headers={
+        **headers,
+        "Content-Disposition": f'attachment; filename="{file_name}"',
+        "X-Report-Cache": "hit" if cached else "miss",
+    })
+
+@router.get("/interview-prep/{application_id}")
+async def interview_prep_report(application_id: str, request: Request):
+    """Interview preparation brief for an application as a PDF: quick info,
+    status timeline, prep notes and the archived job description. The ETag
+    is a hash of the report's inputs, so If-None-Match gets a 304 until the
+    application or its resume version changes."""
+    supabase = get_supabase_client()
+    result = await execute(supabase.table("applications").select(PREP_COLUMNS).eq("id", application_id))
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Application not found")
+    application = result.data[0]
+
+    resume_name = None
+    if _is_uuid(application.get("resume_version")):
+        resume = await execute(
+            supabase.table("resume_versions").select("name").eq("id", application["resume_version"])
+        )
+        resume_name = resume.data[0].get("name") if resume.data else None
+
+    generated = report_pdf.format_date(datetime.utcnow())
+    file_name = f"interview-prep-{_slug(application.get('company') or '')}.pdf"
+    return await _pdf_response(
+        request, "interview-prep", (application, resume_name, generated), file_name,
+        report_pdf.interview_prep, application, resume_name, generated,
+    )
+
+@router.get("/search-summary")
+async def search_summary_report(request: Request):
+    """Job search summary as a PDF: key metrics, counts by status and the
+    most recent active applications. Counts come from one grouped query, so the
+    report's cost doesn't grow with the number of applications."""
+    supabase = get_supabase_client()
+    total, by_status = await status_counts()
+    active = [s for s in STATUS_OPTIONS if s not in report_pdf.INACTIVE_STATUSES]
+    result = await execute(
+        supabase.table("applications").select(SUMMARY_COLUMNS).in_("status", active)
+        .order("created_at", desc=True).limit(SUMMARY_ACTIVE_LIMIT)
+    )
+
+    now = datetime.utcnow()
+    generated = report_pdf.format_date(now)
+    file_name = f"job-search-summary-{now.date().isoformat()}.pdf"
+    return await _pdf_response(
+        request, "search-summary", (total, by_status, result.data, generated), file_name,
+        report_pdf.search_summary, total, by_status, result.data, generated,
+    )
@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+
+from models.research import ResearchRequest, ResearchResume, ResearchRunSummary, ResearchRun
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.job_search import job_search
+from services.llm import llm_gateway
+from services.research import research, RUNS_TABLE
+
+router = APIRouter()
+
+SUMMARY_COLUMNS = "id,resume_id,status,stage,stats,error,created_at,updated_at,heartbeat_at"
+
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_SECONDS = 15
+
+def _sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+async def _get_run(run_id: str, columns: str = "*") -> dict:
+    supabase = get_supabase_client()
+    result = await execute(supabase.table(RUNS_TABLE).select(columns).eq("id", run_id))
+    if not result.data:
+        raise HTTPException(status_code=404, detail="Research run not found")
+    return result.data[0]
+
+@router.get("", response_model=List[ResearchRunSummary])
+async def list_runs(limit: int = Query(20, ge=1, le=100)):
+    """Get research runs, newest first"""
+    supabase = get_supabase_client()
+    result = await execute(
+        supabase.table(RUNS_TABLE).select(SUMMARY_COLUMNS).order("created_at", desc=True).limit(limit)
+    )
+    return result.data
+
+@router.post("", response_model=ResearchRunSummary)
+async def start_run(request: ResearchRequest):
+    """Start a deep research run for a resume version or resume text.
+
+    The run executes in the background; follow it with
+    GET /{id}/events. Postings analyzed for the same resume text by earlier
+    runs are not analyzed again.
+    """
+    if (request.resume_id is None) == (request.resume_text is None):
+        raise HTTPException(status_code=400, detail="Pass either resume_id or resume_text")
+    llm_gateway.provider(request.provider, request.api_key)
+    if request.providers:
+        unknown = [p for p in request.providers if p not in job_search.providers]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown providers: {', '.join(unknown)}")
+    elif not job_search.available():
+        raise HTTPException(status_code=503, detail="No job search providers are configured")
+
+    resume_text = request.resume_text
+    if request.resume_id is not None:
+        supabase = get_supabase_client()
+        result = await execute(supabase.table("resume_versions").select("content").eq("id", request.resume_id))
+        if not result.data:
+            raise HTTPException(status_code=404, detail="Resume version not found")
+        resume_text = result.data[0].get("content")
+    if not (resume_text or "").strip():
+        raise HTTPException(status_code=400, detail="The resume has no text to research")
+
+    params = {"provider": request.provider, "model": request.model,
+              "location": request.location, "providers": request.providers}
+    return await research.create(resume_text, request.resume_id, params, request.api_key)
+
+@router.get("/{run_id}", response_model=ResearchRun)
+async def get_run(run_id: str):
+    """Get a run with its stage checkpoints and its postings, best match first"""
+    row = await _get_run(run_id)
+    return {**row, "results": await research.results(row)}
+
+@router.post("/{run_id}/resume", response_model=ResearchRunSummary)
+async def resume_run(run_id: str, request: Optional[ResearchResume] = None):
+    """Continue an interrupted or failed run from its last finished stage.
+    Pass the api_key again if the run was started with one."""
+    row = await _get_run(run_id)
+    if row["status"] == "completed":
+        raise HTTPException(status_code=409, detail="Research run is already complete")
+    claimed = await research.start(row, request.api_key if request else None)
+    if claimed is None:
+        raise HTTPException(status_code=409, detail="Research run is already running")
+    return claimed
+
+@router.get("/{run_id}/events")
+async def run_events(run_id: str):
+    """Server-sent progress events for a run.
+
+    `progress` events carry the stage, step, percentage and a message, and
+    the stream ends with `done`, `error` or `interrupted`. A run that isn't
+    executing in this process gets a single `status` event with its saved
+    state.
+    """
+    await _get_run(run_id, "id")
+
+    async def events():
+        queue = research.subscribe(run_id)
+        try:
+            if not research.running(run_id):
+                row = await _get_run(run_id, SUMMARY_COLUMNS)
+                yield _sse({"type": "status", "run_id": run_id, **row})
+                return
+            latest = research.latest(run_id)
+            if latest is not None:
+                yield _sse(latest)
+                if latest["type"] != "progress":
+                    return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(event)
+                if event["type"] != "progress":
+                    return
+        finally:
+            research.unsubscribe(run_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,21 +1,49 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query, Request, Response, Header
 from typing import List, Optional
 from datetime import datetime
 import uuid
-import io
 
-from models.resume import ResumeVersion, ResumeVersionCreate, ResumeVersionUpdate
+from models.resume import ResumeVersion, ResumeVersionCreate, ResumeVersionUpdate, RESUME_SUMMARY_FIELDS
 from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.pagination import (
+    MAX_PAGE_SIZE, NDJSON_RESPONSES, select_columns, paginate, split_page, encode_page, page_headers, page_media_type,
+)
+from services.cache import response_cache, conditional_response
+from services.sync import record_deletions
+from services.storage import download_stream
+from services.blobs import blob_store
+from services.documents import parse_upload
+from services.versioning import apply_update, version_etag
 
 router = APIRouter()
 
-@router.get("", response_model=List[ResumeVersion])
-async def list_resumes():
-    """Get all resume versions"""
-    supabase = get_supabase_client()
-    response = supabase.table("resume_versions").select("*").order("created_at", desc=True).execute()
-    return response.data
+@router.get("", response_model=List[ResumeVersion], responses=NDJSON_RESPONSES)
+async def list_resumes(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
+    shape: Optional[str] = Query(None, pattern="^(full|summary)$")
+):
+    """Get resume versions, newest first. Pass `limit` to page; the next page's
+    cursor is returned in the X-Next-Cursor header. Send
+    `Accept: application/x-ndjson` for one row per line."""
+    media_type = page_media_type(request)
+    cache_key = f"{media_type}?{request.url.query}"
+    entry = response_cache.get("resume_versions", cache_key)
+    if entry is None:
+        generation = response_cache.generation("resume_versions")
+        supabase = get_supabase_client()
+        columns = select_columns(ResumeVersion, fields, shape, RESUME_SUMMARY_FIELDS, "created_at")
+        query = paginate(supabase.table("resume_versions").select(columns), "created_at", cursor, limit)
+        result = await execute(query)
+        rows, next_cursor = split_page(result.data, "created_at", limit)
+        body = encode_page(rows, ResumeVersion, columns, media_type)
+        entry = response_cache.put(
+            "resume_versions", cache_key, body, page_headers(next_cursor), media_type, generation
+        )
+    return conditional_response(request, entry)
 
 @router.post("")
 async def create_resume(
@@ -25,90 +53,93 @@ async def create_resume(
     content: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None)
 ):
-    """Create a new resume version with optional file upload"""
+    """Create a new resume version with optional file upload. Text is
+    extracted from PDF, DOCX and text files and used as the content unless
+    content is also sent."""
     supabase = get_supabase_client()
 
     resume_id = str(uuid.uuid4())
     file_path = None
     file_name = None
+    content_hash = None
 
-    # Handle file upload if provided
+    # Handle file upload if provided; content already stored isn't sent again
     if file:
-        file_content = await file.read()
-        file_path = f"resumes/{resume_id}/{file.filename}"
+        content_hash, file_path = await blob_store.store("resumes", file)
         file_name = file.filename
 
-        supabase.storage.from_("resumes").upload(
-            file_path,
-            file_content,
-            {"content-type": file.content_type}
-        )
+    # Text extracted from the file fills in content when none was given
+    parsed = await parse_upload(file, content_hash) if file else None
 
     data = {
         "id": resume_id,
         "name": name,
         "description": description,
         "target_roles": target_roles,
-        "content": content,
+        "content": content if content is not None or parsed is None else parsed["text"],
+        "parsed_info": parsed["info"] if parsed else None,
+        "content_hash": content_hash,
         "file_path": file_path,
         "file_name": file_name,
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": datetime.utcnow().isoformat(),
+        "updated_at": datetime.utcnow().isoformat()
     }
 
-    response = supabase.table("resume_versions").insert(data).execute()
+    response = await execute(supabase.table("resume_versions").insert(data))
+    response_cache.invalidate("resume_versions")
     return response.data[0]
 
 @router.get("/{resume_id}", response_model=ResumeVersion)
-async def get_resume(resume_id: str):
-    """Get a single resume version"""
+async def get_resume(resume_id: str, response: Response):
+    """Get a single resume version; the ETag is its row version"""
     supabase = get_supabase_client()
-    response = supabase.table("resume_versions").select("*").eq("id", resume_id).execute()
+    result = await execute(supabase.table("resume_versions").select("*").eq("id", resume_id))
 
-    if not response.data:
+    if not result.data:
         raise HTTPException(status_code=404, detail="Resume not found")
 
-    return response.data[0]
+    response.headers["ETag"] = version_etag(result.data[0])
+    return result.data[0]
 
 @router.put("/{resume_id}", response_model=ResumeVersion)
-async def update_resume(resume_id: str, resume: ResumeVersionUpdate):
-    """Update a resume version"""
-    supabase = get_supabase_client()
+async def update_resume(
+    resume_id: str,
+    resume: ResumeVersionUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None)
+):
+    """Update a resume version in one round trip. Send the ETag from a
+    previous read as If-Match to get a 409 instead of overwriting."""
+    data = {k: v for k, v in resume.model_dump().items() if v is not None}
+    data["updated_at"] = datetime.utcnow().isoformat()
 
-    existing = supabase.table("resume_versions").select("*").eq("id", resume_id).execute()
-    if not existing.data:
+    row = await apply_update("resume_versions", resume_id, data, if_match)
+    if row is None:
         raise HTTPException(status_code=404, detail="Resume not found")
 
-    data = {k: v for k, v in resume.model_dump().items() if v is not None}
-
-    response = supabase.table("resume_versions").update(data).eq("id", resume_id).execute()
-    return response.data[0]
+    response_cache.invalidate("resume_versions")
+    response.headers["ETag"] = version_etag(row)
+    return row
 
 @router.delete("/{resume_id}")
 async def delete_resume(resume_id: str):
     """Delete a resume version"""
     supabase = get_supabase_client()
 
-    # Get resume to find file path
-    existing = supabase.table("resume_versions").select("*").eq("id", resume_id).execute()
-
-    if existing.data and existing.data[0].get("file_path"):
-        # Delete file from storage
-        try:
-            supabase.storage.from_("resumes").remove([existing.data[0]["file_path"]])
-        except:
-            pass  # File might not exist
-
-    # Delete database record
-    supabase.table("resume_versions").delete().eq("id", resume_id).execute()
+    # Delete database record; its file is collected once nothing references it
+    response = await execute(supabase.table("resume_versions").delete().eq("id", resume_id))
+    response_cache.invalidate("resume_versions")
+    await blob_store.release("resumes", [r.get("file_path") for r in response.data])
+    await record_deletions("resume_versions", [r["id"] for r in response.data])
 
     return {"message": "Resume deleted"}
 
 @router.get("/{resume_id}/download")
-async def download_resume(resume_id: str):
-    """Download resume file"""
+async def download_resume(resume_id: str, request: Request):
+    """Download resume file (supports Range requests)"""
     supabase = get_supabase_client()
 
-    resume = supabase.table("resume_versions").select("*").eq("id", resume_id).execute()
+    resume = await execute(supabase.table("resume_versions").select("*").eq("id", resume_id))
 
     if not resume.data or not resume.data[0].get("file_path"):
         raise HTTPException(status_code=404, detail="Resume file not found")
@@ -116,46 +147,37 @@ async def download_resume(resume_id: str):
     file_path = resume.data[0]["file_path"]
     file_name = resume.data[0].get("file_name", "resume.pdf")
 
-    # Download from Supabase Storage
-    file_data = supabase.storage.from_("resumes").download(file_path)
-
-    return StreamingResponse(
-        io.BytesIO(file_data),
-        media_type="application/octet-stream",
-        headers={"Content-Disposition": f"attachment; filename={file_name}"}
-    )
+    # Stream from Supabase Storage
+    return await download_stream("resumes", file_path, file_name, request.headers.get("range"))
 
 @router.post("/{resume_id}/upload")
 async def upload_resume_file(resume_id: str, file: UploadFile = File(...)):
-    """Upload/replace resume file"""
+    """Upload/replace resume file; text extracted from it replaces the content"""
     supabase = get_supabase_client()
 
     # Verify resume exists
-    existing = supabase.table("resume_versions").select("*").eq("id", resume_id).execute()
+    existing = await execute(supabase.table("resume_versions").select("*").eq("id", resume_id))
     if not existing.data:
         raise HTTPException(status_code=404, detail="Resume not found")
 
-    # Delete old file if exists
-    if existing.data[0].get("file_path"):
-        try:
-            supabase.storage.from_("resumes").remove([existing.data[0]["file_path"]])
-        except:
-            pass
-
-    # Upload new file
-    file_content = await file.read()
-    file_path = f"resumes/{resume_id}/{file.filename}"
-
-    supabase.storage.from_("resumes").upload(
-        file_path,
-        file_content,
-        {"content-type": file.content_type}
-    )
+    # Upload new file unless its content is already stored
+    content_hash, file_path = await blob_store.store("resumes", file)
+    parsed = await parse_upload(file, content_hash)
 
     # Update database record
-    supabase.table("resume_versions").update({
+    changes = {
         "file_path": file_path,
-        "file_name": file.filename
-    }).eq("id", resume_id).execute()
+        "file_name": file.filename,
+        "content_hash": content_hash,
+        "updated_at": datetime.utcnow().isoformat()
+    }
+    if parsed:
+        changes.update(content=parsed["text"], parsed_info=parsed["info"])
+    await apply_update("resume_versions", resume_id, changes)
+    response_cache.invalidate("resume_versions")
+
+    # Release the old file once the row points at the new one
+    if existing.data[0].get("file_path") != file_path:
+        await blob_store.release("resumes", [existing.data[0].get("file_path")])
 
-    return {"message": "File uploaded", "file_path": file_path}
+    return {"message": "File uploaded", "file_path": file_path, "parsed": parsed is not None}
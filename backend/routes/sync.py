@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter
+
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.sync import TOMBSTONE_TABLE, encode_token, decode_token, changed_since
+
+router = APIRouter()
+
+# Response key -> (table, column that moves forward on every write)
+SYNCED_TABLES = {
+    "applications": ("applications", "updated_at"),
+    "companies": ("target_companies", "updated_at"),
+    "resumes": ("resume_versions", "updated_at"),
+    "files": ("application_files", "created_at"),
+}
+
+@router.get("")
+async def sync(since: Optional[str] = None):
+    """Get rows created, updated or deleted since a sync token.
+
+    Without `since` every row is returned. Pass the returned `token` on the
+    next call to receive only what changed in between.
+    """
+    supabase = get_supabase_client()
+    started_at = datetime.utcnow()
+    since_time = decode_token(since)
+
+    queries = []
+    for table, column in SYNCED_TABLES.values():
+        query = supabase.table(table).select("*")
+        if since_time:
+            cutoff = changed_since(since_time)
+            if table == "resume_versions":
+                # Older resume rows were never stamped with updated_at
+                query = query.or_(f'{column}.gte."{cutoff}",and({column}.is.null,created_at.gte."{cutoff}")')
+            else:
+                query = query.gte(column, cutoff)
+        queries.append(execute(query))
+
+    if since_time:
+        queries.append(execute(
+            supabase.table(TOMBSTONE_TABLE).select("table_name,record_id").gte("deleted_at", changed_since(since_time))
+        ))
+
+    results = await asyncio.gather(*queries)
+
+    deleted = {table: [] for table, _ in SYNCED_TABLES.values()}
+    if since_time:
+        for tombstone in results[-1].data:
+            deleted.setdefault(tombstone["table_name"], []).append(tombstone["record_id"])
+
+    changes = {"token": encode_token(started_at), "full": since_time is None}
+    for (key, (table, _)), result in zip(SYNCED_TABLES.items(), results):
+        changes[key] = {"upserted": result.data, "deleted": deleted[table]}
+    return changes
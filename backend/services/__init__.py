@@ -1 +1,2 @@
-from .supabase_client import get_supabase_client, supabase
+from .supabase_client import get_supabase_client, close_supabase_client, supabase
+from .database import run, execute
@@ -0,0 +1,301 @@
+"""Funnel, time-in-stage, response-rate and velocity analytics.
+
+Applications are kept in memory as columns: one slot per application holding
+its status code, when it was applied and interned codes for the fields
+analytics are grouped by, plus its status_history parsed into arrays of
+status codes and timestamps. The columns are fed by the applications feed in
+services.indexes, like the search index, so history is parsed once per write
+rather than on every dashboard load.
+
+Computing the analytics works on those arrays with NumPy (bincounts, ufunc.at
+reductions and masked medians), and the result is memoized until the next
+change. NumPy is required; without it ``available()`` is False and
+/api/analytics answers 503.
+"""
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from models.application import STATUS_OPTIONS, INTERVIEW_STATUSES
+from services import indexes
+
+# Mirrors statusOrder in the dashboard funnel
+FUNNEL_STAGES = ["Applied", "Reviewed", "Phone Screen", "Technical", "Onsite", "Offer"]
+GROUP_FIELDS = ("company_type", "region", "application_source", "resume_version")
+ANALYTICS_COLUMNS = "id,status,status_history,date_applied,version,created_at,updated_at," + ",".join(GROUP_FIELDS)
+
+# Status names by code; anything else shares the last code
+STATUS_NAMES = STATUS_OPTIONS + ["Unknown"]
+STATUS_CODES = {status: code for code, status in enumerate(STATUS_OPTIONS)}
+UNKNOWN = len(STATUS_OPTIONS)
+APPLIED = STATUS_CODES["Applied"]
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def available() -> bool:
+    return np is not None
+
+def _code(status: Optional[str]) -> int:
+    return STATUS_CODES.get(status, UNKNOWN)
+
+def _days(value) -> float:
+    """Days since the epoch for an ISO date or timestamp; NaN if unparseable"""
+    if not value:
+        return math.nan
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return math.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - EPOCH).total_seconds() / 86400
+
+@dataclass
+class Snapshot:
+    status: "np.ndarray"         # status code per application
+    applied: "np.ndarray"        # epoch days of date_applied, else created_at
+    groups: "np.ndarray"         # applications x GROUP_FIELDS value codes, 0 when unset
+    labels: List[List[str]]      # value for each code, per group field
+    history_status: List["np.ndarray"]  # status codes in history order
+    history_at: List["np.ndarray"]      # epoch days of each entry
+
+def _history(row: dict) -> Tuple["np.ndarray", "np.ndarray"]:
+    history = [h for h in (row.get("status_history") or []) if isinstance(h, dict)]
+    return (
+        np.fromiter((_code(h.get("status")) for h in history), dtype=np.int16, count=len(history)),
+        np.fromiter((_days(h.get("date")) for h in history), dtype=np.float64, count=len(history)),
+    )
+
+def _median(values: "np.ndarray") -> Optional[float]:
+    return round(float(np.median(values)), 2) if len(values) else None
+
+def _rate(part: float, whole: float) -> float:
+    return round(float(part) / float(whole), 4) if whole else 0.0
+
+def compute(snapshot: Snapshot, weeks: int, today: date) -> dict:
+    """Analytics over a snapshot of the columns"""
+    status, applied = snapshot.status, snapshot.applied
+    n = len(status)
+    lengths = np.fromiter((len(h) for h in snapshot.history_status), dtype=np.int64, count=n)
+    if lengths.sum():
+        h_status = np.concatenate(snapshot.history_status)
+        h_at = np.concatenate(snapshot.history_at)
+    else:
+        h_status, h_at = np.zeros(0, dtype=np.int16), np.zeros(0)
+    h_app = np.repeat(np.arange(n), lengths)
+
+    # Highest funnel stage each application reached, from history and status
+    stage_of = np.full(len(STATUS_NAMES), -1, dtype=np.int64)
+    stage_of[[STATUS_CODES[s] for s in FUNNEL_STAGES]] = np.arange(len(FUNNEL_STAGES))
+    reached = np.maximum(stage_of[status], 0)
+    np.maximum.at(reached, h_app, stage_of[h_status])
+    at_least = np.bincount(reached, minlength=len(FUNNEL_STAGES))[::-1].cumsum()[::-1]
+    funnel = [
+        {
+            "stage": stage,
+            "count": int(at_least[i]),
+            "conversion": _rate(at_least[i], at_least[i - 1]) if i else 1.0,
+        }
+        for i, stage in enumerate(FUNNEL_STAGES)
+    ]
+
+    # Dated history in time order within each application
+    dated = ~np.isnan(h_at)
+    h_app, h_status, h_at = h_app[dated], h_status[dated], h_at[dated]
+    # History is appended as statuses change, so it is usually in order already
+    if np.any((np.diff(h_at) < 0) & (np.diff(h_app) == 0)):
+        order = np.lexsort((h_at, h_app))
+        h_app, h_status, h_at = h_app[order], h_status[order], h_at[order]
+
+    # A stage lasts until the application's next history entry
+    same_app = h_app[1:] == h_app[:-1]
+    stay_status = h_status[:-1][same_app]
+    stay_days = (h_at[1:] - h_at[:-1])[same_app]
+    time_in_stage = []
+    for code in np.unique(stay_status).tolist():
+        days = stay_days[stay_status == code]
+        time_in_stage.append({
+            "status": STATUS_NAMES[code],
+            "median_days": _median(days),
+            "transitions": int(len(days)),
+        })
+
+    # First response: the second history entry, as on the dashboard
+    firsts = np.flatnonzero(np.r_[True, ~same_app][:len(h_app)])
+    has_next = firsts + 1 < len(h_app)
+    has_next[has_next] = h_app[firsts[has_next] + 1] == h_app[firsts[has_next]]
+    response_app = h_app[firsts[has_next]]
+    response_at = h_at[firsts[has_next] + 1]
+    days_to_response = response_at - h_at[firsts[has_next]]
+
+    # First time each application reached an interview stage
+    interview = np.isin(h_status, [STATUS_CODES[s] for s in INTERVIEW_STATUSES])
+    interview_at = np.full(n, np.inf)
+    np.minimum.at(interview_at, h_app[interview], h_at[interview])
+
+    responded = status != APPLIED
+    interviewed = reached >= FUNNEL_STAGES.index("Phone Screen")
+    response_rates = {}
+    for index, field in enumerate(GROUP_FIELDS):
+        labels = snapshot.labels[index]
+        codes = snapshot.groups[:, index]
+        totals = np.bincount(codes, minlength=len(labels))
+        responses = np.bincount(codes, weights=responded, minlength=len(labels))
+        interviews = np.bincount(codes, weights=interviewed, minlength=len(labels))
+        response_rates[field] = sorted(
+            (
+                {
+                    "value": labels[code],
+                    "total": int(totals[code]),
+                    "responded": int(responses[code]),
+                    "response_rate": _rate(responses[code], totals[code]),
+                    "interview_rate": _rate(interviews[code], totals[code]),
+                }
+                for code in np.flatnonzero(totals).tolist() if code
+            ),
+            key=lambda group: -group["total"],
+        )
+
+    # Weekly counts over the last `weeks` weeks, starting on Mondays
+    this_week = today - timedelta(days=today.weekday())
+    start = this_week - timedelta(weeks=weeks - 1)
+    start_days = (start - EPOCH.date()).days
+
+    def per_week(days: "np.ndarray") -> List[int]:
+        index = np.floor((days[np.isfinite(days)] - start_days) / 7).astype(np.int64)
+        return np.bincount(index[(index >= 0) & (index < weeks)], minlength=weeks).tolist()
+
+    applied_weekly = per_week(applied)
+    responses_weekly = per_week(response_at)
+    interviews_weekly = per_week(interview_at)
+    velocity = [
+        {
+            "week_start": (start + timedelta(weeks=i)).isoformat(),
+            "applications": applied_weekly[i],
+            "responses": responses_weekly[i],
+            "interviews": interviews_weekly[i],
+        }
+        for i in range(weeks)
+    ]
+
+    counts = np.bincount(status, minlength=len(STATUS_NAMES))
+    return {
+        "total": n,
+        "status_counts": {STATUS_NAMES[c]: int(counts[c]) for c in np.flatnonzero(counts).tolist()},
+        "response_rate": _rate(responded.sum(), n),
+        "median_days_to_response": _median(days_to_response),
+        "responses": int(len(np.unique(response_app))),
+        "funnel": funnel,
+        "time_in_stage": time_in_stage,
+        "response_rates": response_rates,
+        "velocity": velocity,
+    }
+
+class ApplicationAnalytics:
+    def __init__(self):
+        self.slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._stamps: Dict[str, tuple] = {}
+        self.size = 0
+        self.status = self.applied = self.groups = self.alive = None
+        self.history: List[Optional[Tuple["np.ndarray", "np.ndarray"]]] = []
+        # Interned group values; code 0 is "not set"
+        self.labels: List[List[str]] = [[""] for _ in GROUP_FIELDS]
+        self._codes: List[Dict[str, int]] = [{"": 0} for _ in GROUP_FIELDS]
+        self.version = 0
+        self._memo: Dict[tuple, dict] = {}
+
+    def _slot(self, application_id: str) -> int:
+        slot = self.slots.get(application_id)
+        if slot is not None:
+            return slot
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self.size
+            self.size += 1
+            if self.status is None or slot >= len(self.status):
+                self._grow(max(1024, 2 * slot))
+            self.history.append(None)
+        self.slots[application_id] = slot
+        return slot
+
+    def _grow(self, capacity: int):
+        def grown(array, shape, dtype):
+            new = np.zeros(shape, dtype=dtype)
+            if array is not None:
+                new[:len(array)] = array
+            return new
+        self.status = grown(self.status, capacity, np.int16)
+        self.applied = grown(self.applied, capacity, np.float64)
+        self.groups = grown(self.groups, (capacity, len(GROUP_FIELDS)), np.int32)
+        self.alive = grown(self.alive, capacity, bool)
+
+    def _group_code(self, index: int, value) -> int:
+        value = str(value) if value else ""
+        code = self._codes[index].get(value)
+        if code is None:
+            code = self._codes[index][value] = len(self.labels[index])
+            self.labels[index].append(value)
+        return code
+
+    def _add(self, row: dict):
+        # Refreshes see recent rows more than once; only new versions count
+        stamp = (row.get("version"), row.get("updated_at"))
+        if self._stamps.get(row["id"]) == stamp and stamp != (None, None):
+            return
+        slot = self._slot(row["id"])
+        applied = _days(row.get("date_applied"))
+        self.status[slot] = _code(row.get("status"))
+        self.applied[slot] = applied if not math.isnan(applied) else _days(row.get("created_at"))
+        self.groups[slot] = [self._group_code(i, row.get(field)) for i, field in enumerate(GROUP_FIELDS)]
+        self.alive[slot] = True
+        self.history[slot] = _history(row)
+        self._stamps[row["id"]] = stamp
+        self._changed()
+
+    def _remove(self, application_id: str):
+        slot = self.slots.pop(application_id, None)
+        if slot is not None:
+            self.alive[slot] = False
+            self.history[slot] = None
+            self._free.append(slot)
+            self._stamps.pop(application_id, None)
+            self._changed()
+
+    def _changed(self):
+        self.version += 1
+        self._memo.clear()
+
+    def snapshot(self) -> Tuple[int, Snapshot]:
+        """The current version and a copy of the live columns"""
+        live = np.flatnonzero(self.alive[:self.size]) if self.size else np.zeros(0, dtype=np.int64)
+        histories = [self.history[slot] for slot in live.tolist()]
+        return self.version, Snapshot(
+            status=self.status[live] if self.size else np.zeros(0, dtype=np.int16),
+            applied=self.applied[live] if self.size else np.zeros(0),
+            groups=self.groups[live] if self.size else np.zeros((0, len(GROUP_FIELDS)), dtype=np.int32),
+            labels=[list(labels) for labels in self.labels],
+            history_status=[h[0] for h in histories],
+            history_at=[h[1] for h in histories],
+        )
+
+    def result(self, key: tuple) -> Optional[dict]:
+        return self._memo.get(key)
+
+    def remember(self, key: tuple, result: dict):
+        if key[0] == self.version:
+            self._memo[key] = result
+
+    async def ensure_current(self):
+        await indexes.ensure_current("applications")
+
+analytics = ApplicationAnalytics()
+if available():
+    indexes.listen("applications", ANALYTICS_COLUMNS, analytics._add, analytics._remove)
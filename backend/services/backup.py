@@ -0,0 +1,432 @@
+"""Full backups as a streamed archive, and restoring them in bulk.
+
+A backup is a gzip-compressed tar archive:
+
+    manifest.json                      format version, creation time, tables
+    tables/<table>/<part>.ndjson       rows, one JSON object per line
+    files/<bucket>/<file_path>         every stored file a row points at
+
+Tables are read BACKUP_PAGE_SIZE rows at a time in primary key order, and
+each page becomes one NDJSON part, so no table is ever held in memory whole.
+The files are those referenced by the application_files and
+resume_versions rows just written. Up to BACKUP_CONCURRENCY of them are
+downloaded ahead into spooled temporary files (on disk past
+STORAGE_CHUNK_SIZE) while earlier ones are written out. The tar headers and
+gzip stream are produced by hand, so the archive is sent as it is built.
+
+Restoring reads the upload as it arrives. Each NDJSON part is upserted in
+BULK_CHUNK_SIZE chunks on the table's primary key, so restoring over an
+existing database overwrites matching rows and keeps the rest. Restored rows
+of the synced tables count as written at restore time: their change column
+is stamped with the current time, versioned rows move past both their
+backed-up version and the row they replace, and their sync tombstones are
+removed. Delta sync clients and other workers' indexes then pick them up
+like any other write, and rows written here go straight into this worker's
+indexes. Files are spooled and uploaded while the rest of the archive is
+read, with at most BACKUP_CONCURRENCY spooled or uploading at once. A
+storage_blobs row is written only once its file has been uploaded, so a
+failed upload doesn't leave a blob row without its object.
+"""
+import asyncio
+import json
+import logging
+import tarfile
+import tempfile
+import time
+import zlib
+from collections import deque
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from anyio import to_thread
+from fastapi import UploadFile
+from postgrest.exceptions import APIError
+from starlette.datastructures import Headers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from config import BACKUP_CONCURRENCY, STORAGE_CHUNK_SIZE
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.bulk import chunked
+from services.blobs import BLOB_TABLE, REFERENCES
+from services.storage import read_stream, upload_stream
+from services.cache import response_cache
+from services.sync import TOMBSTONE_TABLE
+from services import indexes
+
+logger = logging.getLogger("job_command_center.backup")
+
+FORMAT_VERSION = 1
+
+# Backed-up tables in restore order (referenced tables first) and their
+# primary keys. Caches that are rebuilt on demand (llm_cache) and sync
+# tombstones are left out.
+TABLES: Dict[str, Tuple[str, ...]] = {
+    "resume_versions": ("id",),
+    "applications": ("id",),
+    "application_files": ("id",),
+    "target_companies": ("id",),
+    BLOB_TABLE: ("bucket", "sha256"),
+    "parsed_documents": ("sha256",),
+    "research_runs": ("id",),
+    "research_seen_jobs": ("scope", "fingerprint"),
+    "followup_reminders": ("id",),
+}
+
+# The column delta sync reads to find changed rows, for each synced table
+CHANGE_COLUMNS = {
+    "resume_versions": "updated_at",
+    "applications": "updated_at",
+    "application_files": "created_at",
+    "target_companies": "updated_at",
+}
+VERSIONED_TABLES = ("resume_versions", "applications", "target_companies")
+
+# The bucket each referencing table's file_path points into
+FILE_BUCKETS = {table: bucket for bucket, tables in REFERENCES.items() for table in tables}
+
+BACKUP_PAGE_SIZE = 1000
+COMPRESSION_LEVEL = 6
+
+class InvalidArchive(Exception):
+    pass
+
+def _dumps(row: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(row)
+    return json.dumps(row, separators=(",", ":"), default=str).encode()
+
+def _loads(line: bytes):
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+def _quote(value) -> str:
+    if isinstance(value, str):
+        return '"' + value.replace('"', '\\"') + '"'
+    return str(value)
+
+def _after(query, key: Tuple[str, ...], last: Optional[dict]):
+    """Order by the primary key and keep rows after ``last``"""
+    for column in key:
+        query = query.order(column)
+    if last is None:
+        return query
+    if len(key) == 1:
+        return query.gt(key[0], last[key[0]])
+    first, second = key
+    return query.or_(
+        f"{first}.gt.{_quote(last[first])},"
+        f"and({first}.eq.{_quote(last[first])},{second}.gt.{_quote(last[second])})"
+    )
+
+async def table_pages(table: str) -> AsyncIterator[List[dict]]:
+    supabase = get_supabase_client()
+    key = TABLES[table]
+    last = None
+    while True:
+        result = await execute(_after(supabase.table(table).select("*"), key, last).limit(BACKUP_PAGE_SIZE))
+        if result.data:
+            yield result.data
+        if len(result.data) < BACKUP_PAGE_SIZE:
+            return
+        last = result.data[-1]
+
+# Archive writing
+
+class _TarGzWriter:
+    """Builds a gzip-compressed tar stream piece by piece"""
+
+    def __init__(self):
+        self._compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+        self.mtime = int(time.time())
+
+    async def compress(self, data: bytes) -> bytes:
+        # zlib releases the GIL, so large pieces are compressed off the event loop
+        if len(data) >= 64 * 1024:
+            return await to_thread.run_sync(self._compressor.compress, data)
+        return self._compressor.compress(data)
+
+    def header(self, name: str, size: int) -> bytes:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = self.mtime
+        info.mode = 0o644
+        # PAX records carry names longer than the 100 bytes a header holds
+        return info.tobuf(format=tarfile.PAX_FORMAT, encoding="utf-8", errors="surrogateescape")
+
+    async def member(self, name: str, data: bytes) -> bytes:
+        return await self.compress(self.header(name, len(data)) + data + _padding(len(data)))
+
+    def finish(self) -> bytes:
+        return self._compressor.compress(b"\0" * (2 * tarfile.BLOCKSIZE)) + self._compressor.flush()
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % tarfile.BLOCKSIZE)
+
+async def _spool(bucket: str, path: str):
+    """Download an object into a spooled temporary file; None if it's missing"""
+    spool = tempfile.SpooledTemporaryFile(max_size=STORAGE_CHUNK_SIZE)
+    size = 0
+    try:
+        async for chunk in read_stream(bucket, path):
+            spool.write(chunk)
+            size += len(chunk)
+    except Exception as e:
+        spool.close()
+        logger.warning("Leaving %s/%s out of the backup: %s", bucket, path, getattr(e, "detail", e))
+        return None
+    spool.seek(0)
+    return spool, size
+
+async def archive() -> AsyncIterator[bytes]:
+    """Yield a backup archive as compressed chunks"""
+    writer = _TarGzWriter()
+    manifest = {"format": FORMAT_VERSION, "created_at": datetime.utcnow().isoformat(), "tables": list(TABLES)}
+    yield await writer.member("manifest.json", json.dumps(manifest).encode())
+
+    files: Dict[Tuple[str, str], None] = {}  # ordered set of (bucket, path)
+    for table in TABLES:
+        part = 0
+        async for rows in table_pages(table):
+            part += 1
+            data = b"\n".join(_dumps(row) for row in rows) + b"\n"
+            yield await writer.member(f"tables/{table}/{part:06d}.ndjson", data)
+            if table in FILE_BUCKETS:
+                files.update(((FILE_BUCKETS[table], row["file_path"]), None) for row in rows if row.get("file_path"))
+
+    # Download a few files ahead of the one being written
+    queue = iter(files)
+    pending = deque()
+    for bucket, path in queue:
+        pending.append((bucket, path, asyncio.ensure_future(_spool(bucket, path))))
+        if len(pending) >= BACKUP_CONCURRENCY:
+            break
+    try:
+        while pending:
+            bucket, path, task = pending.popleft()
+            spooled = await task
+            following = next(queue, None)
+            if following is not None:
+                pending.append((*following, asyncio.ensure_future(_spool(*following))))
+            if spooled is None:
+                continue
+            spool, size = spooled
+            with spool:
+                yield await writer.compress(writer.header(f"files/{bucket}/{path}", size))
+                while chunk := spool.read(STORAGE_CHUNK_SIZE):
+                    yield await writer.compress(chunk)
+                yield await writer.compress(_padding(size))
+    finally:
+        for _, _, task in pending:
+            task.cancel()
+
+    yield writer.finish()
+
+# Restoring
+
+class _ArchiveReader:
+    """Reads a gzip-compressed tar stream from an async iterator of bytes"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._decompressor = zlib.decompressobj(31)
+        self._buffer = bytearray()
+        self._eof = False
+
+    async def _fill(self):
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._buffer += self._decompressor.flush()
+            self._eof = True
+            return
+        try:
+            self._buffer += self._decompressor.decompress(chunk)
+        except zlib.error as e:
+            raise InvalidArchive(f"not a gzip stream ({e})")
+
+    async def read(self, size: int) -> bytes:
+        while len(self._buffer) < size and not self._eof:
+            await self._fill()
+        if len(self._buffer) < size:
+            raise InvalidArchive("the archive is truncated")
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def copy(self, size: int, out):
+        """Copy the next ``size`` bytes into a file object"""
+        while size:
+            if not self._buffer:
+                if self._eof:
+                    raise InvalidArchive("the archive is truncated")
+                await self._fill()
+                continue
+            take = min(size, len(self._buffer))
+            out.write(self._buffer[:take])
+            del self._buffer[:take]
+            size -= take
+
+    async def members(self) -> AsyncIterator[tarfile.TarInfo]:
+        """Headers of the archive's regular files; read or copy each one's
+        data (``size`` bytes) before asking for the next"""
+        pax_path = None
+        while True:
+            block = await self.read(tarfile.BLOCKSIZE)
+            if block == b"\0" * tarfile.BLOCKSIZE:
+                return
+            try:
+                info = tarfile.TarInfo.frombuf(block, "utf-8", "surrogateescape")
+            except tarfile.TarError as e:
+                raise InvalidArchive(f"bad tar header ({e})")
+            if info.type == tarfile.XHDTYPE:
+                pax_path = _pax_path(await self.read(info.size)) or pax_path
+                await self.read(-info.size % tarfile.BLOCKSIZE)
+                continue
+            if pax_path is not None:
+                info.name, pax_path = pax_path, None
+            if not info.isreg():
+                await self.read(info.size + -info.size % tarfile.BLOCKSIZE)
+                continue
+            yield info
+
+    async def skip_padding(self, size: int):
+        await self.read(-size % tarfile.BLOCKSIZE)
+
+def _pax_path(data: bytes) -> Optional[str]:
+    """The path record of a PAX extended header ("<length> path=<value>\\n")"""
+    path = None
+    while data:
+        length = int(data.split(b" ", 1)[0])
+        key, _, value = data[:length].split(b" ", 1)[1].partition(b"=")
+        if key == b"path":
+            path = value[:-1].decode("utf-8", "surrogateescape")
+        data = data[length:]
+    return path
+
+async def _stamp(table: str, rows: List[dict]) -> List[dict]:
+    """Copies of restored rows marked as written now"""
+    column = CHANGE_COLUMNS.get(table)
+    if column is None:
+        return rows
+    now = datetime.utcnow().isoformat()
+    rows = [{**row, column: now} for row in rows]
+    if table in VERSIONED_TABLES:
+        supabase = get_supabase_client()
+        result = await execute(supabase.table(table).select("id,version").in_("id", [row["id"] for row in rows]))
+        current = {r["id"]: r.get("version") or 1 for r in result.data}
+        for row in rows:
+            row["version"] = max(row.get("version") or 1, current.get(row["id"], 0)) + 1
+    return rows
+
+async def _upsert(table: str, rows: List[dict], errors: List[str]) -> List[dict]:
+    """Write rows in chunks; returns the rows that were written"""
+    supabase = get_supabase_client()
+    key = ",".join(TABLES[table])
+    written = []
+    for _, chunk in chunked(rows):
+        try:
+            chunk = await _stamp(table, chunk)
+            await execute(supabase.table(table).upsert(chunk, on_conflict=key))
+            if table in CHANGE_COLUMNS:
+                await execute(
+                    supabase.table(TOMBSTONE_TABLE).delete()
+                    .eq("table_name", table).in_("record_id", [row["id"] for row in chunk])
+                )
+        except APIError as e:
+            errors.append(f"{table}: {e.message}")
+            continue
+        written.extend(chunk)
+    return written
+
+def _reindex(table: str, rows: List[dict]):
+    """Apply restored rows to this worker's in-memory indexes"""
+    for row in rows:
+        indexes.upsert(table, row)
+
+async def restore(chunks: AsyncIterator[bytes]) -> dict:
+    """Restore an archive made by ``archive()``; returns rows and files
+    written per table and bucket, and any errors"""
+    reader = _ArchiveReader(chunks)
+    tables: Dict[str, int] = {}
+    files: Dict[str, int] = {}
+    errors: List[str] = []
+    # storage_blobs rows by (bucket, sha256), written once their file is uploaded
+    blobs: Dict[Tuple[str, str], dict] = {}
+    uploaded: List[Tuple[str, str]] = []
+    semaphore = asyncio.Semaphore(BACKUP_CONCURRENCY)
+    uploads = []
+
+    async def upload(bucket: str, path: str, spool, size: int):
+        name = path.rsplit("/", 1)[-1]
+        try:
+            blob = blobs.get((bucket, name)) or {}
+            file = UploadFile(spool, size=size, filename=name,
+                              headers=Headers({"content-type": blob.get("content_type") or "application/octet-stream"}))
+            await upload_stream(bucket, path, file, upsert=True)
+            files[bucket] = files.get(bucket, 0) + 1
+            uploaded.append((bucket, name))
+        except Exception as e:
+            errors.append(f"files/{bucket}/{path}: {getattr(e, 'detail', e)}")
+        finally:
+            spool.close()
+            semaphore.release()
+
+    try:
+        manifest = None
+        async for member in reader.members():
+            if manifest is None:
+                if member.name != "manifest.json":
+                    raise InvalidArchive("the archive has no manifest")
+                manifest = json.loads(await reader.read(member.size))
+                await reader.skip_padding(member.size)
+                if manifest.get("format") != FORMAT_VERSION:
+                    raise InvalidArchive(f"unsupported backup format {manifest.get('format')}")
+                continue
+
+            kind, _, rest = member.name.partition("/")
+            if kind == "tables":
+                table = rest.split("/", 1)[0]
+                data = await reader.read(member.size)
+                await reader.skip_padding(member.size)
+                if table not in TABLES:
+                    errors.append(f"{member.name}: unknown table")
+                    continue
+                rows = [_loads(line) for line in data.splitlines() if line.strip()]
+                if table == BLOB_TABLE:
+                    blobs.update(((r["bucket"], r["sha256"]), r) for r in rows)
+                    continue
+                written = await _upsert(table, rows, errors)
+                tables[table] = tables.get(table, 0) + len(written)
+                _reindex(table, written)
+            elif kind == "files" and rest.split("/", 1)[0] in REFERENCES and "/" in rest:
+                bucket, path = rest.split("/", 1)
+                # Wait for a free upload before reading the next file, so
+                # spooled files don't pile up behind slow uploads
+                await semaphore.acquire()
+                spool = tempfile.SpooledTemporaryFile(max_size=STORAGE_CHUNK_SIZE)
+                try:
+                    await reader.copy(member.size, spool)
+                    await reader.skip_padding(member.size)
+                except BaseException:
+                    spool.close()
+                    semaphore.release()
+                    raise
+                spool.seek(0)
+                uploads.append(asyncio.ensure_future(upload(bucket, path, spool, member.size)))
+            else:
+                await reader.read(member.size + -member.size % tarfile.BLOCKSIZE)
+                errors.append(f"{member.name}: not part of a backup")
+        if manifest is None:
+            raise InvalidArchive("the archive is empty")
+    finally:
+        await asyncio.gather(*uploads)
+        stored = [blobs[key] for key in uploaded if key in blobs]
+        if stored:
+            tables[BLOB_TABLE] = len(await _upsert(BLOB_TABLE, stored, errors))
+        response_cache.invalidate(*TABLES)
+
+    return {"tables": tables, "files": files, "errors": errors}
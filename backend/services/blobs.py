@@ -0,0 +1,188 @@
+"""Content-addressed storage for resumes and application files.
+
+Uploads are stored once per bucket under blobs/<sha256>, and the file_path
+of each application_files or resume_versions row that uses the content
+points at that object, so the rows are the blob's references. The
+storage_blobs table lists the stored blobs. An upload whose hash is already
+listed is not sent to Storage again, so attaching the same tailored resume to
+40 applications stores it once. The upload itself still reaches the API;
+clients that hash the file first can attach stored content without sending
+it through POST /api/applications/{id}/files/by-hash, which reports 404 when
+the content has to be uploaded after all.
+
+Deleting a row no longer deletes the object. A background task collects
+blobs that no row references and that haven't been uploaded or reused for
+BLOB_GC_GRACE seconds. Files stored before this scheme (per-application
+paths) are still removed when their rows are deleted.
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import UploadFile
+
+from config import BLOB_GC_INTERVAL, BLOB_GC_GRACE, STORAGE_CHUNK_SIZE
+from services.supabase_client import get_supabase_client
+from services.database import run, execute
+from services.bulk import chunked
+from services.metrics import storage_deduplicated, storage_collected
+from services.storage import upload_stream
+
+logger = logging.getLogger("job_command_center.blobs")
+
+BLOB_TABLE = "storage_blobs"
+BLOB_PREFIX = "blobs/"
+
+# Tables whose file_path column references blobs in each bucket
+REFERENCES = {
+    "resumes": ["resume_versions"],
+    "application-files": ["application_files"],
+}
+
+def blob_path(sha256: str) -> str:
+    return f"{BLOB_PREFIX}{sha256[:2]}/{sha256}"
+
+def is_blob(path: Optional[str]) -> bool:
+    return bool(path) and path.startswith(BLOB_PREFIX)
+
+async def hash_upload(file: UploadFile) -> Tuple[str, int]:
+    """SHA-256 and size of an upload, leaving it rewound for the next reader"""
+    await file.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await file.read(STORAGE_CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    await file.seek(0)
+    return digest.hexdigest(), size
+
+class BlobStore:
+    def __init__(self):
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+        # Held while an upload checks for its blob and while the collector
+        # deletes one, so a blob can't be collected between the two steps
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    async def store(self, bucket: str, file: UploadFile) -> Tuple[str, str]:
+        """Store an upload by its content; returns (sha256, path)"""
+        sha256, size = await hash_upload(file)
+        key = (bucket, sha256)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = asyncio.ensure_future(self._store(bucket, sha256, size, file))
+        await asyncio.shield(pending)
+        return sha256, blob_path(sha256)
+
+    async def reuse(self, bucket: str, sha256: str) -> Optional[str]:
+        """The path of already stored content, or None if it isn't stored"""
+        supabase = get_supabase_client()
+        async with self._lock:
+            # Refreshing last_used_at also keeps the collector away from it
+            touched = await execute(
+                supabase.table(BLOB_TABLE)
+                .update({"last_used_at": datetime.utcnow().isoformat()})
+                .eq("bucket", bucket)
+                .eq("sha256", sha256)
+            )
+        if not touched.data:
+            return None
+        storage_deduplicated.inc(bucket)
+        return blob_path(sha256)
+
+    async def _store(self, bucket: str, sha256: str, size: int, file: UploadFile):
+        supabase = get_supabase_client()
+        try:
+            if await self.reuse(bucket, sha256):
+                return
+            await upload_stream(bucket, blob_path(sha256), file, upsert=True)
+            now = datetime.utcnow().isoformat()
+            row = {"bucket": bucket, "sha256": sha256, "size": size,
+                   "content_type": file.content_type, "created_at": now, "last_used_at": now}
+            await execute(supabase.table(BLOB_TABLE).upsert(row, on_conflict="bucket,sha256"))
+        finally:
+            del self._pending[(bucket, sha256)]
+
+    async def release(self, bucket: str, paths: Iterable[Optional[str]]):
+        """Called after rows referencing paths are deleted or repointed.
+
+        Blobs are left for the collector since other rows may share them;
+        files stored under per-row paths are removed right away.
+        """
+        legacy = [p for p in paths if p and not is_blob(p)]
+        if legacy:
+            supabase = get_supabase_client()
+            try:
+                await run(supabase.storage.from_(bucket).remove, legacy)
+            except Exception:
+                pass  # Files might not exist
+
+    async def _referenced(self, bucket: str, paths: List[str]) -> set:
+        supabase = get_supabase_client()
+        referenced = set()
+        for table in REFERENCES[bucket]:
+            for _, batch in chunked(paths):
+                result = await execute(supabase.table(table).select("file_path").in_("file_path", batch))
+                referenced.update(r["file_path"] for r in result.data)
+        return referenced
+
+    async def collect(self) -> int:
+        """Delete blobs no row references; returns how many were removed"""
+        supabase = get_supabase_client()
+        cutoff = (datetime.utcnow() - timedelta(seconds=BLOB_GC_GRACE)).isoformat()
+        result = await execute(
+            supabase.table(BLOB_TABLE).select("bucket,sha256").lt("last_used_at", cutoff)
+        )
+        removed = 0
+        for bucket in REFERENCES:
+            candidates = [blob_path(r["sha256"]) for r in result.data if r["bucket"] == bucket]
+            if not candidates:
+                continue
+            referenced = await self._referenced(bucket, candidates)
+            for path in candidates:
+                if path in referenced:
+                    continue
+                async with self._lock:
+                    # Skip blobs an upload reused since they were listed
+                    deleted = await execute(
+                        supabase.table(BLOB_TABLE).delete()
+                        .eq("bucket", bucket)
+                        .eq("sha256", path.rsplit("/", 1)[1])
+                        .lt("last_used_at", cutoff)
+                    )
+                    if not deleted.data:
+                        continue
+                    try:
+                        await run(supabase.storage.from_(bucket).remove, [path])
+                    except Exception as e:
+                        logger.warning("Could not remove %s/%s: %s", bucket, path, e)
+                storage_collected.inc(bucket)
+                removed += 1
+        return removed
+
+    async def _collect_periodically(self):
+        while True:
+            await asyncio.sleep(BLOB_GC_INTERVAL)
+            try:
+                removed = await self.collect()
+                if removed:
+                    logger.info("Collected %d unreferenced blobs", removed)
+            except Exception:
+                logger.exception("Blob collection failed")
+
+    def start(self):
+        if BLOB_GC_INTERVAL > 0 and self._task is None:
+            self._task = asyncio.create_task(self._collect_periodically())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+blob_store = BlobStore()
@@ -0,0 +1,94 @@
+"""Chunked multi-row writes for the bulk endpoints.
+
+Rows are written BULK_CHUNK_SIZE at a time. If a chunk is rejected, its rows
+are retried one by one so a single bad row is reported against its own index
+instead of failing its neighbours. Updates go through the apply_row_updates
+RPC, which applies each item like a single-row PUT: only the sent columns
+change, the version is bumped under the row lock, and an item whose expected
+version is stale is reported as a conflict instead of overwriting.
+"""
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from postgrest.exceptions import APIError
+
+from config import BULK_CHUNK_SIZE, BULK_MAX_ITEMS
+from models.bulk import BulkItemResult, BulkResult
+from services.supabase_client import get_supabase_client
+from services.database import execute
+
+def check_size(items: list):
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} items per request")
+
+def chunked(items: list, size: int = BULK_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield start, items[start:start + size]
+
+async def _write_chunk(rows: List[dict], build: Callable, status: str) -> List[BulkItemResult]:
+    """Write one chunk; result indexes are relative to the chunk"""
+    try:
+        await execute(build(rows))
+        return [BulkItemResult(index=i, id=row["id"], status=status) for i, row in enumerate(rows)]
+    except APIError as e:
+        if len(rows) == 1:
+            return [BulkItemResult(index=0, id=rows[0]["id"], status="error", error=e.message)]
+
+    # Retry row by row to find the ones that were rejected
+    results = []
+    for i, row in enumerate(rows):
+        result, = await _write_chunk([row], build, status)
+        result.index = i
+        results.append(result)
+    return results
+
+async def insert_many(table: str, rows: List[dict]) -> List[BulkItemResult]:
+    """Insert rows with one request per chunk"""
+    supabase = get_supabase_client()
+    results = []
+    for offset, chunk in chunked(rows):
+        for result in await _write_chunk(chunk, lambda r: supabase.table(table).insert(r), "created"):
+            result.index += offset
+            results.append(result)
+    return results
+
+async def update_many(table: str, updates: List[Tuple[str, dict, Optional[int]]]) -> Tuple[List[BulkItemResult], List[dict]]:
+    """Apply (id, changes, expected version) updates, one request per chunk.
+
+    Returns a result per update, indexed by its position in ``updates``, and
+    the rows as written.
+    """
+    supabase = get_supabase_client()
+    results, rows = [], []
+    for start, chunk in chunked(updates):
+        params = {
+            "p_table": table,
+            "p_updates": [{"id": id, "changes": changes, "expected_version": version} for id, changes, version in chunk],
+        }
+        try:
+            response = await execute(supabase.rpc("apply_row_updates", params))
+        except APIError as e:
+            results.extend(
+                BulkItemResult(index=start + i, id=id, status="error", error=e.message)
+                for i, (id, _, _) in enumerate(chunk)
+            )
+            continue
+        for i, item in enumerate(response.data):
+            results.append(BulkItemResult(index=start + i, id=item["id"], status=item["status"], error=item.get("error")))
+            if item.get("row"):
+                rows.append(item["row"])
+    return results, rows
+
+async def delete_many(table: str, values: List[str], column: str = "id") -> List[dict]:
+    """Delete rows whose ``column`` is in ``values`` and return them"""
+    supabase = get_supabase_client()
+    deleted = []
+    for _, chunk in chunked(values):
+        response = await execute(supabase.table(table).delete().in_(column, chunk))
+        deleted.extend(response.data)
+    return deleted
+
+def summarize(results: List[BulkItemResult]) -> BulkResult:
+    results.sort(key=lambda r: r.index)
+    failed = sum(1 for r in results if r.status in ("error", "not_found", "conflict"))
+    return BulkResult(succeeded=len(results) - failed, failed=failed, results=results)
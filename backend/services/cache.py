@@ -0,0 +1,109 @@
+"""In-process response cache for collection endpoints.
+
+Entries are grouped by namespace (one per table) and keyed by the request's
+query string. They expire after RESPONSE_CACHE_TTL seconds, the least recently
+used entry is evicted once RESPONSE_CACHE_MAX_ENTRIES is reached, and write
+handlers invalidate their namespace. Each entry carries a strong ETag so
+clients revalidating an unchanged collection get a 304.
+
+Invalidating also bumps the namespace's generation. Handlers read it before
+querying and pass it to ``put``, which doesn't store a page whose query
+started before a write invalidated the namespace.
+
+The cache is per process: with several workers, a write only invalidates the
+worker that handled it and the others catch up when their entries expire.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from config import RESPONSE_CACHE_TTL, RESPONSE_CACHE_MAX_ENTRIES
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    expires_at: float = 0.0
+    media_type: str = "application/json"
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[tuple, CachedResponse]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, namespace: str, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get((namespace, key))
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[(namespace, key)]
+            return None
+        self._entries.move_to_end((namespace, key))
+        return entry
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def put(
+        self,
+        namespace: str,
+        key: str,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None,
+        media_type: str = "application/json",
+        generation: Optional[int] = None,
+    ) -> CachedResponse:
+        """Build an entry and cache it, unless ``namespace`` was invalidated
+        since ``generation`` was read"""
+        entry = CachedResponse(
+            body=body,
+            etag=make_etag(body),
+            headers=headers or {},
+            expires_at=time.monotonic() + self.ttl,
+            media_type=media_type,
+        )
+        if self.enabled and (generation is None or generation == self.generation(namespace)):
+            self._entries[(namespace, key)] = entry
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, *namespaces: str):
+        for namespace in namespaces:
+            self._generations[namespace] = self.generation(namespace) + 1
+        for cache_key in [k for k in self._entries if k[0] in namespaces]:
+            del self._entries[cache_key]
+
+    def clear(self):
+        self._entries.clear()
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL)
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+def conditional_response(request: Request, entry: CachedResponse) -> Response:
+    """Return the cached body, or 304 if the client already has it"""
+    headers = {**entry.headers, "ETag": entry.etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
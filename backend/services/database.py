@@ -0,0 +1,30 @@
+"""Non-blocking access to the Supabase client.
+
+supabase-py performs blocking HTTP calls, so route handlers hand every query
+and storage call to a bounded worker pool instead of running it on the event
+loop. The pool is sized to match the HTTP connection pool. Each query is
+timed and counted per table and operation for the /metrics endpoint.
+"""
+from functools import partial
+
+import anyio
+from anyio import to_thread
+
+from config import SUPABASE_POOL_SIZE
+from services.metrics import observe_query
+
+_limiter: anyio.CapacityLimiter = None
+
+def _get_limiter() -> anyio.CapacityLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = anyio.CapacityLimiter(SUPABASE_POOL_SIZE)
+    return _limiter
+
+async def run(func, *args, **kwargs):
+    """Run a blocking Supabase call in the worker pool"""
+    return await to_thread.run_sync(partial(func, *args, **kwargs), limiter=_get_limiter())
+
+async def execute(query):
+    """Execute a query builder without blocking the event loop"""
+    return await observe_query(query, partial(run, query.execute))
@@ -0,0 +1,120 @@
+"""Text and basic details from resume and document files.
+
+These functions run inside the parser process pool (see services.documents),
+so this module only imports the standard library and pypdf. DOCX files are
+read straight from their XML; PDFs need the optional pypdf package.
+"""
+import io
+import re
+import zipfile
+from typing import List, Optional
+from xml.etree import ElementTree
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+PARSEABLE_EXTENSIONS = (".pdf", ".docx", ".txt", ".md")
+
+_WORD = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+class UnsupportedDocument(Exception):
+    pass
+
+def can_parse(file_name: Optional[str]) -> bool:
+    name = (file_name or "").lower()
+    if name.endswith(".pdf"):
+        return pypdf is not None
+    return name.endswith(PARSEABLE_EXTENSIONS)
+
+def _pdf_text(data: bytes) -> str:
+    if pypdf is None:
+        raise UnsupportedDocument("PDF parsing requires pypdf")
+    reader = pypdf.PdfReader(io.BytesIO(data))
+    return "\n".join((page.extract_text() or "") for page in reader.pages)
+
+def _docx_text(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD}p"):
+        pieces = []
+        for node in paragraph.iter():
+            if node.tag == f"{_WORD}t":
+                pieces.append(node.text or "")
+            elif node.tag == f"{_WORD}tab":
+                pieces.append("\t")
+            elif node.tag in (f"{_WORD}br", f"{_WORD}cr"):
+                pieces.append("\n")
+        paragraphs.append("".join(pieces))
+    return "\n".join(paragraphs)
+
+def extract_text(data: bytes, file_name: str) -> str:
+    name = file_name.lower()
+    if name.endswith(".pdf"):
+        text = _pdf_text(data)
+    elif name.endswith(".docx"):
+        text = _docx_text(data)
+    elif name.endswith((".txt", ".md")):
+        text = data.decode("utf-8", errors="replace")
+    else:
+        raise UnsupportedDocument(f"Unsupported file format: {file_name}")
+    return text.strip()
+
+# The same fields as extractBasicInfo in src/services/resumeParser.js, but
+# skills and degrees are matched as whole words so "R" or "MS" inside other
+# words don't count
+PHARMA_SKILLS = [
+    "HPLC", "GC", "Mass Spectrometry", "LC-MS", "GC-MS",
+    "NMR", "UV-Vis", "FTIR", "DSC", "TGA",
+    "Method Development", "Method Validation", "ICH Guidelines",
+    "GMP", "GLP", "FDA", "EMA", "cGMP",
+    "Stability Studies", "Dissolution", "Karl Fischer",
+    "SDS-PAGE", "Western Blot", "ELISA", "PCR", "qPCR",
+    "Cell Culture", "Protein Purification", "Chromatography",
+    "Formulation", "Drug Product", "Drug Substance",
+    "Analytical Development", "Quality Control", "Quality Assurance",
+    "Regulatory Affairs", "IND", "NDA", "BLA",
+    "mRNA", "LNP", "AAV", "Gene Therapy", "Cell Therapy",
+    "Biologics", "Vaccines", "Monoclonal Antibodies",
+    "Python", "R", "LIMS", "Empower", "Chromeleon",
+    "Statistics", "DOE", "Six Sigma",
+]
+
+_SKILL_PATTERNS = [
+    (skill, re.compile(r"(?<![\w-])" + re.escape(skill) + r"(?![\w-])", re.IGNORECASE))
+    for skill in PHARMA_SKILLS
+]
+
+_DEGREE_PATTERNS = [
+    re.compile(r"\bPh\.?D\b\.?", re.IGNORECASE),
+    re.compile(r"\bM\.S\.|(?<![\w-])MS\b|\bM\.?Sc\b"),
+    re.compile(r"\bMaster'?s?\b", re.IGNORECASE),
+    re.compile(r"\bB\.S\.|(?<![\w-])BS\b|\bB\.?Sc\b"),
+    re.compile(r"\bBachelor'?s?\b", re.IGNORECASE),
+    re.compile(r"\bMBA\b", re.IGNORECASE),
+]
+
+def extract_basic_info(text: str) -> dict:
+    """Email, phone, LinkedIn, pharma skills and degrees found in the text"""
+    email = re.search(r"[\w.-]+@[\w.-]+\.\w+", text)
+    phone = re.search(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text)
+    linkedin = re.search(r"linkedin\.com/in/[\w-]+", text, re.IGNORECASE)
+    education: List[str] = []
+    for pattern in _DEGREE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            education.append(match.group(0))
+    return {
+        "email": email.group(0) if email else None,
+        "phone": phone.group(0) if phone else None,
+        "linkedin": linkedin.group(0) if linkedin else None,
+        "skills": [skill for skill, pattern in _SKILL_PATTERNS if pattern.search(text)],
+        "education": education,
+    }
+
+def parse_document(data: bytes, file_name: str) -> dict:
+    """Text and basic info for one file; the unit of work for the parser pool"""
+    text = extract_text(data, file_name)
+    return {"text": text, "info": extract_basic_info(text)}
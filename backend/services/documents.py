@@ -0,0 +1,162 @@
+"""Server-side parsing of uploaded resumes and application files.
+
+Text extraction (services.document_text) is CPU-bound, so it runs in a small
+pool of worker processes instead of on the event loop or the database
+threads. Results are stored in the parsed_documents table under the SHA-256
+of the file, so uploading the same resume again, or attaching it to another
+application, costs one database read. Uploads of a file already being
+parsed wait for that parse instead of starting another.
+
+Parsing never fails an upload: unsupported, oversized or unreadable files
+just have no parsed text. Uploads that don't use the parsed text right away
+parse in the background from the stored copy, so the response doesn't wait
+for the parse.
+"""
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from fastapi import UploadFile
+
+from config import PARSER_WORKERS, PARSE_MAX_BYTES, STORAGE_CHUNK_SIZE
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.document_text import can_parse, parse_document
+from services.storage import read_stream
+
+logger = logging.getLogger("job_command_center.documents")
+
+CACHE_TABLE = "parsed_documents"
+
+_executor: Optional[ProcessPoolExecutor] = None
+_pending: Dict[str, asyncio.Future] = {}
+_background: Set[asyncio.Task] = set()
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Spawned workers don't inherit the server's threads or open connections
+        _executor = ProcessPoolExecutor(max_workers=PARSER_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+def shutdown_parser_pool():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+async def run_in_pool(func, *args):
+    """Run a CPU-bound function in the worker pool. If a worker dies the pool
+    is replaced for later calls and BrokenProcessPool is raised."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_executor(), func, *args)
+    except BrokenProcessPool:
+        shutdown_parser_pool()
+        raise
+
+async def cached_parse(sha256: str) -> Optional[dict]:
+    supabase = get_supabase_client()
+    result = await execute(supabase.table(CACHE_TABLE).select("sha256,text,info").eq("sha256", sha256).limit(1))
+    return result.data[0] if result.data else None
+
+async def _parse(sha256: str, data: bytes, file_name: str) -> Optional[dict]:
+    try:
+        try:
+            parsed = await run_in_pool(parse_document, data, file_name)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. out of memory); later uploads get a fresh pool
+            logger.error("Parser pool failed on %s: %s", file_name, e)
+            return None
+        except Exception as e:
+            logger.warning("Could not parse %s (%s): %s", file_name, sha256[:12], e)
+            return None
+        row = {"sha256": sha256, "file_name": file_name, "text": parsed["text"], "info": parsed["info"],
+               "created_at": datetime.utcnow().isoformat()}
+        supabase = get_supabase_client()
+        await execute(supabase.table(CACHE_TABLE).upsert(row, on_conflict="sha256"))
+        return {"sha256": sha256, "text": parsed["text"], "info": parsed["info"]}
+    finally:
+        del _pending[sha256]
+
+async def _parse_once(sha256: str, data: bytes, file_name: str) -> Optional[dict]:
+    pending = _pending.get(sha256)
+    if pending is None:
+        pending = _pending[sha256] = asyncio.ensure_future(_parse(sha256, data, file_name))
+    return await asyncio.shield(pending)
+
+async def parse_bytes(data: bytes, file_name: str) -> Optional[dict]:
+    """{"sha256", "text", "info"} for a file, or None if it can't be parsed"""
+    sha256 = hashlib.sha256(data).hexdigest()
+    cached = await cached_parse(sha256)
+    if cached is not None:
+        return cached
+    return await _parse_once(sha256, data, file_name)
+
+async def parse_upload(file: UploadFile, sha256: Optional[str] = None) -> Optional[dict]:
+    """Parse an UploadFile that may already have been streamed to storage.
+    Pass the file's sha256 when it is known, so a cached result is returned
+    without reading the file again."""
+    if not can_parse(file.filename):
+        return None
+    if sha256 is not None:
+        cached = await cached_parse(sha256)
+        if cached is not None:
+            return cached
+    await file.seek(0)
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    while chunk := await file.read(STORAGE_CHUNK_SIZE):
+        size += len(chunk)
+        if size > PARSE_MAX_BYTES:
+            logger.info("Not parsing %s: larger than %d bytes", file.filename, PARSE_MAX_BYTES)
+            return None
+        digest.update(chunk)
+        chunks.append(chunk)
+    if sha256 is None:
+        sha256 = digest.hexdigest()
+        cached = await cached_parse(sha256)
+        if cached is not None:
+            return cached
+    return await _parse_once(sha256, b"".join(chunks), file.filename)
+
+async def parse_stored(bucket: str, path: str, sha256: str, file_name: str) -> Optional[dict]:
+    """Parse a file that is already in storage, reading it back only if it
+    hasn't been parsed before"""
+    if not can_parse(file_name):
+        return None
+    cached = await cached_parse(sha256)
+    if cached is not None:
+        return cached
+    pending = _pending.get(sha256)
+    if pending is not None:
+        return await asyncio.shield(pending)
+    chunks = []
+    size = 0
+    async for chunk in read_stream(bucket, path):
+        size += len(chunk)
+        if size > PARSE_MAX_BYTES:
+            logger.info("Not parsing %s: larger than %d bytes", file_name, PARSE_MAX_BYTES)
+            return None
+        chunks.append(chunk)
+    return await _parse_once(sha256, b"".join(chunks), file_name)
+
+async def _parse_logged(bucket: str, path: str, sha256: str, file_name: str):
+    try:
+        await parse_stored(bucket, path, sha256, file_name)
+    except Exception:
+        logger.exception("Background parse of %s (%s) failed", file_name, sha256[:12])
+
+def parse_in_background(bucket: str, path: str, sha256: str, file_name: str):
+    """Schedule parse_stored without waiting for it"""
+    if not can_parse(file_name):
+        return
+    task = asyncio.create_task(_parse_logged(bucket, path, sha256, file_name))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
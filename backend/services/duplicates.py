@@ -0,0 +1,199 @@
+"""Near-duplicate detection for applications with MinHash and LSH.
+
+The same posting is often logged twice from different job boards, with a
+reworded title and a reposted description. Each application is reduced to a
+set of shingles: character 4-grams of its company and title, and word
+3-grams of its job description. A MinHash signature of NUM_PERM 32-bit
+values estimates the Jaccard similarity of two of those sets. The signatures are
+cut into BANDS bands of ROWS values, and each band is hashed into a bucket.
+Postings that share any bucket are candidates. With 32 bands of 4 rows, a
+pair at 0.7 similarity shares a bucket more than 99.9% of the time, a pair
+at 0.2 does about 5% of the time, and candidates are then checked against
+DUPLICATE_THRESHOLD with their full signatures.
+
+Checking a new posting looks up only its BANDS buckets and compares the
+signatures found there, so the cost doesn't grow with the number of stored
+descriptions. The index is fed by the applications feed in services.indexes,
+like the search index. NumPy is required; without it ``available()`` is False,
+creates skip the check, and the report answers 503.
+"""
+import hashlib
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from anyio import to_thread
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from config import DUPLICATE_THRESHOLD
+from services import indexes
+from services.search import tokenize
+
+DUPLICATE_COLUMNS = "id,company,title,status,job_description,created_at,updated_at"
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+HEADER_GRAM = 4
+DESCRIPTION_GRAM = 3
+
+if np is not None:
+    # Hash functions (a * x + b) mod 2**32 with odd a, one per signature value
+    _rng = np.random.default_rng(20240601)
+    _A = (_rng.integers(0, 1 << 32, NUM_PERM, dtype=np.uint64) | 1).astype(np.uint32)
+    _B = _rng.integers(0, 1 << 32, NUM_PERM, dtype=np.uint64).astype(np.uint32)
+    # Combine consecutive word hashes into one hash per word 3-gram
+    _GRAM_MULTIPLIERS = (np.uint32(0x9E3779B1), np.uint32(0x85EBCA77))
+    _DESCRIPTION_SALT = np.uint32(0x5BD1E995)
+
+def available() -> bool:
+    return np is not None
+
+def shingle_hashes(row: dict) -> "np.ndarray":
+    """32-bit hashes of the character n-grams of company and title and the
+    word n-grams of the description (repeats don't affect the signature)"""
+    parts = []
+    header = " ".join(tokenize(f"{row.get('company') or ''} {row.get('title') or ''}"))
+    if header:
+        grams = (header[i:i + HEADER_GRAM] for i in range(max(len(header) - HEADER_GRAM + 1, 1)))
+        parts.append(np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint32))
+    words = tokenize(row.get("job_description") or "")
+    if words:
+        hashes = np.fromiter((zlib.crc32(w.encode()) for w in words), dtype=np.uint32, count=len(words))
+        if len(hashes) >= DESCRIPTION_GRAM:
+            m1, m2 = _GRAM_MULTIPLIERS
+            hashes = hashes[:-2] * m1 + hashes[1:-1] * m2 + hashes[2:]
+        parts.append(hashes ^ _DESCRIPTION_SALT)
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint32)
+
+def signature(row: dict) -> Optional["np.ndarray"]:
+    """MinHash signature of a row's shingles, or None if it has no text"""
+    hashes = shingle_hashes(row)
+    if not len(hashes):
+        return None
+    values = np.multiply.outer(hashes, _A)
+    values += _B
+    return values.min(axis=0)
+
+def similarity(a: "np.ndarray", b: "np.ndarray") -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+def _band_keys(sig: "np.ndarray") -> List[int]:
+    return [hash(sig[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+def _doc(row: dict) -> dict:
+    return {k: row.get(k) for k in ("id", "company", "title", "status", "created_at")}
+
+def _text_key(row: dict) -> str:
+    text = "\x1f".join(row.get(f) or "" for f in ("company", "title", "job_description"))
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+class DuplicateIndex:
+    def __init__(self):
+        self.docs: Dict[str, dict] = {}
+        self.signatures: Dict[str, "np.ndarray"] = {}
+        self.buckets: List[Dict[int, Set[str]]] = [defaultdict(set) for _ in range(BANDS)]
+        self._keys: Dict[str, List[int]] = {}
+        self._texts: Dict[str, str] = {}
+
+    def _add(self, row: dict):
+        # Status changes and the like don't change the signature
+        if self._texts.get(row["id"]) == _text_key(row):
+            self.docs[row["id"]] = _doc(row)
+            return
+        self._index(row, signature(row))
+
+    def _index(self, row: dict, sig: Optional["np.ndarray"]):
+        self._unindex(row["id"])
+        self.docs[row["id"]] = _doc(row)
+        self._texts[row["id"]] = _text_key(row)
+        if sig is None:
+            return
+        keys = _band_keys(sig)
+        for band, key in enumerate(keys):
+            self.buckets[band][key].add(row["id"])
+        self.signatures[row["id"]] = sig
+        self._keys[row["id"]] = keys
+
+    async def _add_page(self, rows: List[dict]):
+        # Signatures are CPU work, so the first load computes them off the event loop
+        signatures = await to_thread.run_sync(lambda: [signature(row) for row in rows])
+        for row, sig in zip(rows, signatures):
+            self._index(row, sig)
+
+    def _remove(self, application_id: str):
+        self.docs.pop(application_id, None)
+        self._unindex(application_id)
+
+    def _unindex(self, application_id: str):
+        self._texts.pop(application_id, None)
+        self.signatures.pop(application_id, None)
+        for band, key in enumerate(self._keys.pop(application_id, ())):
+            bucket = self.buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(application_id)
+                if not bucket:
+                    del self.buckets[band][key]
+
+    def matches(self, row: dict, threshold: float = DUPLICATE_THRESHOLD) -> List[Tuple[str, float]]:
+        """(id, similarity) of indexed applications like ``row``, most similar first"""
+        sig = signature(row)
+        if sig is None:
+            return []
+        candidates = set()
+        for band, key in enumerate(_band_keys(sig)):
+            candidates.update(self.buckets[band].get(key, ()))
+        candidates.discard(row.get("id"))
+        scored = [(c, similarity(sig, self.signatures[c])) for c in candidates]
+        return sorted(((c, s) for c, s in scored if s >= threshold), key=lambda m: (-m[1], m[0]))
+
+    def groups(self, threshold: float = DUPLICATE_THRESHOLD) -> List[dict]:
+        """Clusters of applications linked by pairs at or above ``threshold``"""
+        pairs = {}
+        for buckets in self.buckets:
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                ordered = sorted(members)
+                for i, a in enumerate(ordered):
+                    for b in ordered[i + 1:]:
+                        if (a, b) not in pairs:
+                            pairs[(a, b)] = similarity(self.signatures[a], self.signatures[b])
+
+        parent: Dict[str, str] = {}
+
+        def find(x: str) -> str:
+            while parent.get(x, x) != x:
+                x = parent[x]
+            return x
+
+        linked = [(a, b, s) for (a, b), s in pairs.items() if s >= threshold]
+        for a, b, _ in linked:
+            parent[find(a)] = find(b)
+
+        clusters: Dict[str, dict] = {}
+        for a, b, s in linked:
+            cluster = clusters.setdefault(find(a), {"ids": set(), "pairs": []})
+            cluster["ids"].update((a, b))
+            cluster["pairs"].append({"a": a, "b": b, "similarity": round(s, 4)})
+
+        groups = []
+        for cluster in clusters.values():
+            applications = sorted((self.docs[i] for i in cluster["ids"]), key=lambda d: d.get("created_at") or "")
+            linked_pairs = sorted(cluster["pairs"], key=lambda p: -p["similarity"])
+            groups.append({"similarity": linked_pairs[0]["similarity"], "applications": applications,
+                           "pairs": linked_pairs})
+        return sorted(groups, key=lambda g: (-g["similarity"], g["applications"][0]["id"]))
+
+    async def ensure_current(self):
+        await indexes.ensure_current("applications")
+
+duplicate_index = DuplicateIndex()
+if available():
+    indexes.listen("applications", DUPLICATE_COLUMNS, duplicate_index._add, duplicate_index._remove,
+                   duplicate_index._add_page)
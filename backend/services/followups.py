@@ -0,0 +1,249 @@
+"""Follow-up scheduling for applications and target companies.
+
+Each open application and target company has one next follow-up time,
+derived from when it last changed status: an application's latest
+status_history entry (or date_applied while it is still Applied), and a
+company's status_changed_at, which apply_row_update stamps only when the
+status changes, so editing notes or connections doesn't push it back. It is
+that time plus the cadence for the current status. Closed statuses have no
+follow-up.
+
+The times are kept in memory in one list per kind sorted by (due, kind, id).
+Writes re-slot a record with bisect and insort, and the k items due soonest
+before a time are a bisect into each list and a lazy merge of their heads,
+so reading them costs O(k + log n) rather than a scan of every row. The
+lists are fed by the applications and target_companies feeds in
+services.indexes, like the search index.
+
+A background task ticks every FOLLOWUP_TICK_INTERVAL seconds. Each tick
+saves the follow-ups that became due since the previous tick as rows in
+followup_reminders. A reminder's id is derived from the record and its due
+time, so a repeated tick, or another worker's tick, writes nothing new.
+"""
+import asyncio
+import heapq
+import logging
+import time
+import uuid
+from bisect import bisect_left, bisect_right, insort
+from functools import partial
+from itertools import islice
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from config import FOLLOWUP_TICK_INTERVAL
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.bulk import chunked
+from services.metrics import followup_reminders
+from services import indexes
+
+logger = logging.getLogger("job_command_center.followups")
+
+REMINDER_TABLE = "followup_reminders"
+
+# Days after entering a status before following up; statuses not listed
+# (Offer, Rejected, Ghost, Withdrawn, Dormant) have no follow-up
+APPLICATION_CADENCE = {
+    "Applied": 7,
+    "Reviewed": 7,
+    "Phone Screen": 5,
+    "Technical": 5,
+    "Onsite": 3,
+}
+COMPANY_CADENCE = {
+    "Researching": 14,
+    "Ready to Apply": 3,
+    "Applied": 14,
+    "Interviewing": 7,
+}
+
+REASONS = {
+    ("application", "Applied"): "No response since applying",
+    ("application", "Reviewed"): "No news since the application was reviewed",
+    ("application", "Phone Screen"): "Follow up after the phone screen",
+    ("application", "Technical"): "Follow up after the technical interview",
+    ("application", "Onsite"): "Follow up after the onsite",
+    ("company", "Researching"): "Finish researching the company",
+    ("company", "Ready to Apply"): "Apply to the company",
+    ("company", "Applied"): "Check on applications and contacts at the company",
+    ("company", "Interviewing"): "Check in with contacts at the company",
+}
+
+# Columns each kind is indexed from
+SOURCES = {
+    "application": ("applications", "id,company,title,status,status_history,date_applied,created_at,updated_at"),
+    "company": ("target_companies", "id,name,status,priority,created_at,status_changed_at"),
+}
+
+# Reminder ids are uuid5(REMINDER_NAMESPACE, "kind:id:due")
+REMINDER_NAMESPACE = uuid.UUID("6f1c4d2e-7b0a-4c59-9a51-3e8d2f0b7c14")
+
+def _timestamp(value) -> Optional[float]:
+    """Epoch seconds for an ISO date or timestamp (UTC if it has no zone)"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def _isoformat(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat()
+
+def application_due(row: dict) -> Optional[float]:
+    days = APPLICATION_CADENCE.get(row.get("status"))
+    if days is None:
+        return None
+    history = [h for h in row.get("status_history") or [] if isinstance(h, dict)]
+    since = None
+    if row.get("status") == "Applied":
+        since = _timestamp(row.get("date_applied"))
+    if since is None and history:
+        since = _timestamp(history[-1].get("date"))
+    if since is None:
+        since = _timestamp(row.get("updated_at")) or _timestamp(row.get("created_at"))
+    return since + days * 86400 if since is not None else None
+
+def company_due(row: dict) -> Optional[float]:
+    days = COMPANY_CADENCE.get(row.get("status"))
+    since = _timestamp(row.get("status_changed_at")) or _timestamp(row.get("created_at"))
+    if days is None or since is None:
+        return None
+    return since + days * 86400
+
+def reminder_id(kind: str, record_id: str, due: float) -> str:
+    return str(uuid.uuid5(REMINDER_NAMESPACE, f"{kind}:{record_id}:{_isoformat(due)}"))
+
+class FollowupIndex:
+    def __init__(self):
+        self.queues: Dict[str, List[Tuple[float, str, str]]] = {kind: [] for kind in SOURCES}  # (due, kind, id), sorted
+        self.entries: Dict[Tuple[str, str], Tuple[float, str, str]] = {}
+        self.docs: Dict[Tuple[str, str], dict] = {}
+        self._ticked_until: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _add(self, kind: str, row: dict):
+        key = (kind, row["id"])
+        self._remove(kind, row["id"])
+        due = application_due(row) if kind == "application" else company_due(row)
+        if due is None:
+            return
+        entry = (due, kind, row["id"])
+        insort(self.queues[kind], entry)
+        self.entries[key] = entry
+        if kind == "application":
+            self.docs[key] = {"name": row.get("company"), "title": row.get("title"), "status": row.get("status")}
+        else:
+            self.docs[key] = {"name": row.get("name"), "title": None, "status": row.get("status")}
+
+    def _remove(self, kind: str, record_id: str):
+        entry = self.entries.pop((kind, record_id), None)
+        if entry is not None:
+            queue = self.queues[kind]
+            del queue[bisect_left(queue, entry)]
+            self.docs.pop((kind, record_id), None)
+
+    def _item(self, entry: Tuple[float, str, str], now: float) -> dict:
+        due, kind, record_id = entry
+        doc = self.docs[(kind, record_id)]
+        return {
+            "kind": kind,
+            "id": record_id,
+            **doc,
+            "reason": REASONS[(kind, doc["status"])],
+            "due_at": _isoformat(due),
+            "overdue": due < now,
+        }
+
+    def due(self, before: float, limit: int, kind: Optional[str] = None) -> Tuple[int, List[dict]]:
+        """Follow-ups due before ``before``, soonest first, and how many there are"""
+        total, entries = self._between(None, before, [kind] if kind else list(self.queues))
+        now = time.time()
+        return total, [self._item(e, now) for e in islice(entries, limit)]
+
+    def _between(self, after: Optional[float], before: float, kinds: List[str]):
+        """How many entries are due in (after, before], and an iterator over them in due order"""
+        ranges = []
+        for kind in kinds:
+            queue = self.queues[kind]
+            start = 0 if after is None else bisect_right(queue, (after, "\uffff"))
+            ranges.append((queue, start, bisect_right(queue, (before, "\uffff"))))
+        total = sum(end - start for _, start, end in ranges)
+        return total, heapq.merge(*(map(queue.__getitem__, range(start, end)) for queue, start, end in ranges))
+
+    def is_current(self, reminder: dict) -> bool:
+        """Whether a saved reminder is still the record's scheduled follow-up"""
+        entry = self.entries.get((reminder["kind"], reminder["record_id"]))
+        return entry is not None and reminder_id(*entry[1:], entry[0]) == reminder["id"]
+
+    async def ensure_current(self):
+        await indexes.ensure_current(*(table for table, _ in SOURCES.values()))
+
+    async def tick(self) -> int:
+        """Save reminders for follow-ups that became due; returns how many were new"""
+        await self.ensure_current()
+        now = time.time()
+        _, entries = self._between(self._ticked_until, now, list(self.queues))
+        reminders = {
+            reminder_id(kind, record_id, due): self._item((due, kind, record_id), now)
+            for due, kind, record_id in entries
+        }
+
+        supabase = get_supabase_client()
+        created = 0
+        for _, batch in chunked(list(reminders)):
+            existing = await execute(supabase.table(REMINDER_TABLE).select("id").in_("id", batch))
+            known = {r["id"] for r in existing.data}
+            rows = [
+                {
+                    "id": reminder,
+                    "kind": reminders[reminder]["kind"],
+                    "record_id": reminders[reminder]["id"],
+                    "status": reminders[reminder]["status"],
+                    "reason": reminders[reminder]["reason"],
+                    "due_at": reminders[reminder]["due_at"],
+                    "created_at": _isoformat(now),
+                }
+                for reminder in batch if reminder not in known
+            ]
+            if rows:
+                await execute(supabase.table(REMINDER_TABLE).upsert(rows, on_conflict="id"))
+                for row in rows:
+                    followup_reminders.inc(row["kind"])
+                created += len(rows)
+        self._ticked_until = now
+        return created
+
+    async def _tick_periodically(self):
+        while True:
+            try:
+                created = await self.tick()
+                if created:
+                    logger.info("Created %d follow-up reminders", created)
+            except Exception:
+                logger.exception("Follow-up tick failed")
+            await asyncio.sleep(FOLLOWUP_TICK_INTERVAL)
+
+    def start(self):
+        if FOLLOWUP_TICK_INTERVAL > 0 and self._task is None:
+            self._task = asyncio.create_task(self._tick_periodically())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+followups = FollowupIndex()
+for kind, (table, columns) in SOURCES.items():
+    indexes.listen(table, columns, partial(followups._add, kind), partial(followups._remove, kind))
@@ -0,0 +1,130 @@
+"""In-memory indexes over tables, kept current across worker processes.
+
+Several services keep an index of a table in memory (search, analytics,
+duplicates, follow-ups). Each registers with the table's feed, naming the
+columns it needs and how it adds and drops a row. A feed loads its table
+once for all of its indexes, on first use, in created_at pages. After that
+it pulls rows changed since the last refresh and tombstones of deleted ones,
+at most every INDEX_REFRESH_INTERVAL seconds, so writes handled by other
+workers are picked up too. Write handlers pass the rows they wrote to
+``upsert`` and ``remove``, which update every index of the table at once.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from config import INDEX_REFRESH_INTERVAL
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.pagination import paginate, split_page
+from services.sync import TOMBSTONE_TABLE, changed_since
+
+LOAD_PAGE_SIZE = 1000
+
+@dataclass
+class Listener:
+    columns: str
+    add: Callable[[dict], None]
+    discard: Callable[[str], None]
+    # Adds a page of rows during the first load, for indexes that batch work
+    add_page: Optional[Callable[[List[dict]], Awaitable[None]]] = None
+
+class TableFeed:
+    def __init__(self, table: str):
+        self.table = table
+        self.listeners: List[Listener] = []
+        self.loaded = False
+        self.refreshed_at: Optional[datetime] = None
+        self._checked = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def columns(self) -> str:
+        names = dict.fromkeys(["id", "created_at", "updated_at"])
+        for listener in self.listeners:
+            names.update(dict.fromkeys(listener.columns.split(",")))
+        return ",".join(names)
+
+    def upsert(self, row: dict):
+        """Index a written row, replacing any previous version with the same id"""
+        if self.loaded:
+            for listener in self.listeners:
+                listener.add(row)
+
+    def remove(self, record_id: str):
+        if self.loaded:
+            for listener in self.listeners:
+                listener.discard(record_id)
+
+    async def ensure_current(self):
+        """Load the table on first use, then apply changes from other workers"""
+        if self.loaded and time.monotonic() - self._checked < INDEX_REFRESH_INTERVAL:
+            return
+        async with self._lock:
+            if not self.loaded:
+                await self._load()
+            elif time.monotonic() - self._checked >= INDEX_REFRESH_INTERVAL:
+                await self._refresh()
+            self._checked = time.monotonic()
+
+    async def _load(self):
+        supabase = get_supabase_client()
+        started_at = datetime.utcnow()
+        columns = self.columns
+        cursor = None
+        while True:
+            query = paginate(supabase.table(self.table).select(columns), "created_at", cursor, LOAD_PAGE_SIZE)
+            rows, cursor = split_page((await execute(query)).data, "created_at", LOAD_PAGE_SIZE)
+            for listener in self.listeners:
+                if listener.add_page is not None:
+                    await listener.add_page(rows)
+                else:
+                    for row in rows:
+                        listener.add(row)
+            if not cursor:
+                break
+        self.loaded = True
+        self.refreshed_at = started_at
+
+    async def _refresh(self):
+        supabase = get_supabase_client()
+        started_at = datetime.utcnow()
+        cutoff = changed_since(self.refreshed_at)
+        changed, deleted = await asyncio.gather(
+            execute(supabase.table(self.table).select(self.columns).gte("updated_at", cutoff)),
+            execute(
+                supabase.table(TOMBSTONE_TABLE).select("record_id")
+                .eq("table_name", self.table).gte("deleted_at", cutoff)
+            ),
+        )
+        for row in changed.data:
+            self.upsert(row)
+        for tombstone in deleted.data:
+            self.remove(tombstone["record_id"])
+        self.refreshed_at = started_at
+
+_feeds: Dict[str, TableFeed] = {}
+
+def feed(table: str) -> TableFeed:
+    if table not in _feeds:
+        _feeds[table] = TableFeed(table)
+    return _feeds[table]
+
+def listen(table: str, columns: str, add: Callable[[dict], None], discard: Callable[[str], None],
+           add_page: Optional[Callable[[List[dict]], Awaitable[None]]] = None):
+    """Register an index of ``table``; call at import, before the feed loads"""
+    feed(table).listeners.append(Listener(columns, add, discard, add_page))
+
+def upsert(table: str, row: dict):
+    if table in _feeds:
+        _feeds[table].upsert(row)
+
+def remove(table: str, record_id: str):
+    if table in _feeds:
+        _feeds[table].remove(record_id)
+
+async def ensure_current(*tables: str):
+    for table in tables:
+        await feed(table).ensure_current()
@@ -0,0 +1,352 @@
+"""Job search across external providers.
+
+Each provider turns a (query, location, page) search into postings in one
+normalized shape. A search fans out over every selected provider and keyword
+at once through a pooled async HTTP client, with each provider held to its
+own request rate. Normalized results are cached per (provider, query,
+location, page) for JOB_SEARCH_CACHE_TTL seconds, and identical searches in
+flight at the same time share one upstream request. Postings are then
+deduplicated across providers by normalized company, title and location.
+
+Providers are configured from the environment (see config.py). Their base
+URLs can be overridden, and job_search.register_provider() installs any
+JobProvider, so tests can point the aggregator at local stub servers.
+"""
+import asyncio
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from config import (
+    JOB_SEARCH_CACHE_TTL,
+    JOB_SEARCH_TIMEOUT,
+    RAPIDAPI_KEY,
+    JSEARCH_URL,
+    ADZUNA_APP_ID,
+    ADZUNA_API_KEY,
+    ADZUNA_COUNTRY,
+    ADZUNA_URL,
+    USAJOBS_API_KEY,
+    USAJOBS_EMAIL,
+    USAJOBS_URL,
+)
+
+CACHE_MAX_ENTRIES = 512
+MAX_CONNECTIONS = 20
+
+class ProviderError(Exception):
+    pass
+
+def _money(low, high) -> Optional[str]:
+    if not low or not high:
+        return None
+    try:
+        return f"${float(low):,.0f} - ${float(high):,.0f}"
+    except (TypeError, ValueError):
+        return f"${low} - ${high}"
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` requests per second, bursting to ``burst``"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Take a token, or reserve the next one, under the lock; the wait for
+        # a reserved token happens outside it so callers queue in order
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            await asyncio.sleep(wait)
+
+class JobProvider(ABC):
+    """A job search API. Subclasses implement request() and normalize()"""
+
+    name = ""
+    label = ""
+    requests_per_second = 2.0
+    burst = 2
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.limiter = RateLimiter(self.requests_per_second, self.burst)
+
+    def configured(self) -> bool:
+        return True
+
+    @abstractmethod
+    def request(self, query: str, location: str, page: int) -> Tuple[str, dict, dict]:
+        """URL, query parameters and headers for one search"""
+
+    @abstractmethod
+    def normalize(self, data: dict) -> List[dict]:
+        """Postings in the normalized shape from a response body"""
+
+    async def search(self, client: httpx.AsyncClient, query: str, location: str, page: int) -> List[dict]:
+        url, params, headers = self.request(query, location, page)
+        await self.limiter.acquire()
+        try:
+            response = await client.get(url, params=params, headers=headers)
+        except httpx.HTTPError as e:
+            raise ProviderError(f"{self.label} request failed: {e}") from e
+        if response.is_error:
+            raise ProviderError(f"{self.label} returned {response.status_code}: {response.text[:200]}")
+        try:
+            data = response.json()
+        except ValueError:
+            raise ProviderError(f"{self.label} returned invalid JSON")
+        try:
+            postings = self.normalize(data)
+        except Exception as e:
+            # An unexpected response shape fails this provider, not the search
+            raise ProviderError(f"{self.label} returned an unexpected response: {e!r}") from e
+        return [{**posting, "source": self.label} for posting in postings]
+
+class JSearchProvider(JobProvider):
+    name = "jsearch"
+    label = "JSearch"
+    requests_per_second = 5.0
+    burst = 5
+
+    def __init__(self, api_key: str, base_url: str = JSEARCH_URL):
+        super().__init__(base_url)
+        self.api_key = api_key
+
+    def configured(self) -> bool:
+        return bool(self.api_key)
+
+    def request(self, query, location, page):
+        params = {"query": query, "page": str(page), "num_pages": "1"}
+        if location:
+            params["location"] = location
+        headers = {"X-RapidAPI-Key": self.api_key, "X-RapidAPI-Host": httpx.URL(self.base_url).host}
+        return f"{self.base_url}/search", params, headers
+
+    def normalize(self, data):
+        return [
+            {
+                "id": str(job.get("job_id")),
+                "title": job.get("job_title") or "",
+                "company": job.get("employer_name") or "Unknown Company",
+                "location": f"{job['job_city']}, {job.get('job_state')}" if job.get("job_city") else job.get("job_country"),
+                "description": job.get("job_description"),
+                "salary": _money(job.get("job_min_salary"), job.get("job_max_salary")),
+                "job_type": job.get("job_employment_type"),
+                "posted_date": job.get("job_posted_at_datetime_utc"),
+                "apply_url": job.get("job_apply_link"),
+                "company_logo": job.get("employer_logo"),
+            }
+            for job in data.get("data") or []
+        ]
+
+class AdzunaProvider(JobProvider):
+    name = "adzuna"
+    label = "Adzuna"
+    requests_per_second = 1.0
+    burst = 3
+
+    def __init__(self, app_id: str, api_key: str, country: str = ADZUNA_COUNTRY, base_url: str = ADZUNA_URL):
+        super().__init__(base_url)
+        self.app_id = app_id
+        self.api_key = api_key
+        self.country = country
+
+    def configured(self) -> bool:
+        return bool(self.app_id and self.api_key)
+
+    def request(self, query, location, page):
+        params = {
+            "app_id": self.app_id,
+            "app_key": self.api_key,
+            "results_per_page": "20",
+            "what": query,
+            "content-type": "application/json",
+        }
+        if location:
+            params["where"] = location
+        return f"{self.base_url}/jobs/{self.country}/search/{page}", params, {}
+
+    def normalize(self, data):
+        return [
+            {
+                "id": str(job.get("id")),
+                "title": job.get("title") or "",
+                "company": (job.get("company") or {}).get("display_name") or "Unknown Company",
+                "location": (job.get("location") or {}).get("display_name") or "",
+                "description": job.get("description"),
+                "salary": _money(job.get("salary_min"), job.get("salary_max")),
+                "job_type": job.get("contract_type"),
+                "posted_date": job.get("created"),
+                "apply_url": job.get("redirect_url"),
+            }
+            for job in data.get("results") or []
+        ]
+
+class USAJobsProvider(JobProvider):
+    name = "usajobs"
+    label = "USAJobs"
+    requests_per_second = 5.0
+    burst = 5
+
+    def __init__(self, api_key: str, email: str, base_url: str = USAJOBS_URL):
+        super().__init__(base_url)
+        self.api_key = api_key
+        self.email = email
+
+    def configured(self) -> bool:
+        return bool(self.api_key and self.email)
+
+    def request(self, query, location, page):
+        params = {"Keyword": query, "ResultsPerPage": "25", "Page": str(page)}
+        if location:
+            params["LocationName"] = location
+        headers = {"Authorization-Key": self.api_key, "User-Agent": self.email}
+        return f"{self.base_url}/api/Search", params, headers
+
+    def normalize(self, data):
+        postings = []
+        for item in (data.get("SearchResult") or {}).get("SearchResultItems") or []:
+            job = item.get("MatchedObjectDescriptor") or {}
+            pay = (job.get("PositionRemuneration") or [{}])[0]
+            postings.append({
+                "id": str(job.get("PositionID")),
+                "title": job.get("PositionTitle") or "",
+                "company": job.get("OrganizationName") or "Unknown Company",
+                "location": (job.get("PositionLocation") or [{}])[0].get("LocationName") or "",
+                "description": ((job.get("UserArea") or {}).get("Details") or {}).get("JobSummary")
+                    or job.get("QualificationSummary"),
+                "salary": _money(pay.get("MinimumRange"), pay.get("MaximumRange")),
+                "job_type": (job.get("PositionSchedule") or [{}])[0].get("Name"),
+                "posted_date": job.get("PositionStartDate"),
+                "apply_url": (job.get("ApplyURI") or [None])[0] or job.get("PositionURI"),
+            })
+        return postings
+
+def _normalize_text(value: Optional[str]) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", (value or "").lower()).split())
+
+def dedup_key(posting: dict) -> Tuple[str, str, str]:
+    return (
+        _normalize_text(posting["company"]),
+        _normalize_text(posting["title"]),
+        _normalize_text(posting.get("location")),
+    )
+
+def dedup(postings: List[dict]) -> List[dict]:
+    """Keep the first of each company/title/location, noting every source"""
+    unique: Dict[tuple, dict] = {}
+    for posting in postings:
+        key = dedup_key(posting)
+        existing = unique.get(key)
+        if existing is None:
+            unique[key] = {**posting, "sources": [posting["source"]]}
+        elif posting["source"] not in existing["sources"]:
+            existing["sources"].append(posting["source"])
+    return list(unique.values())
+
+class JobSearch:
+    def __init__(self, providers: List[JobProvider], ttl: float = JOB_SEARCH_CACHE_TTL):
+        self.providers: Dict[str, JobProvider] = {p.name: p for p in providers}
+        self.ttl = ttl
+        self._cache: "OrderedDict[tuple, Tuple[float, List[dict]]]" = OrderedDict()
+        self._pending: Dict[tuple, asyncio.Future] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def register_provider(self, provider: JobProvider):
+        self.providers[provider.name] = provider
+
+    def available(self) -> List[str]:
+        return [name for name, p in self.providers.items() if p.configured()]
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+                timeout=httpx.Timeout(JOB_SEARCH_TIMEOUT),
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _cached(self, key: tuple) -> Optional[List[dict]]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, postings = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return postings
+
+    async def _fetch(self, provider: JobProvider, query: str, location: str, page: int) -> List[dict]:
+        key = (provider.name, _normalize_text(query), _normalize_text(location), page)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        # Concurrent identical searches wait on the same upstream request
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._load(key, provider, query, location, page))
+            self._pending[key] = pending
+        return await asyncio.shield(pending)
+
+    async def _load(self, key: tuple, provider: JobProvider, query: str, location: str, page: int) -> List[dict]:
+        try:
+            postings = await provider.search(self._get_client(), query, location, page)
+        finally:
+            del self._pending[key]
+        if self.ttl > 0:
+            self._cache[key] = (time.monotonic() + self.ttl, postings)
+            while len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+        return postings
+
+    async def search(
+        self, keywords: List[str], location: str = "", page: int = 1, providers: Optional[List[str]] = None
+    ) -> Tuple[List[dict], List[dict]]:
+        """Deduplicated postings plus one error entry per failed provider search"""
+        selected = [self.providers[name] for name in (providers or self.available())]
+        searches = [(p, q) for p in selected for q in keywords]
+        outcomes = await asyncio.gather(
+            *(self._fetch(p, q, location, page) for p, q in searches),
+            return_exceptions=True,
+        )
+
+        postings, errors = [], []
+        for (provider, query), outcome in zip(searches, outcomes):
+            if isinstance(outcome, ProviderError):
+                errors.append({"provider": provider.name, "query": query, "detail": str(outcome)})
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                postings.extend(outcome)
+        return dedup(postings), errors
+
+def default_providers() -> List[JobProvider]:
+    return [
+        JSearchProvider(RAPIDAPI_KEY),
+        AdzunaProvider(ADZUNA_APP_ID, ADZUNA_API_KEY),
+        USAJobsProvider(USAJOBS_API_KEY, USAJOBS_EMAIL),
+    ]
+
+job_search = JobSearch(default_providers())
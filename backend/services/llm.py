@@ -0,0 +1,326 @@
+"""LLM gateway for the prompts the frontend sends to OpenAI, Anthropic,
+Gemini and Ollama.
+
+Completions are cached in the llm_cache table under a SHA-256 of the
+provider, model, generation settings and normalized messages, so repeating
+an analysis of the same resume and job costs one database read. Identical
+requests already in flight wait for the first one instead of calling the
+provider again, and each provider has its own concurrency limit. stream()
+yields text as the provider produces it and caches the full response once
+it completes.
+
+Provider base URLs come from config, so OLLAMA_URL (or any of the others)
+can point at a local stub server.
+"""
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+import json
+import re
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException
+
+from config import (
+    LLM_TIMEOUT,
+    OPENAI_API_KEY,
+    OPENAI_URL,
+    ANTHROPIC_API_KEY,
+    ANTHROPIC_URL,
+    GEMINI_API_KEY,
+    GEMINI_URL,
+    OLLAMA_URL,
+)
+from services.supabase_client import get_supabase_client
+from services.database import execute
+
+CACHE_TABLE = "llm_cache"
+
+class LLMError(Exception):
+    pass
+
+def normalize_messages(messages: List[dict]) -> List[dict]:
+    """Messages with line endings unified and trailing whitespace trimmed"""
+    normalized = []
+    for message in messages:
+        lines = message["content"].replace("\r\n", "\n").split("\n")
+        content = "\n".join(re.sub(r"[ \t]+$", "", line) for line in lines).strip()
+        normalized.append({"role": message["role"], "content": content})
+    return normalized
+
+def prompt_hash(provider: str, model: str, messages: List[dict], temperature: float, max_tokens: int) -> str:
+    payload = json.dumps(
+        [provider, model, temperature, max_tokens, normalize_messages(messages)],
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+async def _sse_data(response: httpx.Response) -> AsyncIterator[dict]:
+    """JSON payloads of the data: lines in a server-sent event stream"""
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            data = line[5:].strip()
+            if data and data != "[DONE]":
+                yield json.loads(data)
+
+class LLMProvider(ABC):
+    """A chat completion API. Subclasses build requests and parse replies"""
+
+    name = ""
+    label = ""
+    default_model = ""
+    max_concurrency = 4
+
+    def __init__(self, base_url: str, api_key: str = ""):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def configured(self, api_key: Optional[str] = None) -> bool:
+        return bool(api_key or self.api_key)
+
+    @abstractmethod
+    def request(self, model: str, messages: List[dict], temperature: float, max_tokens: int,
+                stream: bool, api_key: str) -> Tuple[str, dict, dict]:
+        """URL, headers and JSON body for one completion"""
+
+    @abstractmethod
+    def parse(self, data: dict) -> str:
+        """The completion text from a response body"""
+
+    @abstractmethod
+    def chunks(self, response: httpx.Response) -> AsyncIterator[str]:
+        """Text pieces from a streamed response"""
+
+    async def _send(self, client: httpx.AsyncClient, stream: bool, api_key: Optional[str], *args) -> httpx.Response:
+        url, headers, body = self.request(*args, stream=stream, api_key=api_key or self.api_key)
+        try:
+            response = await client.send(client.build_request("POST", url, headers=headers, json=body), stream=stream)
+        except httpx.HTTPError as e:
+            raise LLMError(f"{self.label} request failed: {e}") from e
+        if response.is_error:
+            detail = (await response.aread()).decode(errors="replace")[:500]
+            await response.aclose()
+            raise LLMError(f"{self.label} returned {response.status_code}: {detail}")
+        return response
+
+    async def complete(self, client: httpx.AsyncClient, model: str, messages: List[dict],
+                       temperature: float, max_tokens: int, api_key: Optional[str] = None) -> str:
+        async with self.semaphore:
+            response = await self._send(client, False, api_key, model, messages, temperature, max_tokens)
+        try:
+            return self.parse(response.json())
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"Unexpected {self.label} response: {e}") from e
+
+    async def stream(self, client: httpx.AsyncClient, model: str, messages: List[dict],
+                     temperature: float, max_tokens: int, api_key: Optional[str] = None) -> AsyncIterator[str]:
+        async with self.semaphore:
+            response = await self._send(client, True, api_key, model, messages, temperature, max_tokens)
+            try:
+                async for piece in self.chunks(response):
+                    if piece:
+                        yield piece
+            except (ValueError, KeyError, IndexError, TypeError) as e:
+                raise LLMError(f"Unexpected {self.label} stream: {e}") from e
+            finally:
+                await response.aclose()
+
+class OpenAIProvider(LLMProvider):
+    name = "openai"
+    label = "OpenAI"
+    default_model = "gpt-4o-mini"
+
+    def request(self, model, messages, temperature, max_tokens, stream, api_key):
+        body = {"model": model, "messages": messages, "temperature": temperature,
+                "max_tokens": max_tokens, "stream": stream}
+        return f"{self.base_url}/v1/chat/completions", {"Authorization": f"Bearer {api_key}"}, body
+
+    def parse(self, data):
+        return data["choices"][0]["message"]["content"]
+
+    async def chunks(self, response):
+        async for event in _sse_data(response):
+            if event.get("choices"):
+                yield event["choices"][0].get("delta", {}).get("content") or ""
+
+class AnthropicProvider(LLMProvider):
+    name = "anthropic"
+    label = "Anthropic"
+    default_model = "claude-sonnet-4-20250514"
+
+    def request(self, model, messages, temperature, max_tokens, stream, api_key):
+        system = next((m["content"] for m in messages if m["role"] == "system"), "")
+        body = {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system,
+            "messages": [
+                {"role": "assistant" if m["role"] == "assistant" else "user", "content": m["content"]}
+                for m in messages if m["role"] != "system"
+            ],
+            "stream": stream,
+        }
+        headers = {"x-api-key": api_key, "anthropic-version": "2023-06-01"}
+        return f"{self.base_url}/v1/messages", headers, body
+
+    def parse(self, data):
+        return data["content"][0]["text"]
+
+    async def chunks(self, response):
+        async for event in _sse_data(response):
+            if event.get("type") == "content_block_delta":
+                yield event["delta"].get("text") or ""
+
+class GeminiProvider(LLMProvider):
+    name = "gemini"
+    label = "Gemini"
+    default_model = "gemini-3-flash-preview"
+
+    def request(self, model, messages, temperature, max_tokens, stream, api_key):
+        system = next((m["content"] for m in messages if m["role"] == "system"), "")
+        contents = [
+            {"role": "model" if m["role"] == "assistant" else "user", "parts": [{"text": m["content"]}]}
+            for m in messages if m["role"] != "system"
+        ]
+        # Gemini has no system role here, so it is prepended to the first message
+        if system and contents:
+            contents[0]["parts"][0]["text"] = f"{system}\n\n{contents[0]['parts'][0]['text']}"
+        body = {"contents": contents, "generationConfig": {"temperature": temperature, "maxOutputTokens": max_tokens}}
+        method = "streamGenerateContent?alt=sse" if stream else "generateContent"
+        return f"{self.base_url}/v1beta/models/{model}:{method}", {"x-goog-api-key": api_key}, body
+
+    def parse(self, data):
+        return data["candidates"][0]["content"]["parts"][0]["text"]
+
+    async def chunks(self, response):
+        async for event in _sse_data(response):
+            for candidate in event.get("candidates") or []:
+                for part in candidate.get("content", {}).get("parts") or []:
+                    yield part.get("text") or ""
+
+class OllamaProvider(LLMProvider):
+    name = "ollama"
+    label = "Ollama"
+    default_model = "llama3.2"
+    # A local model server generally runs one request at a time
+    max_concurrency = 1
+
+    def configured(self, api_key=None):
+        return bool(self.base_url)
+
+    def request(self, model, messages, temperature, max_tokens, stream, api_key):
+        body = {"model": model, "messages": messages, "stream": stream,
+                "options": {"temperature": temperature, "num_predict": max_tokens}}
+        return f"{self.base_url}/api/chat", {}, body
+
+    def parse(self, data):
+        return data["message"]["content"]
+
+    async def chunks(self, response):
+        async for line in response.aiter_lines():
+            if line.strip():
+                yield json.loads(line).get("message", {}).get("content") or ""
+
+class LLMGateway:
+    def __init__(self, providers: List[LLMProvider]):
+        self.providers: Dict[str, LLMProvider] = {p.name: p for p in providers}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def register_provider(self, provider: LLMProvider):
+        self.providers[provider.name] = provider
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=httpx.Timeout(LLM_TIMEOUT, connect=10))
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+        self._client = None
+
+    def provider(self, name: str, api_key: Optional[str] = None) -> LLMProvider:
+        provider = self.providers.get(name)
+        if provider is None:
+            raise HTTPException(status_code=400, detail=f"Unknown provider: {name}")
+        if not provider.configured(api_key):
+            raise HTTPException(status_code=400, detail=f"{provider.label} is not configured")
+        return provider
+
+    async def cached(self, key: str) -> Optional[str]:
+        supabase = get_supabase_client()
+        result = await execute(supabase.table(CACHE_TABLE).select("content").eq("key", key).limit(1))
+        return result.data[0]["content"] if result.data else None
+
+    async def _store(self, key: str, provider: str, model: str, content: str):
+        supabase = get_supabase_client()
+        row = {"key": key, "provider": provider, "model": model, "content": content,
+               "created_at": datetime.utcnow().isoformat()}
+        await execute(supabase.table(CACHE_TABLE).upsert(row, on_conflict="key"))
+
+    async def complete(self, provider: LLMProvider, model: str, messages: List[dict], temperature: float,
+                       max_tokens: int, api_key: Optional[str] = None) -> Tuple[str, str, bool]:
+        """(content, prompt hash, served from cache)"""
+        key = prompt_hash(provider.name, model, messages, temperature, max_tokens)
+        content = await self.cached(key)
+        if content is not None:
+            return content, key, True
+
+        # Identical requests in flight wait for the first one
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._complete(key, provider, model, messages, temperature, max_tokens, api_key)
+            )
+            self._pending[key] = pending
+            return await asyncio.shield(pending), key, False
+        return await asyncio.shield(pending), key, True
+
+    async def _complete(self, key, provider, model, messages, temperature, max_tokens, api_key) -> str:
+        try:
+            content = await provider.complete(self._get_client(), model, messages, temperature, max_tokens, api_key)
+            await self._store(key, provider.name, model, content)
+            return content
+        finally:
+            del self._pending[key]
+
+    async def stream(self, provider: LLMProvider, key: str, model: str, messages: List[dict], temperature: float,
+                     max_tokens: int, api_key: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream a completion for a prompt hash that wasn't cached, then cache it"""
+        pending = self._pending.get(key)
+        if pending is not None:
+            yield await asyncio.shield(pending)
+            return
+
+        done = asyncio.get_running_loop().create_future()
+        self._pending[key] = done
+        pieces = []
+        try:
+            async for piece in provider.stream(self._get_client(), model, messages, temperature, max_tokens, api_key):
+                pieces.append(piece)
+                yield piece
+            content = "".join(pieces)
+            await self._store(key, provider.name, model, content)
+            done.set_result(content)
+        except BaseException as e:
+            done.set_exception(e if isinstance(e, Exception) else LLMError("Stream cancelled"))
+            done.exception()  # mark retrieved when nobody was waiting
+            raise
+        finally:
+            del self._pending[key]
+
+def default_providers() -> List[LLMProvider]:
+    return [
+        OpenAIProvider(OPENAI_URL, OPENAI_API_KEY),
+        AnthropicProvider(ANTHROPIC_URL, ANTHROPIC_API_KEY),
+        GeminiProvider(GEMINI_URL, GEMINI_API_KEY),
+        OllamaProvider(OLLAMA_URL),
+    ]
+
+llm_gateway = LLMGateway(default_providers())
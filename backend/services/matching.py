@@ -0,0 +1,168 @@
+"""TF-IDF match scoring between resume versions and job descriptions.
+
+Each text is tokenized into terms and adjacent-term bigrams once, and its
+sublinear term frequencies are cached under the SHA-256 of its content, so
+unchanged resumes and postings are never re-tokenized. Terms are identified
+by a 64-bit hash rather than a shared vocabulary, so memory is bounded by
+the cache's MATCH_CACHE_ENTRIES. Scoring a batch builds IDF weights over the
+batch's own vocabulary, keeps only the job entries for terms that occur in
+some resume, and sums their products with the resume weights per job, so
+nothing is sized by the number of jobs times terms. Ranking thousands of
+postings against every resume version is a fraction of a second of NumPy
+work once the texts are cached, so LLM analysis can be kept for the top of
+each ranking.
+
+NumPy is required for scoring; without it ``available()`` is False and the
+match endpoints answer 503.
+"""
+import hashlib
+import math
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from config import MATCH_CACHE_ENTRIES
+from services.search import tokenize
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does doing
+each etc for from had has have having he her here his how i if in into is it its just may me more most
+must my no nor not of off on once only or other our out over own per same she should so some such than
+that the their them then there these they this those through to too under until up us very via was we
+were what when where which while who whom why will with within without would you your
+ability able experience including years year work working role position team strong preferred required
+requirements responsibilities job candidate candidates company opportunity plus
+""".split())
+
+def available() -> bool:
+    return np is not None
+
+def terms(text: str) -> List[str]:
+    """Content words and bigrams of adjacent content words"""
+    words = [t for t in tokenize(text) if t not in STOPWORDS and not t.isdigit()]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def term_id(term: str) -> int:
+    """A 64-bit id for a term, the same in every process and batch"""
+    return int.from_bytes(hashlib.blake2b(term.encode(), digest_size=8).digest(), "little", signed=True)
+
+@dataclass
+class DocVector:
+    ids: "np.ndarray"      # term ids, unique
+    weights: "np.ndarray"  # 1 + log(tf) per id
+    terms: Tuple[str, ...]  # the term behind each id
+
+class VectorCache:
+    """Sparse term vectors by content hash, least recently used evicted"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._vectors: "OrderedDict[str, DocVector]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def vector(self, text: str) -> DocVector:
+        key = hashlib.sha256(text.encode()).hexdigest()
+        vector = self._vectors.get(key)
+        if vector is not None:
+            self._vectors.move_to_end(key)
+            return vector
+
+        counts = Counter(terms(text))
+        vector = DocVector(
+            ids=np.fromiter((term_id(t) for t in counts), dtype=np.int64, count=len(counts)),
+            weights=np.fromiter((1 + math.log(c) for c in counts.values()), dtype=np.float32, count=len(counts)),
+            terms=tuple(counts),
+        )
+        self._vectors[key] = vector
+        while len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
+        return vector
+
+vector_cache = VectorCache(MATCH_CACHE_ENTRIES)
+
+def _stack(vectors: List[DocVector]) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Row index, term id and weight of every non-zero entry"""
+    lengths = np.fromiter((len(v.ids) for v in vectors), dtype=np.int64, count=len(vectors))
+    rows = np.repeat(np.arange(len(vectors)), lengths)
+    if not len(rows):
+        return rows, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    return rows, np.concatenate([v.ids for v in vectors]), np.concatenate([v.weights for v in vectors])
+
+@dataclass
+class Scores:
+    matrix: "np.ndarray"       # cosine similarity, jobs x resumes
+    job_offsets: "np.ndarray"  # job i's entries are job_offsets[i]:job_offsets[i + 1]
+    job_columns: "np.ndarray"  # resume-term column of each job entry
+    job_weights: "np.ndarray"  # unit-length job weight of each entry
+    resumes: "np.ndarray"      # unit-length resume vectors over resume terms
+    terms: List[str]           # the term behind each column
+
+    def top(self, resume: int, top_n: int) -> "np.ndarray":
+        """Job indexes of the best top_n scores for one resume, best first"""
+        column = self.matrix[:, resume]
+        top_n = min(top_n, len(column))
+        if top_n == 0:
+            return np.zeros(0, dtype=np.int64)
+        candidates = np.argpartition(-column, top_n - 1)[:top_n]
+        return candidates[np.argsort(-column[candidates], kind="stable")]
+
+    def matched_terms(self, job: int, resume: int, count: int = 5) -> List[str]:
+        """The shared terms contributing most to one score"""
+        entries = slice(self.job_offsets[job], self.job_offsets[job + 1])
+        columns = self.job_columns[entries]
+        contributions = self.job_weights[entries] * self.resumes[resume, columns]
+        best = np.argsort(-contributions, kind="stable")[:count]
+        return [self.terms[columns[i]] for i in best if contributions[i] > 0]
+
+def score(resume_texts: List[str], job_texts: List[str]) -> Scores:
+    """Cosine similarity of every job to every resume"""
+    with vector_cache.lock:
+        resumes = [vector_cache.vector(t) for t in resume_texts]
+        jobs = [vector_cache.vector(t) for t in job_texts]
+
+    r_rows, r_ids, r_tf = _stack(resumes)
+    j_rows, j_ids, j_tf = _stack(jobs)
+
+    # The batch's own vocabulary, and smoothed IDF over its documents
+    vocabulary, index, df = np.unique(np.concatenate([r_ids, j_ids]), return_inverse=True, return_counts=True)
+    idf = (np.log((1 + len(resumes) + len(jobs)) / (1 + df)) + 1).astype(np.float32)
+    r_terms, j_terms = index[:len(r_ids)], index[len(r_ids):]
+
+    # Only terms found in some resume can contribute to a dot product
+    columns = np.unique(r_terms)
+    column_of = np.full(len(vocabulary), -1, dtype=np.int64)
+    column_of[columns] = np.arange(len(columns))
+
+    resume_matrix = np.zeros((len(resumes), len(columns)), dtype=np.float32)
+    resume_matrix[r_rows, column_of[r_terms]] = r_tf * idf[r_terms]
+    resume_norms = np.linalg.norm(resume_matrix, axis=1)
+    resume_matrix /= np.where(resume_norms > 0, resume_norms, 1)[:, None]
+
+    # Job norms cover all of a job's terms, not just the ones a resume
+    # shares; only the shared entries are kept, as a sparse row per job
+    j_weights = j_tf * idf[j_terms]
+    job_norms = np.sqrt(np.bincount(j_rows, weights=j_weights ** 2, minlength=len(jobs))).astype(np.float32)
+    shared = column_of[j_terms] >= 0
+    job_rows = j_rows[shared]
+    job_columns = column_of[j_terms[shared]]
+    job_weights = j_weights[shared] / np.where(job_norms > 0, job_norms, 1)[job_rows]
+
+    matrix = np.zeros((len(jobs), len(resumes)), dtype=np.float32)
+    for r in range(len(resumes)):
+        matrix[:, r] = np.bincount(job_rows, weights=job_weights * resume_matrix[r, job_columns], minlength=len(jobs))
+
+    names = {i: t for v in resumes for i, t in zip(v.ids.tolist(), v.terms)}
+    return Scores(
+        matrix=matrix,
+        job_offsets=np.searchsorted(job_rows, np.arange(len(jobs) + 1)),
+        job_columns=job_columns,
+        job_weights=job_weights,
+        resumes=resume_matrix,
+        terms=[names[i] for i in vocabulary[columns].tolist()],
+    )
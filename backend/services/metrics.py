@@ -0,0 +1,238 @@
+"""Request and database instrumentation in the Prometheus text format.
+
+MetricsMiddleware times every request by its route template (so
+/api/applications/{id} is one series, not one per id), counts response bytes
+as they are sent and tracks requests in flight. Requests slower than
+SLOW_REQUEST_SECONDS are logged. services.database.execute records each
+query's table, operation, duration and row count via observe_query, and the
+storage helpers record transfers via observe_storage. GET /metrics renders
+everything for a Prometheus scrape.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from config import SLOW_REQUEST_SECONDS
+
+logger = logging.getLogger("job_command_center.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[tuple, float] = defaultdict(float)
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] += amount
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}")
+        return lines
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+        self._counts: Dict[tuple, List[int]] = {}
+        self._sums: Dict[tuple, float] = defaultdict(float)
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            counts = self._counts.setdefault(labels, [0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[labels] += value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for labels, counts in sorted(self._counts.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, float("inf")), counts):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labels, labels, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labels, labels)} {_format_value(self._sums[labels])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}")
+        return lines
+
+http_requests = Counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+http_duration = Histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+http_response_size = Histogram(
+    "http_response_size_bytes", "HTTP response body size", ("method", "route"), buckets=SIZE_BUCKETS
+)
+http_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being handled")
+db_calls = Counter("db_calls_total", "Database calls by table, operation and outcome", ("table", "operation", "outcome"))
+db_duration = Histogram("db_call_duration_seconds", "Database call latency", ("table", "operation"))
+db_rows = Histogram("db_rows_returned", "Rows returned per database call", ("table", "operation"), buckets=ROW_BUCKETS)
+db_in_flight = Gauge("db_calls_in_flight", "Database calls currently running or waiting for a worker")
+storage_calls = Counter("storage_calls_total", "Storage transfers by bucket, operation and outcome", ("bucket", "operation", "outcome"))
+storage_duration = Histogram("storage_call_duration_seconds", "Storage call latency", ("bucket", "operation"))
+storage_bytes = Counter("storage_bytes_total", "Bytes uploaded to or downloaded from storage", ("bucket", "operation"))
+storage_deduplicated = Counter(
+    "storage_deduplicated_total", "Uploads not sent to storage because the content was already stored", ("bucket",)
+)
+storage_collected = Counter("storage_blobs_collected_total", "Unreferenced blobs removed from storage", ("bucket",))
+followup_reminders = Counter("followup_reminders_total", "Follow-up reminders created by the background tick", ("kind",))
+
+REGISTRY: List[Metric] = [
+    http_requests, http_duration, http_response_size, http_in_flight,
+    db_calls, db_duration, db_rows, db_in_flight,
+    storage_calls, storage_duration, storage_bytes, storage_deduplicated, storage_collected,
+    followup_reminders,
+]
+
+def render() -> str:
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+# Database calls
+
+_METHOD_OPERATIONS = {"GET": "select", "HEAD": "select", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+
+def describe_query(query) -> Tuple[str, str]:
+    """(table, operation) labels for a supabase-py or SQLite query builder"""
+    request = getattr(query, "request", None)
+    if request is None:
+        return getattr(query, "table_name", "unknown"), getattr(query, "operation", "unknown")
+
+    path = request.path.path
+    method = str(getattr(request.http_method, "value", request.http_method))
+    if "/rpc/" in path:
+        return path.rsplit("/rpc/", 1)[1], "rpc"
+    operation = _METHOD_OPERATIONS.get(method, method.lower())
+    if operation == "insert" and "resolution=" in request.headers.get("prefer", ""):
+        operation = "upsert"
+    return path.rsplit("/", 1)[1], operation
+
+async def observe_query(query, call):
+    """Await ``call()`` (which executes ``query``), recording its metrics"""
+    table, operation = describe_query(query)
+    db_in_flight.inc()
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response = await call()
+        outcome = "ok"
+    finally:
+        db_in_flight.dec()
+        db_duration.observe(time.perf_counter() - started, table, operation)
+        db_calls.inc(table, operation, outcome)
+    data = getattr(response, "data", None)
+    db_rows.observe(len(data) if isinstance(data, list) else int(data is not None), table, operation)
+    return response
+
+def observe_storage(bucket: str, operation: str, started: float, outcome: str, size: Optional[int] = None):
+    """Record a storage transfer that began at ``started`` (perf_counter)"""
+    storage_duration.observe(time.perf_counter() - started, bucket, operation)
+    storage_calls.inc(bucket, operation, outcome)
+    if size:
+        storage_bytes.inc(bucket, operation, amount=size)
+
+# HTTP requests
+
+def route_template(scope) -> str:
+    """The matched route's path template, set in the scope by routing.
+
+    Depending on the FastAPI version, a route from an included router carries
+    either its full path or only the part below the router's prefix. Prefixes
+    are literal, so the segments above the template are taken from the request
+    path. Requests no route matched share one label, so scans of random paths
+    don't add a series each."""
+    path = getattr(scope.get("route"), "path", None)
+    if not isinstance(path, str):
+        return "unmatched"
+    depth = path.count("/")
+    segments = scope["path"].rstrip("/").split("/")
+    return "/".join(segments[:len(segments) - depth]) + path
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and body size per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec()
+            route = route_template(scope)
+            method = scope["method"]
+            http_requests.inc(method, route, str(status))
+            http_duration.observe(elapsed, method, route)
+            http_response_size.observe(size, method, route)
+            if elapsed >= SLOW_REQUEST_SECONDS:
+                query = scope.get("query_string", b"").decode("latin-1")
+                logger.warning(
+                    "Slow request: %s %s%s -> %s in %.3fs (%d bytes)",
+                    method, scope["path"], f"?{query}" if query else "", status, elapsed, size,
+                )
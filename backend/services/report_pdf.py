@@ -0,0 +1,192 @@
+"""PDF layouts for the interview prep and job search summary reports.
+
+These functions run inside the worker process pool (see services.reports),
+so this module only imports the standard library and reportlab. The layouts
+follow the ones the frontend drew with jsPDF: an A4 page measured in
+millimetres from the top left, Helvetica, and the same sections and limits.
+Output is built with reportlab's invariant mode, so the same inputs always
+give the same bytes.
+"""
+import io
+from datetime import datetime
+from typing import List, Optional
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen import canvas
+except ImportError:
+    canvas = None
+
+# Statuses left out of the summary's active list (as in the frontend report)
+INACTIVE_STATUSES = ("Rejected", "Withdrawn", "Ghost")
+
+def available() -> bool:
+    return canvas is not None
+
+def format_date(value) -> str:
+    """Dates as formatDate in src/utils shows them: "Jan 5, 2024" """
+    if not value:
+        return "-"
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return str(value)
+    return f"{parsed:%b} {parsed.day}, {parsed.year}"
+
+class _Page:
+    """A canvas written top to bottom with positions in millimetres"""
+
+    def __init__(self, title: str):
+        self.buffer = io.BytesIO()
+        self.canvas = canvas.Canvas(self.buffer, pagesize=A4, invariant=1)
+        self.canvas.setTitle(title)
+        self.width = A4[0] / mm
+        self.height = A4[1] / mm
+        self.font = ("Helvetica", 10)
+        self.y = 20.0
+
+    def set_font(self, size: float, bold: bool = False):
+        self.font = ("Helvetica-Bold" if bold else "Helvetica", size)
+        self.canvas.setFont(*self.font)
+
+    def text(self, value: str, x: float, align: str = "left"):
+        x, y = x * mm, (self.height - self.y) * mm
+        if align == "center":
+            self.canvas.drawCentredString(x, y, value)
+        else:
+            self.canvas.drawString(x, y, value)
+
+    def split(self, value: str, width: float) -> List[str]:
+        return simpleSplit(value, self.font[0], self.font[1], width * mm)
+
+    def break_after(self, limit: float):
+        """Start a new page if the cursor is past ``limit``"""
+        if self.y > limit:
+            self.canvas.showPage()
+            self.canvas.setFont(*self.font)
+            self.y = 20.0
+
+    def heading(self, value: str, step: float = 7):
+        self.set_font(self.font[1], bold=True)
+        self.text(value, 20)
+        self.y += step
+        self.set_font(self.font[1])
+
+    def finish(self) -> bytes:
+        self.canvas.showPage()
+        self.canvas.save()
+        return self.buffer.getvalue()
+
+def interview_prep(application: dict, resume_name: Optional[str], generated: str) -> bytes:
+    """The printable one-page brief for an application's interviews"""
+    page = _Page(f"Interview Preparation - {application.get('company')}")
+    center = page.width / 2
+
+    page.set_font(20, bold=True)
+    page.text("Interview Preparation", center, "center")
+    page.y += 15
+
+    page.set_font(16, bold=True)
+    page.text(str(application.get("company") or ""), center, "center")
+    page.y += 8
+    page.set_font(12)
+    page.text(str(application.get("title") or ""), center, "center")
+    page.y += 15
+
+    page.set_font(10)
+    page.heading("Quick Info")
+    info = [
+        f"Location: {application.get('location') or 'Not specified'}",
+        f"Applied: {format_date(application.get('date_applied'))}",
+        f"Current Status: {application.get('status')}",
+        f"Resume Version: {resume_name or 'Not specified'}",
+        f"Referral: {application['referral']}" if application.get("referral") else None,
+    ]
+    for line in filter(None, info):
+        page.text(line, 25)
+        page.y += 6
+    page.y += 10
+
+    history = [h for h in application.get("status_history") or [] if isinstance(h, dict)]
+    if history:
+        page.heading("Timeline")
+        for entry in history:
+            notes = f": {entry['notes']}" if entry.get("notes") else ""
+            for line in page.split(f"{format_date(entry.get('date'))} - {entry.get('status')}{notes}", page.width - 50):
+                page.text(f"• {line}", 25)
+                page.y += 6
+        page.y += 10
+
+    prep = application.get("interview_prep") or {}
+    if prep.get("companyResearch"):
+        page.heading("Company Research")
+        for line in page.split(prep["companyResearch"], page.width - 50)[:10]:
+            page.text(line, 25)
+            page.y += 6
+        page.y += 5
+    for key, title in (("questionsToAsk", "Questions to Ask"), ("technicalTopics", "Technical Topics to Review")):
+        if prep.get(key):
+            page.heading(title)
+            for item in prep[key][:5]:
+                page.text(f"• {item}", 25)
+                page.y += 6
+            page.y += 5
+
+    if application.get("job_description"):
+        page.break_after(250)
+        page.heading("Job Description")
+        page.set_font(9)
+        for line in page.split(application["job_description"], page.width - 50)[:40]:
+            page.break_after(280)
+            page.text(line, 25)
+            page.y += 5
+
+    page.set_font(8)
+    page.canvas.setFillGray(0.5)
+    page.y = page.height - 10
+    page.text(f"Generated {generated} | Job Command Center", center, "center")
+    return page.finish()
+
+def search_summary(total: int, by_status: dict, active: List[dict], generated: str) -> bytes:
+    """Key metrics, the status breakdown and the most recent active applications"""
+    page = _Page("Job Search Summary")
+    center = page.width / 2
+
+    page.set_font(20, bold=True)
+    page.text("Job Search Summary", center, "center")
+    page.y += 10
+    page.set_font(10)
+    page.text(f"Generated: {generated}", center, "center")
+    page.y += 20
+
+    active_count = total - sum(by_status.get(s, 0) for s in INACTIVE_STATUSES)
+    response_rate = round((total - by_status.get("Applied", 0)) / total * 100) if total else 0
+    page.set_font(14)
+    page.heading("Key Metrics", 10)
+    page.set_font(11)
+    for line in (f"Total Applications: {total}", f"Active Applications: {active_count}",
+                 f"Response Rate: {response_rate}%"):
+        page.text(line, 25)
+        page.y += 8
+    page.y += 10
+
+    page.set_font(14)
+    page.heading("By Status", 10)
+    page.set_font(11)
+    for status, count in by_status.items():
+        page.text(f"{status}: {count}", 25)
+        page.y += 7
+    page.y += 10
+
+    if active:
+        page.set_font(14)
+        page.heading("Active Applications", 10)
+        page.set_font(9)
+        for application in active:
+            page.break_after(270)
+            page.text(f"• {application.get('company')} - {application.get('title')} ({application.get('status')})", 25)
+            page.y += 6
+
+    return page.finish()
@@ -0,0 +1,70 @@
+"""Server-side PDF reports with a cache keyed by their inputs.
+
+Reports are drawn by services.report_pdf in the worker process pool shared
+with document parsing, so a large report doesn't hold up the event loop or
+the browser. Each report's key is a SHA-256 of everything drawn on it: the
+rows read for it and the date it is generated for. The rendered PDF is kept
+in memory under that key, so asking again for a report whose rows haven't
+changed reads the rows and returns the cached bytes without rendering, and
+the key doubles as the response ETag. Requests for a report that is still
+rendering wait for that render instead of starting another.
+"""
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from config import REPORT_CACHE_ENTRIES
+from services.documents import run_in_pool
+from services import report_pdf
+
+available = report_pdf.available
+
+def report_key(kind: str, *inputs) -> str:
+    payload = json.dumps([kind, *inputs], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+class ReportCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def get(self, key: str):
+        pdf = self._entries.get(key)
+        if pdf is not None:
+            self._entries.move_to_end(key)
+        return pdf
+
+    def put(self, key: str, pdf: bytes):
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = pdf
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def render(self, key: str, func: Callable, *args) -> Tuple[bytes, bool]:
+        """The PDF for ``key``, rendering ``func(*args)`` in the pool on a
+        miss, and whether it came from the cache"""
+        pdf = self.get(key)
+        if pdf is not None:
+            return pdf, True
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = asyncio.ensure_future(self._render(key, func, *args))
+        return await asyncio.shield(pending), False
+
+    async def _render(self, key: str, func: Callable, *args) -> bytes:
+        try:
+            pdf = await run_in_pool(func, *args)
+            self.put(key, pdf)
+            return pdf
+        finally:
+            del self._pending[key]
+
+    def clear(self):
+        self._entries.clear()
+
+report_cache = ReportCache(REPORT_CACHE_ENTRIES)
@@ -0,0 +1,543 @@
+"""Deep research: a staged job search driven by an LLM, run in the backend.
+
+A run goes through the STAGES in order: analyze the resume into a search
+strategy, run its queries against the job search providers, ask the LLM to
+refine the strategy and run the refined queries, check the postings against
+the seen-job index, analyze the unanalyzed postings in batches, and total up
+the results. Each stage's output is saved in the run's checkpoints as soon as
+the stage finishes, so a run interrupted by a restart resumes after its last
+finished stage instead of starting over. A worker claims a run by moving it
+to running with a conditional update, so two workers never execute the same
+run. The claim is a lease: the worker renews heartbeat_at with every
+checkpoint and every RESEARCH_LEASE_SECONDS / 4 in between, and each write
+is conditional on the heartbeat it last wrote, so a worker that lost its
+lease stops instead of overwriting the new owner's progress. Runs
+interrupted by a shutdown, and running runs whose lease expired because
+their worker died, are resumed at startup and then every
+RESEARCH_LEASE_SECONDS, unless they were started with an api_key from the
+request, which isn't stored; those are resumed by sending it again.
+
+The seen-job index (research_seen_jobs) is keyed by the resume's text hash
+and a fingerprint of the posting's normalized company, title and location.
+It replaces the browser's last-search list: postings are marked new for the
+run that first found them, and a posting analyzed by an earlier run (or an
+earlier attempt of this one) keeps that analysis, so a rerun only sends the
+delta to the LLM. Match batches are saved as they complete and run at most
+RESEARCH_CONCURRENCY at a time. LLM calls go through the gateway, so a
+resumed stage that repeats a prompt is served from llm_cache.
+
+Progress is published to subscribers (the SSE endpoint) as events.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from fastapi import HTTPException
+
+from config import RESEARCH_BATCH_SIZE, RESEARCH_CONCURRENCY, RESEARCH_MAX_JOBS, RESEARCH_LEASE_SECONDS
+from services.supabase_client import get_supabase_client
+from services.database import execute
+from services.bulk import chunked
+from services.job_search import job_search, dedup_key
+from services.llm import llm_gateway, LLMError
+from services import research_prompts as prompts
+
+logger = logging.getLogger("job_command_center.research")
+
+RUNS_TABLE = "research_runs"
+SEEN_TABLE = "research_seen_jobs"
+
+# Statuses a run can be claimed from to execute it, besides running with an
+# expired lease
+CLAIMABLE_STATUSES = ["pending", "interrupted", "failed"]
+
+# Lease renewals per RESEARCH_LEASE_SECONDS while a stage runs
+HEARTBEATS_PER_LEASE = 4
+
+# (stage, progress message) in the order they run
+STAGES = [
+    ("profile", "Analyzing your resume in depth..."),
+    ("search", "Executing multi-query search strategy..."),
+    ("refine", "Refining the search strategy..."),
+    ("dedupe", "Checking postings against earlier research..."),
+    ("match", "Performing deep match analysis with AI..."),
+    ("finalize", "Finalizing research results..."),
+]
+
+HIGH_PRIORITY_QUERIES = 5
+MEDIUM_PRIORITY_QUERIES = 3
+REFINED_QUERIES = 3
+TOP_MATCH_SCORE = 70
+
+TEMPERATURE = 0.7
+PROFILE_MAX_TOKENS = 4000
+REFINE_MAX_TOKENS = 2000
+MATCH_MAX_TOKENS = 8000
+
+# Characters of the fingerprint used as the job ID inside a match prompt
+PROMPT_ID_LENGTH = 12
+
+class ResearchError(Exception):
+    pass
+
+class LeaseLost(Exception):
+    """Another worker took the run over after this worker's lease expired"""
+
+def resume_scope(resume_text: str) -> str:
+    """Hash of the resume text with whitespace collapsed"""
+    return hashlib.sha256(" ".join(resume_text.split()).encode()).hexdigest()
+
+def fingerprint(posting: dict) -> str:
+    """Stable ID for a posting: its normalized company, title and location"""
+    return hashlib.sha256("\x1f".join(dedup_key(posting)).encode()).hexdigest()
+
+def parse_json(content: str) -> dict:
+    """The JSON object in an LLM reply, which may be wrapped in prose"""
+    match = re.search(r"\{.*\}", content, re.S)
+    if not match:
+        raise ResearchError("The LLM reply contained no JSON")
+    try:
+        return json.loads(match.group(0))
+    except ValueError as e:
+        raise ResearchError(f"The LLM reply was not valid JSON: {e}") from e
+
+def merge_postings(postings: List[dict]) -> Dict[str, dict]:
+    """Postings by fingerprint, first one wins, with every source listed"""
+    merged: Dict[str, dict] = {}
+    for posting in postings:
+        key = fingerprint(posting)
+        sources = posting.get("sources") or [posting["source"]]
+        existing = merged.get(key)
+        if existing is None:
+            merged[key] = {**posting, "sources": list(sources)}
+        else:
+            existing["sources"].extend(s for s in sources if s not in existing["sources"])
+    return merged
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+def _expired_lease() -> str:
+    """PostgREST filter for a running run whose lease has expired (or that
+    was claimed before runs had one)"""
+    cutoff = (datetime.utcnow() - timedelta(seconds=RESEARCH_LEASE_SECONDS)).isoformat()
+    return f'and(status.eq.running,or(heartbeat_at.is.null,heartbeat_at.lt."{cutoff}"))'
+
+def _score(analysis: Optional[dict]) -> float:
+    try:
+        return float((analysis or {}).get("score") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+class Run:
+    """A research run being executed: its row plus the LLM credentials"""
+
+    def __init__(self, row: dict, api_key: Optional[str]):
+        self.row = row
+        self.id = row["id"]
+        self.scope = row["scope"]
+        self.params = row.get("params") or {}
+        self.checkpoints = row.get("checkpoints") or {}
+        self.api_key = api_key
+        self.provider = llm_gateway.provider(self.params["provider"], api_key)
+        self.model = self.params.get("model") or self.provider.default_model
+        # Serializes lease renewals, which are conditional on the last one
+        self.lease = asyncio.Lock()
+        self.lost = False
+
+class ResearchPipeline:
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._resumer: Optional[asyncio.Task] = None
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self._latest: Dict[str, dict] = {}
+
+    def running(self, run_id: str) -> bool:
+        return run_id in self._tasks
+
+    def latest(self, run_id: str) -> Optional[dict]:
+        """The last event published for a run executing in this process"""
+        return self._latest.get(run_id)
+
+    def subscribe(self, run_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._listeners.setdefault(run_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, run_id: str, queue: asyncio.Queue):
+        listeners = self._listeners.get(run_id)
+        if listeners is not None:
+            listeners.discard(queue)
+            if not listeners:
+                del self._listeners[run_id]
+
+    def _publish(self, run_id: str, event: dict):
+        event = {"run_id": run_id, **event}
+        self._latest[run_id] = event
+        for queue in self._listeners.get(run_id, ()):
+            queue.put_nowait(event)
+
+    def _progress(self, run: Run, stage: str, message: str, fraction: float = 0, detail: Optional[str] = None):
+        step = next(i for i, (name, _) in enumerate(STAGES) if name == stage)
+        self._publish(run.id, {
+            "type": "progress",
+            "stage": stage,
+            "step": step + 1,
+            "total": len(STAGES),
+            "message": message,
+            "progress": round(100 * (step + fraction) / len(STAGES)),
+            "detail": detail,
+        })
+
+    async def create(self, resume_text: str, resume_id: Optional[str], params: dict,
+                     api_key: Optional[str] = None) -> dict:
+        """Save a new run and start executing it"""
+        now = _now()
+        row = {
+            "id": str(uuid.uuid4()),
+            "resume_id": resume_id,
+            "resume_text": resume_text,
+            "scope": resume_scope(resume_text),
+            # The key itself is never stored, only whether the run needs one sent again
+            "params": {**params, "request_key": api_key is not None},
+            "status": "pending",
+            "checkpoints": {},
+            "created_at": now,
+            "updated_at": now,
+        }
+        supabase = get_supabase_client()
+        result = await execute(supabase.table(RUNS_TABLE).insert(row))
+        return await self.start(result.data[0], api_key) or result.data[0]
+
+    async def start(self, row: dict, api_key: Optional[str] = None) -> Optional[dict]:
+        """Claim a run and execute it from its last checkpoint. Returns the
+        claimed row, or None if the run is already running or complete."""
+        llm_gateway.provider((row.get("params") or {}).get("provider"), api_key)
+        supabase = get_supabase_client()
+        now = _now()
+        result = await execute(
+            supabase.table(RUNS_TABLE)
+            .update({"status": "running", "error": None, "updated_at": now, "heartbeat_at": now})
+            .eq("id", row["id"])
+            .or_(f"status.in.({','.join(CLAIMABLE_STATUSES)}),{_expired_lease()}")
+        )
+        if not result.data:
+            return None
+        run = Run(result.data[0], api_key)
+        task = asyncio.create_task(self._execute(run))
+        self._tasks[run.id] = task
+        task.add_done_callback(lambda _: self._finished(run.id))
+        return run.row
+
+    async def resume_interrupted(self) -> int:
+        """Resume runs left interrupted by a shutdown, or running with an
+        expired lease, that use the server's LLM keys; returns how many were
+        resumed"""
+        supabase = get_supabase_client()
+        resumed = 0
+        try:
+            result = await execute(
+                supabase.table(RUNS_TABLE).select("*").or_(f"status.eq.interrupted,{_expired_lease()}")
+            )
+            for row in result.data:
+                if (row.get("params") or {}).get("request_key"):
+                    continue
+                try:
+                    if await self.start(row) is not None:
+                        resumed += 1
+                except HTTPException as e:
+                    logger.warning("Not resuming research run %s: %s", row["id"], e.detail)
+        except Exception:
+            logger.exception("Could not resume interrupted research runs")
+        return resumed
+
+    async def _resume_periodically(self):
+        while True:
+            resumed = await self.resume_interrupted()
+            if resumed:
+                logger.info("Resumed %d research runs", resumed)
+            await asyncio.sleep(RESEARCH_LEASE_SECONDS)
+
+    def start_resuming(self):
+        """Resume interrupted runs now and whenever a lease could have expired"""
+        if self._resumer is None:
+            self._resumer = asyncio.create_task(self._resume_periodically())
+
+    def _finished(self, run_id: str):
+        self._tasks.pop(run_id, None)
+        self._latest.pop(run_id, None)
+
+    async def close(self):
+        if self._resumer is not None:
+            self._resumer.cancel()
+            self._resumer = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _save(self, run: Run, **changes):
+        """Write changes to the run and renew its lease, unless another
+        worker has taken the run over"""
+        async with run.lease:
+            now = _now()
+            changes = {**changes, **({"updated_at": now} if changes else {}), "heartbeat_at": now}
+            supabase = get_supabase_client()
+            result = await execute(
+                supabase.table(RUNS_TABLE).update(changes)
+                .eq("id", run.id).eq("heartbeat_at", run.row["heartbeat_at"])
+            )
+            if not result.data:
+                raise LeaseLost(f"Research run {run.id} was taken over by another worker")
+            run.row.update(changes)
+
+    async def _heartbeat(self, run: Run, task: asyncio.Task):
+        """Renew the lease while a stage runs; stops the run if it was lost"""
+        while True:
+            await asyncio.sleep(RESEARCH_LEASE_SECONDS / HEARTBEATS_PER_LEASE)
+            try:
+                await self._save(run)
+            except LeaseLost:
+                run.lost = True
+                task.cancel()
+                return
+            except Exception:
+                logger.exception("Could not renew the lease of research run %s", run.id)
+
+    async def _execute(self, run: Run):
+        heartbeat = asyncio.create_task(self._heartbeat(run, asyncio.current_task()))
+        try:
+            for stage, message in STAGES:
+                if stage in run.checkpoints:
+                    continue
+                self._progress(run, stage, message)
+                run.checkpoints[stage] = await getattr(self, f"_{stage}")(run)
+                await self._save(run, stage=stage, checkpoints=run.checkpoints)
+            await self._save(run, status="completed", stats=run.checkpoints["finalize"])
+            self._publish(run.id, {"type": "done", "progress": 100, "message": "Research complete!",
+                                   "stats": run.checkpoints["finalize"]})
+        except LeaseLost as e:
+            self._lost(run, e)
+        except asyncio.CancelledError:
+            if run.lost:
+                self._lost(run, LeaseLost(f"Research run {run.id} was taken over by another worker"))
+                return
+            # Shutting down: leave the run resumable from its last checkpoint
+            try:
+                await asyncio.shield(self._save(run, status="interrupted"))
+            except LeaseLost:
+                pass
+            self._publish(run.id, {"type": "interrupted", "message": "Research was interrupted"})
+            raise
+        except Exception as e:
+            if not isinstance(e, (ResearchError, LLMError)):
+                logger.exception("Research run %s failed", run.id)
+            try:
+                await self._save(run, status="failed", error=str(e))
+            except LeaseLost as lost:
+                self._lost(run, lost)
+                return
+            self._publish(run.id, {"type": "error", "message": f"Research failed: {e}"})
+        finally:
+            heartbeat.cancel()
+
+    def _lost(self, run: Run, error: LeaseLost):
+        logger.warning("%s; stopping here", error)
+        self._publish(run.id, {"type": "interrupted", "message": "Research continued in another worker"})
+
+    async def _complete(self, run: Run, messages: List[dict], max_tokens: int) -> dict:
+        content, _, _ = await llm_gateway.complete(
+            run.provider, run.model, messages, TEMPERATURE, max_tokens, run.api_key
+        )
+        return parse_json(content)
+
+    async def _profile(self, run: Run) -> dict:
+        return await self._complete(run, prompts.resume_analysis(run.row["resume_text"]), PROFILE_MAX_TOKENS)
+
+    async def _run_queries(self, run: Run, stage: str, queries: List[str], location: str) -> dict:
+        """Search every query concurrently; returns the postings and a history entry per query"""
+        done = 0
+
+        async def search(query: str):
+            nonlocal done
+            postings, errors = await job_search.search([query], location, 1, run.params.get("providers"))
+            done += 1
+            self._progress(run, stage, f'Searching: "{query[:40]}..."', done / len(queries),
+                           f"Query {done} of {len(queries)}")
+            return postings, errors
+
+        outcomes = await asyncio.gather(*(search(q) for q in queries))
+        postings, history = [], []
+        for query, (found, errors) in zip(queries, outcomes):
+            postings.extend(found)
+            history.append({"query": query, "results": len(found), "errors": [e["detail"] for e in errors]})
+        return {"queries": queries, "location": location, "postings": postings, "history": history}
+
+    async def _search(self, run: Run) -> dict:
+        profile = run.checkpoints["profile"]
+        strategy = [q for q in profile.get("searchQueries") or [] if isinstance(q, dict) and q.get("query")]
+        queries = (
+            [q["query"] for q in strategy if q.get("priority") == "high"][:HIGH_PRIORITY_QUERIES]
+            + [q["query"] for q in strategy if q.get("priority") == "medium"][:MEDIUM_PRIORITY_QUERIES]
+        ) or [q["query"] for q in strategy][:HIGH_PRIORITY_QUERIES + MEDIUM_PRIORITY_QUERIES]
+        if not queries:
+            raise ResearchError("The resume analysis suggested no search queries")
+        location = run.params.get("location") or next(iter(profile.get("targetLocations") or []), "") or ""
+        return await self._run_queries(run, "search", queries, location)
+
+    async def _refine(self, run: Run) -> dict:
+        search = run.checkpoints["search"]
+        messages = prompts.search_refinement(run.checkpoints["profile"], search["postings"], search["history"])
+        try:
+            refinement = await self._complete(run, messages, REFINE_MAX_TOKENS)
+        except ResearchError as e:
+            # Refinement only adds queries, so a bad reply doesn't stop the run
+            return {"skipped": str(e), "postings": []}
+        tried = {q.lower() for q in search["queries"]}
+        queries = []
+        for entry in refinement.get("refinedQueries") or []:
+            query = entry.get("query") if isinstance(entry, dict) else None
+            if query and query.lower() not in tried and len(queries) < REFINED_QUERIES:
+                tried.add(query.lower())
+                queries.append(query)
+        searched = await self._run_queries(run, "refine", queries, search["location"]) if queries else {
+            "queries": [], "postings": [], "history": []}
+        return {**searched, "analysis": refinement.get("analysis"), "insights": refinement.get("insights")}
+
+    async def _dedupe(self, run: Run) -> dict:
+        merged = merge_postings(run.checkpoints["search"]["postings"] + run.checkpoints["refine"]["postings"])
+        fingerprints = list(merged)
+        supabase = get_supabase_client()
+
+        known = {}
+        for _, batch in chunked(fingerprints):
+            result = await execute(
+                supabase.table(SEEN_TABLE).select("fingerprint,first_run_id,analyzed_at")
+                .eq("scope", run.scope).in_("fingerprint", batch)
+            )
+            known.update((r["fingerprint"], r) for r in result.data)
+
+        now = _now()
+        unseen = [
+            {"scope": run.scope, "fingerprint": fp, "posting": merged[fp], "first_run_id": run.id,
+             "first_seen_at": now, "last_seen_at": now}
+            for fp in fingerprints if fp not in known
+        ]
+        for _, batch in chunked(unseen):
+            await execute(supabase.table(SEEN_TABLE).upsert(batch, on_conflict="scope,fingerprint"))
+        seen_before = [fp for fp in fingerprints if fp in known]
+        for _, batch in chunked(seen_before):
+            await execute(
+                supabase.table(SEEN_TABLE).update({"last_seen_at": now})
+                .eq("scope", run.scope).in_("fingerprint", batch)
+            )
+
+        new = [fp for fp in fingerprints if fp not in known or known[fp].get("first_run_id") == run.id]
+        pending = [fp for fp in fingerprints if not (known.get(fp) or {}).get("analyzed_at")]
+        return {
+            "fingerprints": fingerprints,
+            "new": new,
+            "pending": pending[:RESEARCH_MAX_JOBS],
+            "deferred": max(len(pending) - RESEARCH_MAX_JOBS, 0),
+        }
+
+    async def _load_seen(self, scope: str, fingerprints: List[str], columns: str) -> Dict[str, dict]:
+        supabase = get_supabase_client()
+        rows = {}
+        for _, batch in chunked(fingerprints):
+            result = await execute(
+                supabase.table(SEEN_TABLE).select(columns).eq("scope", scope).in_("fingerprint", batch)
+            )
+            rows.update((r["fingerprint"], r) for r in result.data)
+        return rows
+
+    async def _match(self, run: Run) -> dict:
+        # Batches saved before an interruption are skipped on resume
+        pending = run.checkpoints["dedupe"]["pending"]
+        rows = await self._load_seen(run.scope, pending, "fingerprint,posting,analyzed_at")
+        todo = [fp for fp in pending if fp in rows and not rows[fp].get("analyzed_at")]
+        batches = [todo[i:i + RESEARCH_BATCH_SIZE] for i in range(0, len(todo), RESEARCH_BATCH_SIZE)]
+        if not batches:
+            return {"analyzed": 0, "batches": 0, "errors": [], "summaries": []}
+
+        semaphore = asyncio.Semaphore(RESEARCH_CONCURRENCY)
+        supabase = get_supabase_client()
+        done = 0
+
+        async def analyze(batch: List[str]):
+            nonlocal done
+            jobs = [(fp[:PROMPT_ID_LENGTH], rows[fp]["posting"]) for fp in batch]
+            async with semaphore:
+                result = await self._complete(
+                    run, prompts.job_analysis(run.row["resume_text"], run.checkpoints["profile"], jobs),
+                    MATCH_MAX_TOKENS,
+                )
+            matches = {str(m.get("jobId")): m for m in result.get("matches") or [] if isinstance(m, dict)}
+            analyzed = 0
+            for fp in batch:
+                match = matches.get(fp[:PROMPT_ID_LENGTH])
+                if match is None:
+                    continue  # left unanalyzed for the next run
+                await execute(
+                    supabase.table(SEEN_TABLE).update({"analysis": match, "analyzed_at": _now()})
+                    .eq("scope", run.scope).eq("fingerprint", fp)
+                )
+                analyzed += 1
+            done += 1
+            self._progress(run, "match", "Performing deep match analysis with AI...", done / len(batches),
+                           f"Batch {done} of {len(batches)}")
+            return analyzed, {k: result.get(k) for k in ("overallStrategy", "marketInsights")}
+
+        outcomes = await asyncio.gather(*(analyze(b) for b in batches), return_exceptions=True)
+        failures = [o for o in outcomes if isinstance(o, BaseException)]
+        for failure in failures:
+            if not isinstance(failure, (ResearchError, LLMError)):
+                raise failure
+        if len(failures) == len(batches):
+            raise failures[0]
+        succeeded = [o for o in outcomes if not isinstance(o, BaseException)]
+        return {
+            "analyzed": sum(analyzed for analyzed, _ in succeeded),
+            "batches": len(batches),
+            "errors": [str(f) for f in failures],
+            "summaries": [summary for _, summary in succeeded],
+        }
+
+    async def _finalize(self, run: Run) -> dict:
+        dedupe = run.checkpoints["dedupe"]
+        rows = await self._load_seen(run.scope, dedupe["fingerprints"], "fingerprint,analysis")
+        scores = [_score(r.get("analysis")) for r in rows.values() if r.get("analysis")]
+        searches = run.checkpoints["search"]["history"] + run.checkpoints["refine"].get("history", [])
+        return {
+            "total_searches": len(searches),
+            "total_jobs_found": sum(entry["results"] for entry in searches),
+            "unique_jobs": len(dedupe["fingerprints"]),
+            "new_jobs": len(dedupe["new"]),
+            "analyzed": len(scores),
+            "newly_analyzed": run.checkpoints["match"]["analyzed"],
+            "deferred": dedupe["deferred"],
+            "top_matches": sum(1 for s in scores if s >= TOP_MATCH_SCORE),
+        }
+
+    async def results(self, run_row: dict) -> List[dict]:
+        """The run's postings with their analyses, best score first"""
+        dedupe = (run_row.get("checkpoints") or {}).get("dedupe")
+        if not dedupe:
+            return []
+        rows = await self._load_seen(
+            run_row["scope"], dedupe["fingerprints"], "fingerprint,posting,analysis,first_seen_at"
+        )
+        new = set(dedupe["new"])
+        results = [
+            {**rows[fp], "is_new": fp in new}
+            for fp in dedupe["fingerprints"] if fp in rows
+        ]
+        results.sort(key=lambda r: (r["analysis"] is not None, _score(r["analysis"])), reverse=True)
+        return results
+
+research = ResearchPipeline()
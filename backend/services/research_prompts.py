@@ -0,0 +1,246 @@
+"""Prompts for the deep research pipeline (services.research), ported from
+src/services/deepResearch.js so the browser and backend ask the same
+questions."""
+import json
+from typing import List
+
+# Longest posting description included in a match prompt
+DESCRIPTION_CHARS = 4000
+
+def _dump(value) -> str:
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+def resume_analysis(resume_text: str) -> List[dict]:
+    return [
+        {
+            "role": "system",
+            "content": """You are an expert career strategist and executive recruiter specializing in pharmaceutical, biotechnology, and life sciences industries.
+
+Perform a DEEP ANALYSIS of this resume to create a comprehensive job search strategy. Think step by step:
+
+1. EXPERIENCE ANALYSIS
+   - Total years of experience
+   - Career progression pattern
+   - Industry sectors worked in
+   - Types of companies (startup, mid-size, large pharma)
+   - Geographic experience
+
+2. TECHNICAL COMPETENCIES
+   - Core scientific/technical skills
+   - Analytical methods and instrumentation
+   - Therapeutic modalities (mRNA, AAV, mAb, small molecule, etc.)
+   - Regulatory knowledge (FDA, EMA, ICH)
+   - Software and systems
+
+3. LEADERSHIP & SOFT SKILLS
+   - Management experience
+   - Cross-functional collaboration
+   - Communication and presentation
+   - Project management methodologies
+
+4. UNIQUE VALUE PROPOSITION
+   - What makes this candidate stand out?
+   - Rare skill combinations
+   - Notable achievements
+   - Industry recognition
+
+5. JOB SEARCH STRATEGY
+   - Generate 15-20 highly specific search queries
+   - Include variations (title variations, skill-based, company-type based)
+   - Consider both obvious and non-obvious job titles
+   - Include niche searches that might surface hidden opportunities
+
+6. TARGET COMPANIES
+   - List 20+ specific companies that would be good fits
+   - Include large pharma, mid-size biotech, and promising startups
+   - Consider geographic preferences if mentioned
+
+7. SALARY EXPECTATIONS
+   - Estimate appropriate salary range based on experience
+   - Consider geographic adjustments
+
+Return as JSON:
+{
+  "summary": "Executive summary of candidate profile",
+  "yearsExperience": number,
+  "seniorityLevel": "Entry|Mid|Senior|Director|VP|C-Suite",
+  "coreCompetencies": ["string"],
+  "technicalSkills": ["string"],
+  "therapeuticModalities": ["string"],
+  "regulatoryExpertise": ["string"],
+  "leadershipSkills": ["string"],
+  "uniqueValueProps": ["string"],
+  "searchQueries": [
+    {
+      "query": "search string",
+      "rationale": "why this search",
+      "priority": "high|medium|low"
+    }
+  ],
+  "targetCompanies": [
+    {
+      "name": "company name",
+      "type": "Large Pharma|Mid-size Biotech|Startup|CDMO|CRO",
+      "rationale": "why good fit"
+    }
+  ],
+  "targetLocations": ["string"],
+  "salaryRange": {
+    "min": number,
+    "max": number,
+    "currency": "USD"
+  },
+  "careerInsights": "Strategic advice for job search",
+  "potentialChallenges": ["Areas that might need addressing"],
+  "recommendedImprovements": ["Suggestions for resume/profile"]
+}""",
+        },
+        {
+            "role": "user",
+            "content": f"Perform a deep analysis of this resume and create a comprehensive job search strategy:\n\n{resume_text}",
+        },
+    ]
+
+def search_refinement(profile: dict, postings: List[dict], search_history: List[dict]) -> List[dict]:
+    sample = [{"title": p["title"], "company": p["company"]} for p in postings[:10]]
+    return [
+        {
+            "role": "system",
+            "content": """You are a job search optimization expert. Based on the search results so far, suggest refinements to find better matches.
+
+Analyze:
+1. Which searches yielded good results?
+2. Which searches had poor results?
+3. What patterns do you see in successful matches?
+4. What new search angles should we try?
+
+Return as JSON:
+{
+  "analysis": "Brief analysis of current results",
+  "refinedQueries": [
+    {
+      "query": "new search string",
+      "rationale": "why this might work better"
+    }
+  ],
+  "dropQueries": ["queries that aren't working"],
+  "insights": "Key observations about the job market for this candidate"
+}""",
+        },
+        {
+            "role": "user",
+            "content": f"""
+## Candidate Profile:
+{_dump(profile)}
+
+## Search History:
+{_dump(search_history)}
+
+## Current Results Summary:
+{len(postings)} jobs found
+
+## Sample Results:
+{_dump(sample)}
+
+Please suggest search refinements.""",
+        },
+    ]
+
+def _job_section(number: int, job_id: str, posting: dict) -> str:
+    description = (posting.get("description") or "No description available")[:DESCRIPTION_CHARS]
+    return f"""
+### Job {number} (ID: {job_id})
+**Title:** {posting["title"]}
+**Company:** {posting["company"]}
+**Location:** {posting.get("location") or ""}
+**Salary:** {posting.get("salary") or "Not specified"}
+**Type:** {posting.get("job_type") or "Not specified"}
+**Posted:** {posting.get("posted_date") or "Unknown"}
+**Description:** {description}
+"""
+
+def job_analysis(resume_text: str, profile: dict, jobs: List[tuple]) -> List[dict]:
+    """jobs is a list of (job id, posting) pairs"""
+    sections = "\n".join(_job_section(i + 1, job_id, posting) for i, (job_id, posting) in enumerate(jobs))
+    return [
+        {
+            "role": "system",
+            "content": """You are an expert career advisor performing DEEP ANALYSIS of job matches. For each job, provide:
+
+1. MATCH SCORE (0-100)
+   - Based on skills alignment, experience level, and cultural fit
+
+2. DETAILED REASONING
+   - Walk through why this is or isn't a good match
+   - Consider both hard skills and soft factors
+
+3. SKILLS ANALYSIS
+   - Matching skills with evidence from resume
+   - Missing skills and how critical they are
+   - Transferable skills that could bridge gaps
+
+4. FIT ASSESSMENT
+   - Role level fit (over/under qualified?)
+   - Company culture indicators
+   - Growth potential
+
+5. APPLICATION STRATEGY
+   - Key points to emphasize in application
+   - Potential concerns to address proactively
+   - Networking suggestions
+
+6. INTERVIEW PREPARATION
+   - Likely technical questions
+   - Behavioral questions to prepare for
+   - Questions to ask the interviewer
+
+Return as JSON:
+{
+  "matches": [
+    {
+      "jobId": "string",
+      "score": number,
+      "tier": "Top Match|Strong Match|Good Match|Stretch|Long Shot",
+      "reasoning": "Detailed explanation of match score",
+      "matchingSkills": [{"skill": "string", "evidence": "from resume"}],
+      "missingSkills": [{"skill": "string", "criticality": "must-have|nice-to-have|learnable", "bridgeStrategy": "how to address"}],
+      "fitAssessment": {
+        "levelFit": "Under-qualified|Just Right|Over-qualified",
+        "cultureFit": "assessment",
+        "growthPotential": "assessment"
+      },
+      "applicationStrategy": {
+        "keyPoints": ["what to emphasize"],
+        "addressConcerns": ["proactive responses"],
+        "networkingTips": ["suggestions"]
+      },
+      "interviewPrep": {
+        "technicalQuestions": ["likely questions"],
+        "behavioralQuestions": ["likely questions"],
+        "questionsToAsk": ["good questions to ask"]
+      },
+      "recommendation": "Apply Now|Apply with Modifications|Consider|Skip",
+      "urgency": "high|medium|low"
+    }
+  ],
+  "overallStrategy": "Summary of recommended approach",
+  "topPicks": ["jobId1", "jobId2", "jobId3"],
+  "hiddenGems": ["jobIds that might be overlooked but worth considering"],
+  "marketInsights": "Observations about the current job market based on these listings"
+}""",
+        },
+        {
+            "role": "user",
+            "content": f"""
+## MY RESUME:
+{resume_text}
+
+## RESUME ANALYSIS:
+{_dump(profile)}
+
+## JOBS TO ANALYZE:
+{sections}
+
+Perform deep analysis of each job match.""",
+        },
+    ]
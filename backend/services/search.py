@@ -0,0 +1,145 @@
+"""In-process full-text index over applications.
+
+An inverted index from terms to per-field term frequencies, ranked with
+BM25F over company, title, tags, notes and job_description. The index is
+fed by the applications feed in services.indexes: loaded on the first
+search, updated by the application write handlers and refreshed with
+changes made by other worker processes.
+"""
+import math
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from services import indexes
+
+# Field weights for ranking
+SEARCH_FIELDS = {"company": 3.0, "title": 3.0, "tags": 2.0, "notes": 1.0, "job_description": 1.0}
+SEARCH_COLUMNS = "id,company,title,status,tags,notes,job_description,created_at,updated_at"
+
+# Fields short enough to return whole; the rest get a snippet around the first match
+SHORT_FIELDS = {"company", "title", "tags"}
+SNIPPET_CHARS = 160
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+K1 = 1.2
+B = 0.75
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 or t.isdigit()]
+
+def _field_text(row: dict, field: str) -> str:
+    value = row.get(field)
+    if isinstance(value, list):
+        return " ".join(str(v) for v in value)
+    return value or ""
+
+def _highlight(text: str, terms: Iterable[str], whole: bool) -> Optional[str]:
+    pattern = re.compile(r"\b(" + "|".join(re.escape(t) for t in terms) + r")\w*", re.IGNORECASE)
+    match = pattern.search(text)
+    if match is None:
+        return None
+    if not whole:
+        start = max(0, match.start() - SNIPPET_CHARS // 2)
+        end = min(len(text), start + SNIPPET_CHARS)
+        text = ("..." if start else "") + text[start:end] + ("..." if end < len(text) else "")
+    return pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", text)
+
+class SearchIndex:
+    def __init__(self):
+        self.docs: Dict[str, dict] = {}
+        self.lengths: Dict[str, float] = {}
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self.terms: List[str] = []  # sorted vocabulary for prefix lookups
+        self.total_length = 0.0
+
+    def _add(self, row: dict):
+        self._remove(row["id"])
+        weighted = defaultdict(float)
+        length = 0.0
+        for field, weight in SEARCH_FIELDS.items():
+            tokens = tokenize(_field_text(row, field))
+            length += weight * len(tokens)
+            for token in tokens:
+                weighted[token] += weight
+        for token, tf in weighted.items():
+            if token not in self.postings:
+                insort(self.terms, token)
+            self.postings[token][row["id"]] = tf
+        self.docs[row["id"]] = {k: row.get(k) for k in ("id", "company", "title", "status", *SEARCH_FIELDS)}
+        self.lengths[row["id"]] = length
+        self.total_length += length
+
+    def _remove(self, doc_id: str):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self.total_length -= self.lengths.pop(doc_id)
+        for field in SEARCH_FIELDS:
+            for token in set(tokenize(_field_text(doc, field))):
+                postings = self.postings.get(token)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self.postings[token]
+                        self.terms.pop(bisect_left(self.terms, token))
+
+    def _expand(self, term: str) -> List[str]:
+        """Vocabulary terms starting with ``term``"""
+        matches = []
+        i = bisect_left(self.terms, term)
+        while i < len(self.terms) and self.terms[i].startswith(term):
+            matches.append(self.terms[i])
+            i += 1
+        return matches
+
+    def search(self, query: str, limit: int, offset: int) -> Tuple[int, List[dict]]:
+        """Rank documents containing every query term (the last one as a prefix)"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.docs:
+            return 0, []
+
+        n = len(self.docs)
+        avg_length = self.total_length / n or 1.0
+        scores: Optional[Dict[str, float]] = None
+        for position, term in enumerate(terms):
+            variants = self._expand(term) if position == len(terms) - 1 else [term]
+            term_scores = defaultdict(float)
+            for variant in variants:
+                postings = self.postings.get(variant, {})
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = K1 * (1 - B + B * self.lengths[doc_id] / avg_length)
+                    term_scores[doc_id] += idf * tf * (K1 + 1) / (tf + norm)
+            if scores is None:
+                scores = dict(term_scores)
+            else:
+                scores = {d: s + term_scores[d] for d, s in scores.items() if d in term_scores}
+            if not scores:
+                return 0, []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        results = []
+        for doc_id, score in ranked[offset:offset + limit]:
+            doc = self.docs[doc_id]
+            highlights = {}
+            for field in SEARCH_FIELDS:
+                snippet = _highlight(_field_text(doc, field), terms, field in SHORT_FIELDS)
+                if snippet:
+                    highlights[field] = snippet
+            results.append({
+                "id": doc_id,
+                "company": doc["company"],
+                "title": doc["title"],
+                "status": doc["status"],
+                "score": round(score, 4),
+                "highlights": highlights,
+            })
+        return len(ranked), results
+
+    async def ensure_current(self):
+        await indexes.ensure_current("applications")
+
+search_index = SearchIndex()
+indexes.listen("applications", SEARCH_COLUMNS, search_index._add, search_index._remove)
@@ -0,0 +1,697 @@
+"""Embedded SQLite data backend and local filesystem file storage.
+
+Selected with DATA_BACKEND=sqlite for single-user installs, tests and
+benchmarks. SQLiteClient answers the part of the supabase-py interface the
+routers use: ``table(...)`` query builders with select/insert/update/upsert/
+delete, the eq/neq/gt/gte/lt/lte/like/ilike/is_/in_/or_ filters, order,
+limit and range, and ``storage.from_(bucket)`` for files. Route code is the
+same for both backends.
+
+File databases run in WAL mode with one connection per worker thread, so
+readers never wait on the writer. An in-memory database (SQLITE_PATH=:memory:)
+uses a single connection behind a lock.
+"""
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id TEXT PRIMARY KEY,
+    company TEXT NOT NULL,
+    title TEXT NOT NULL,
+    location TEXT,
+    region TEXT,
+    job_url TEXT,
+    salary TEXT,
+    company_type TEXT,
+    modality TEXT,
+    date_applied TEXT,
+    status TEXT,
+    status_history TEXT,
+    job_description TEXT,
+    ai_analysis TEXT,
+    interview_prep TEXT,
+    quality TEXT,
+    tags TEXT,
+    notes TEXT,
+    referral TEXT,
+    application_source TEXT,
+    resume_version TEXT,
+    version INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_applications_created ON applications (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_applications_updated ON applications (updated_at);
+CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status);
+
+CREATE TABLE IF NOT EXISTS target_companies (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT,
+    priority INTEGER,
+    status TEXT,
+    careers_url TEXT,
+    research TEXT,
+    connections TEXT,
+    notes TEXT,
+    version INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_target_companies_priority ON target_companies (priority, id);
+CREATE INDEX IF NOT EXISTS idx_target_companies_updated ON target_companies (updated_at);
+
+CREATE TABLE IF NOT EXISTS resume_versions (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    target_roles TEXT,
+    content TEXT,
+    file_path TEXT,
+    file_name TEXT,
+    version INTEGER NOT NULL DEFAULT 1,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_resume_versions_created ON resume_versions (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_resume_versions_updated ON resume_versions (updated_at);
+
+CREATE TABLE IF NOT EXISTS application_files (
+    id TEXT PRIMARY KEY,
+    application_id TEXT NOT NULL,
+    file_type TEXT,
+    file_name TEXT,
+    file_path TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_application_files_application ON application_files (application_id);
+CREATE INDEX IF NOT EXISTS idx_application_files_created ON application_files (created_at);
+
+CREATE TABLE IF NOT EXISTS deleted_records (
+    id TEXT PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    deleted_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deleted_records_deleted ON deleted_records (deleted_at);
+CREATE INDEX IF NOT EXISTS idx_deleted_records_record ON deleted_records (record_id);
+
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS storage_blobs (
+    bucket TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER,
+    content_type TEXT,
+    created_at TEXT NOT NULL,
+    last_used_at TEXT NOT NULL,
+    PRIMARY KEY (bucket, sha256)
+);
+CREATE INDEX IF NOT EXISTS idx_storage_blobs_last_used ON storage_blobs (last_used_at);
+CREATE INDEX IF NOT EXISTS idx_application_files_path ON application_files (file_path);
+CREATE INDEX IF NOT EXISTS idx_resume_versions_path ON resume_versions (file_path);
+
+CREATE TABLE IF NOT EXISTS parsed_documents (
+    sha256 TEXT PRIMARY KEY,
+    file_name TEXT,
+    text TEXT NOT NULL,
+    info TEXT,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS research_runs (
+    id TEXT PRIMARY KEY,
+    resume_id TEXT,
+    resume_text TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    params TEXT,
+    status TEXT NOT NULL,
+    stage TEXT,
+    checkpoints TEXT,
+    stats TEXT,
+    error TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_research_runs_created ON research_runs (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_research_runs_status ON research_runs (status);
+
+CREATE TABLE IF NOT EXISTS research_seen_jobs (
+    scope TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    posting TEXT NOT NULL,
+    analysis TEXT,
+    first_run_id TEXT,
+    first_seen_at TEXT NOT NULL,
+    last_seen_at TEXT NOT NULL,
+    analyzed_at TEXT,
+    PRIMARY KEY (scope, fingerprint)
+);
+
+CREATE TABLE IF NOT EXISTS followup_reminders (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    status TEXT,
+    reason TEXT,
+    due_at TEXT NOT NULL,
+    created_at TEXT,
+    dismissed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_followup_reminders_due ON followup_reminders (due_at, id);
+"""
+
+# Columns added after a table was first created: (table, column, definition)
+ADDED_COLUMNS = [
+    ("applications", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("target_companies", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("resume_versions", "version", "INTEGER NOT NULL DEFAULT 1"),
+    ("resume_versions", "parsed_info", "TEXT"),
+    ("resume_versions", "content_hash", "TEXT"),
+    ("application_files", "content_hash", "TEXT"),
+    ("research_runs", "heartbeat_at", "TEXT"),
+    ("target_companies", "status_changed_at", "TEXT"),
+]
+
+# Columns stored as JSON text and decoded on read
+JSON_COLUMNS = {
+    "applications": {"modality", "tags", "status_history", "ai_analysis", "interview_prep", "quality"},
+    "target_companies": {"research", "connections"},
+    "resume_versions": {"parsed_info"},
+    "parsed_documents": {"info"},
+    "research_runs": {"params", "checkpoints", "stats"},
+    "research_seen_jobs": {"posting", "analysis"},
+}
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+_OPERATORS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+def _error(message: str, code: str = "PGRST000") -> APIError:
+    return APIError({"message": message, "code": code, "hint": None, "details": None})
+
+def _identifier(name: str) -> str:
+    if not _IDENTIFIER.match(name):
+        raise _error(f"Invalid column name: {name}")
+    return f'"{name}"'
+
+def _split_top_level(text: str) -> List[str]:
+    """Split a PostgREST filter list on commas outside parentheses and quotes"""
+    parts, depth, quoted, current = [], 0, False, []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if quoted and char == "\\" and i + 1 < len(text):
+            current.append(text[i:i + 2])
+            i += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append("".join(current))
+            current = []
+            i += 1
+            continue
+        current.append(char)
+        i += 1
+    if current:
+        parts.append("".join(current))
+    return parts
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', value[1:-1])
+    return value
+
+def _comparison(column: str, op: str, value: Any) -> Tuple[str, list]:
+    col = _identifier(column)
+    if op in _OPERATORS:
+        return f"{col} {_OPERATORS[op]} ?", [value]
+    if op == "like":
+        # Postgres LIKE is case-sensitive, SQLite's is not; GLOB is
+        return f"{col} GLOB ?", [str(value).replace("%", "*").replace("_", "?")]
+    if op == "ilike":
+        return f"{col} LIKE ?", [value]
+    if op == "is":
+        keyword = {"null": "NULL", "true": "1", "false": "0"}.get(str(value).lower())
+        if keyword is None:
+            raise _error(f"Invalid is value: {value}")
+        return f"{col} IS {keyword}", []
+    if op == "in":
+        values = list(value)
+        if not values:
+            return "0", []
+        return f"{col} IN ({','.join('?' * len(values))})", values
+    raise _error(f"Unsupported operator: {op}")
+
+def _parse_condition(expr: str) -> Tuple[str, list]:
+    """Translate one PostgREST logical filter (as passed to or_) into SQL"""
+    for keyword in ("and", "or"):
+        if expr.startswith(f"{keyword}(") and expr.endswith(")"):
+            return _parse_group(expr[len(keyword) + 1:-1], keyword.upper())
+
+    try:
+        column, rest = expr.split(".", 1)
+        negate = rest.startswith("not.")
+        if negate:
+            rest = rest[4:]
+        op, raw = rest.split(".", 1)
+    except ValueError:
+        raise _error(f"Invalid filter: {expr}")
+
+    if op == "in":
+        value = [_unquote(v) for v in _split_top_level(raw.strip("()"))]
+    else:
+        value = _unquote(raw)
+    sql, params = _comparison(column, op, value)
+    return (f"NOT ({sql})" if negate else sql), params
+
+def _parse_group(filters: str, joiner: str) -> Tuple[str, list]:
+    clauses, params = [], []
+    for part in _split_top_level(filters):
+        sql, values = _parse_condition(part.strip())
+        clauses.append(f"({sql})")
+        params.extend(values)
+    return f" {joiner} ".join(clauses), params
+
+def _encode_row(table: str, row: dict, columns: List[str]) -> Tuple[List[str], list]:
+    """Column names and SQL values for a row, with JSON fields serialized"""
+    unknown = [name for name in row if name not in columns]
+    if unknown:
+        raise _error(f"Could not find the '{unknown[0]}' column of '{table}'", "PGRST204")
+    json_columns = JSON_COLUMNS.get(table, set())
+    names = list(row)
+    values = [
+        json.dumps(row[n]) if (n in json_columns or isinstance(row[n], (dict, list))) and row[n] is not None else row[n]
+        for n in names
+    ]
+    return names, values
+
+@dataclass
+class SQLiteResponse:
+    data: List[dict]
+    count: Optional[int] = None
+
+class SQLiteQuery:
+    """Query builder mirroring supabase-py's table() builder"""
+
+    def __init__(self, client: "SQLiteClient", table: str):
+        self._client = client
+        self._table = table
+        self._action = "select"
+        self._columns = "*"
+        self._count = None
+        self._head = False
+        self._payload = None
+        self._on_conflict = "id"
+        self._where: List[Tuple[str, list]] = []
+        self._order: List[str] = []
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+
+    @property
+    def table_name(self) -> str:
+        return self._table
+
+    @property
+    def operation(self) -> str:
+        return self._action
+
+    # Actions
+
+    def select(self, *columns: str, count: Optional[str] = None, head: Optional[bool] = None):
+        self._action = "select"
+        self._columns = ",".join(columns) or "*"
+        self._count = count
+        self._head = bool(head)
+        return self
+
+    def insert(self, rows):
+        self._action = "insert"
+        self._payload = rows
+        return self
+
+    def upsert(self, rows, on_conflict: str = "id"):
+        self._action = "upsert"
+        self._payload = rows
+        self._on_conflict = on_conflict
+        return self
+
+    def update(self, data: dict):
+        self._action = "update"
+        self._payload = data
+        return self
+
+    def delete(self):
+        self._action = "delete"
+        return self
+
+    # Filters and modifiers
+
+    def _filter(self, column: str, op: str, value: Any):
+        self._where.append(_comparison(column, op, value))
+        return self
+
+    def eq(self, column: str, value: Any):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any):
+        return self._filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str):
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str):
+        return self._filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any):
+        return self._filter(column, "is", "null" if value is None else value)
+
+    def in_(self, column: str, values):
+        return self._filter(column, "in", values)
+
+    def or_(self, filters: str):
+        self._where.append(_parse_group(filters, "OR"))
+        return self
+
+    def order(self, column: str, desc: bool = False):
+        # Match Postgres: NULLs sort as larger than any value
+        direction = "DESC NULLS FIRST" if desc else "ASC NULLS LAST"
+        self._order.append(f"{_identifier(column)} {direction}")
+        return self
+
+    def limit(self, size: int):
+        self._limit = size
+        return self
+
+    def range(self, start: int, end: int):
+        self._offset = start
+        self._limit = end - start + 1
+        return self
+
+    # Execution
+
+    def _where_sql(self) -> Tuple[str, list]:
+        if not self._where:
+            return "", []
+        params = [p for _, values in self._where for p in values]
+        return " WHERE " + " AND ".join(f"({sql})" for sql, _ in self._where), params
+
+    def execute(self) -> SQLiteResponse:
+        columns = self._client.columns(self._table)
+        try:
+            with self._client.connection() as conn:
+                if self._action == "select":
+                    return self._select(conn, columns)
+                return self._write(conn, columns)
+        except sqlite3.IntegrityError as e:
+            raise _error(str(e), "23505" if "UNIQUE" in str(e) else "23502")
+        except sqlite3.OperationalError as e:
+            raise _error(str(e))
+
+    def _select(self, conn: sqlite3.Connection, columns: List[str]) -> SQLiteResponse:
+        where, params = self._where_sql()
+        table = _identifier(self._table)
+
+        count = None
+        if self._count:
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}{where}", params).fetchone()[0]
+        if self._head:
+            return SQLiteResponse(data=[], count=count)
+
+        names = [c.strip() for c in self._columns.split(",") if c.strip()]
+        if names == ["*"]:
+            select = "*"
+        else:
+            unknown = [n for n in names if n not in columns]
+            if unknown:
+                raise _error(f"column {self._table}.{unknown[0]} does not exist", "42703")
+            select = ",".join(_identifier(n) for n in names)
+
+        sql = f"SELECT {select} FROM {table}{where}"
+        if self._order:
+            sql += " ORDER BY " + ", ".join(self._order)
+        if self._limit is not None or self._offset is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params = params + [self._limit if self._limit is not None else -1, self._offset or 0]
+
+        rows = conn.execute(sql, params).fetchall()
+        return SQLiteResponse(data=[self._client.decode(self._table, row) for row in rows], count=count)
+
+    def _write(self, conn: sqlite3.Connection, columns: List[str]) -> SQLiteResponse:
+        table = _identifier(self._table)
+        returned = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._action in ("insert", "upsert"):
+                rows = self._payload if isinstance(self._payload, list) else [self._payload]
+                for row in rows:
+                    names, values = _encode_row(self._table, row, columns)
+                    sql = f"INSERT INTO {table} ({','.join(_identifier(n) for n in names)}) VALUES ({','.join('?' * len(names))})"
+                    if self._action == "upsert":
+                        keys = [k.strip() for k in self._on_conflict.split(",")]
+                        updates = [f"{_identifier(n)} = excluded.{_identifier(n)}" for n in names if n not in keys]
+                        conflict = ", ".join(_identifier(k) for k in keys)
+                        sql += f" ON CONFLICT ({conflict}) DO " + (f"UPDATE SET {', '.join(updates)}" if updates else "NOTHING")
+                    returned.extend(conn.execute(sql + " RETURNING *", values).fetchall())
+            elif self._action == "update":
+                names, values = _encode_row(self._table, self._payload, columns)
+                where, params = self._where_sql()
+                assignments = ", ".join(f"{_identifier(n)} = ?" for n in names)
+                returned = conn.execute(f"UPDATE {table} SET {assignments}{where} RETURNING *", values + params).fetchall()
+            elif self._action == "delete":
+                where, params = self._where_sql()
+                returned = conn.execute(f"DELETE FROM {table}{where} RETURNING *", params).fetchall()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return SQLiteResponse(data=[self._client.decode(self._table, row) for row in returned])
+
+class SQLiteRPC:
+    def __init__(self, client: "SQLiteClient", fn, params: dict):
+        self._client = client
+        self._fn = fn
+        self._params = params
+        self.table_name = fn.__name__.lstrip("_")
+        self.operation = "rpc"
+
+    def execute(self) -> SQLiteResponse:
+        with self._client.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                data = self._fn(self._client, conn, **self._params)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return SQLiteResponse(data=data)
+
+def _apply_row_update(client: "SQLiteClient", conn: sqlite3.Connection, p_table: str, p_id: str,
+                      p_changes: dict, p_expected_version: Optional[int] = None) -> Optional[dict]:
+    """Same contract as apply_row_update in migrations/013_company_status_changes.sql"""
+    if p_table not in ("applications", "target_companies", "resume_versions"):
+        raise _error(f"apply_row_update: unsupported table {p_table}")
+    row = conn.execute(f"SELECT * FROM {_identifier(p_table)} WHERE id = ?", [p_id]).fetchone()
+    if row is None:
+        return None
+    current = client.decode(p_table, row)
+
+    if p_expected_version is not None and current["version"] != p_expected_version:
+        raise _error("Row was modified by another request", "PT409")
+
+    changes = {k: v for k, v in p_changes.items() if k != "id"}
+    if p_table == "applications" and "status" in changes and changes["status"] != current.get("status"):
+        history = list(current.get("status_history") or [])
+        history.append({"status": changes["status"], "date": changes.get("updated_at")})
+        changes["status_history"] = history
+    if p_table == "target_companies" and "status" in changes and changes["status"] != current.get("status"):
+        changes["status_changed_at"] = changes.get("updated_at") or datetime.utcnow().isoformat()
+    changes["version"] = current["version"] + 1
+
+    names, values = _encode_row(p_table, changes, client.columns(p_table))
+    assignments = ", ".join(f"{_identifier(n)} = ?" for n in names)
+    updated = conn.execute(
+        f"UPDATE {_identifier(p_table)} SET {assignments} WHERE id = ? RETURNING *", values + [p_id]
+    ).fetchone()
+    return client.decode(p_table, updated)
+
+def _apply_row_updates(client: "SQLiteClient", conn: sqlite3.Connection, p_table: str,
+                       p_updates: List[dict]) -> List[dict]:
+    """Same contract as apply_row_updates in migrations/009_bulk_row_updates.sql"""
+    results = []
+    for item in p_updates:
+        conn.execute("SAVEPOINT apply_row_updates")
+        try:
+            row = _apply_row_update(client, conn, p_table, item["id"], item.get("changes") or {},
+                                    item.get("expected_version"))
+            status = "not_found" if row is None else "updated"
+            results.append({"id": item["id"], "status": status, "row": row})
+        except (APIError, sqlite3.Error) as e:
+            conn.execute("ROLLBACK TO SAVEPOINT apply_row_updates")
+            if isinstance(e, APIError) and e.code == "PT409":
+                results.append({"id": item["id"], "status": "conflict", "error": e.message})
+            else:
+                results.append({"id": item["id"], "status": "error", "error": getattr(e, "message", None) or str(e)})
+        conn.execute("RELEASE SAVEPOINT apply_row_updates")
+    return results
+
+def _application_status_counts(client: "SQLiteClient", conn: sqlite3.Connection, p_since: Optional[str] = None,
+                               p_statuses: Optional[List[str]] = None) -> List[dict]:
+    """Same contract as application_status_counts in migrations/012_status_counts.sql"""
+    clauses, params = [], []
+    if p_since is not None:
+        clauses.append("created_at >= ?")
+        params.append(p_since)
+    if p_statuses is not None:
+        clauses.append(f"status IN ({','.join('?' * len(p_statuses))})" if p_statuses else "0")
+        params.extend(p_statuses)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = conn.execute(
+        f"SELECT COALESCE(status, 'Unknown') AS status, COUNT(*) AS count FROM applications {where} GROUP BY status",
+        params,
+    )
+    return [dict(row) for row in rows]
+
+RPC_FUNCTIONS = {
+    "apply_row_update": _apply_row_update,
+    "apply_row_updates": _apply_row_updates,
+    "application_status_counts": _application_status_counts,
+}
+
+class LocalBucket:
+    """A storage bucket kept as a directory on the local filesystem"""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path(self, path: str) -> Path:
+        target = (self.root / path).resolve()
+        if self.root.resolve() not in target.parents:
+            raise ValueError(f"Invalid storage path: {path}")
+        return target
+
+    def upload(self, path: str, file, file_options: Optional[dict] = None):
+        """Write a file, replacing any existing object at the same path"""
+        target = self.path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(file if isinstance(file, bytes) else Path(file).read_bytes())
+        return {"path": path}
+
+    def download(self, path: str) -> bytes:
+        return self.path(path).read_bytes()
+
+    def remove(self, paths: List[str]):
+        for path in paths:
+            self.path(path).unlink(missing_ok=True)
+        return [{"name": path} for path in paths]
+
+class LocalStorage:
+    def __init__(self, root: Path):
+        self.root = root
+
+    def from_(self, bucket: str) -> LocalBucket:
+        return LocalBucket(self.root / bucket)
+
+class SQLiteClient:
+    def __init__(self, path: str, storage_root: str):
+        self.path = path
+        self.storage = LocalStorage(Path(storage_root))
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._connections: List[sqlite3.Connection] = []
+        self._shared: Optional[sqlite3.Connection] = None
+        self._columns: Dict[str, List[str]] = {}
+
+        if path == ":memory:":
+            self._shared = self._open()
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+            for table, column, definition in ADDED_COLUMNS:
+                existing = [row["name"] for row in conn.execute(f"PRAGMA table_info({table})")]
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        if self._shared is not None:
+            with self._lock:
+                yield self._shared
+            return
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        yield conn
+
+    def columns(self, table: str) -> List[str]:
+        if table not in self._columns:
+            with self.connection() as conn:
+                info = conn.execute(f"PRAGMA table_info({_identifier(table)})").fetchall()
+            if not info:
+                raise _error(f"Could not find the table 'public.{table}'", "PGRST205")
+            self._columns[table] = [row["name"] for row in info]
+        return self._columns[table]
+
+    def decode(self, table: str, row: sqlite3.Row) -> dict:
+        data = dict(row)
+        for column in JSON_COLUMNS.get(table, set()) & data.keys():
+            if isinstance(data[column], str):
+                data[column] = json.loads(data[column])
+        return data
+
+    def table(self, name: str) -> SQLiteQuery:
+        return SQLiteQuery(self, name)
+
+    def rpc(self, fn: str, params: Optional[dict] = None) -> "SQLiteRPC":
+        if fn not in RPC_FUNCTIONS:
+            raise _error(f"Could not find the function public.{fn}", "PGRST202")
+        return SQLiteRPC(self, RPC_FUNCTIONS[fn], params or {})
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
@@ -0,0 +1,18 @@
+"""Aggregates computed by the database rather than over downloaded rows."""
+from typing import Dict, List, Optional, Tuple
+
+from services.supabase_client import get_supabase_client
+from services.database import execute
+
+async def status_counts(since: Optional[str] = None, statuses: Optional[List[str]] = None) -> Tuple[int, Dict[str, int]]:
+    """Count applications per status with one grouped query (the
+    application_status_counts RPC).
+
+    Returns the total and a mapping of status to count, omitting statuses
+    with no applications. Applications without a status are counted under
+    "Unknown".
+    """
+    supabase = get_supabase_client()
+    result = await execute(supabase.rpc("application_status_counts", {"p_since": since, "p_statuses": statuses}))
+    counts = {row["status"]: row["count"] for row in result.data if row["count"]}
+    return sum(counts.values()), counts
@@ -0,0 +1,181 @@
+"""Streaming transfers to and from Supabase Storage.
+
+supabase-py's storage client only uploads from bytes or a file path and
+downloads whole objects into memory, so these helpers talk to the Storage
+REST API directly through a pooled async HTTP client. Uploads are sent as
+they are read from the request, and downloads are passed through chunk by
+chunk, forwarding Range requests so clients can resume or seek.
+
+With DATA_BACKEND=sqlite the same helpers read and write the local bucket
+directories instead. Transfers to Storage are recorded in /metrics.
+"""
+import time
+from typing import AsyncIterator, Optional
+from urllib.parse import quote
+
+import anyio
+import httpx
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+from config import (
+    DATA_BACKEND,
+    SUPABASE_URL,
+    SUPABASE_KEY,
+    SUPABASE_POOL_SIZE,
+    SUPABASE_TIMEOUT,
+    SUPABASE_CONNECT_TIMEOUT,
+    STORAGE_CHUNK_SIZE,
+)
+from services.metrics import observe_storage
+from services.supabase_client import get_supabase_client
+
+_client: httpx.AsyncClient = None
+
+# Response headers passed through from Storage to the client
+PASSTHROUGH_HEADERS = ("content-length", "content-range", "etag", "last-modified")
+
+def get_storage_http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=SUPABASE_POOL_SIZE,
+                max_keepalive_connections=SUPABASE_POOL_SIZE,
+            ),
+            timeout=httpx.Timeout(SUPABASE_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT),
+        )
+    return _client
+
+async def close_storage_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+
+def _object_url(bucket: str, path: str) -> str:
+    return f"{SUPABASE_URL}/storage/v1/object/{bucket}/{quote(path)}"
+
+def _auth_headers() -> dict:
+    return {"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"}
+
+async def upload_stream(bucket: str, path: str, file: UploadFile, upsert: bool = False):
+    """Upload an UploadFile to Storage in STORAGE_CHUNK_SIZE pieces"""
+    if DATA_BACKEND == "sqlite":
+        return await _upload_local(bucket, path, file)
+
+    sent = 0
+
+    async def chunks():
+        nonlocal sent
+        while chunk := await file.read(STORAGE_CHUNK_SIZE):
+            sent += len(chunk)
+            yield chunk
+
+    headers = {
+        **_auth_headers(),
+        "content-type": file.content_type or "application/octet-stream",
+        "x-upsert": "true" if upsert else "false",
+    }
+    if file.size is not None:
+        headers["content-length"] = str(file.size)
+
+    started = time.perf_counter()
+    try:
+        response = await get_storage_http_client().post(_object_url(bucket, path), content=chunks(), headers=headers)
+    except httpx.HTTPError:
+        observe_storage(bucket, "upload", started, "error")
+        raise
+    observe_storage(bucket, "upload", started, "error" if response.is_error else "ok", sent)
+    if response.is_error:
+        raise HTTPException(status_code=502, detail=f"Storage upload failed: {response.text}")
+
+async def download_stream(bucket: str, path: str, file_name: str, range_header: Optional[str] = None) -> StreamingResponse:
+    """Stream an object from Storage, honouring an optional Range header"""
+    if DATA_BACKEND == "sqlite":
+        return _download_local(bucket, path, file_name)
+
+    client = get_storage_http_client()
+    headers = _auth_headers()
+    if range_header:
+        headers["range"] = range_header
+
+    # Timed to the response headers; the body streams after the handler returns
+    started = time.perf_counter()
+    try:
+        response = await client.send(client.build_request("GET", _object_url(bucket, path), headers=headers), stream=True)
+    except httpx.HTTPError:
+        observe_storage(bucket, "download", started, "error")
+        raise
+    size = int(response.headers.get("content-length", 0))
+    observe_storage(bucket, "download", started, "error" if response.is_error else "ok", size)
+
+    if response.is_error:
+        await response.aclose()
+        if response.status_code == 416:
+            raise HTTPException(status_code=416, detail="Requested range not satisfiable")
+        # Storage reports missing objects as 400 or 404
+        if response.status_code in (400, 404):
+            raise HTTPException(status_code=404, detail="File not found in storage")
+        raise HTTPException(status_code=502, detail="Storage download failed")
+
+    passthrough = {k: response.headers[k] for k in PASSTHROUGH_HEADERS if k in response.headers}
+    return StreamingResponse(
+        response.aiter_bytes(STORAGE_CHUNK_SIZE),
+        status_code=response.status_code,
+        media_type="application/octet-stream",
+        headers={
+            **passthrough,
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": f"attachment; filename={file_name}",
+        },
+        background=BackgroundTask(response.aclose),
+    )
+
+async def read_stream(bucket: str, path: str) -> AsyncIterator[bytes]:
+    """Yield an object's bytes in STORAGE_CHUNK_SIZE pieces, for copying it
+    elsewhere on the server; raises a 404 HTTPException if it is missing"""
+    if DATA_BACKEND == "sqlite":
+        target = get_supabase_client().storage.from_(bucket).path(path)
+        if not target.is_file():
+            raise HTTPException(status_code=404, detail="File not found in storage")
+        async with await anyio.open_file(target, "rb") as source:
+            while chunk := await source.read(STORAGE_CHUNK_SIZE):
+                yield chunk
+        return
+
+    received = 0
+    started = time.perf_counter()
+    try:
+        async with get_storage_http_client().stream("GET", _object_url(bucket, path), headers=_auth_headers()) as response:
+            if response.is_error:
+                observe_storage(bucket, "download", started, "error")
+                if response.status_code in (400, 404):
+                    raise HTTPException(status_code=404, detail="File not found in storage")
+                raise HTTPException(status_code=502, detail="Storage download failed")
+            async for chunk in response.aiter_bytes(STORAGE_CHUNK_SIZE):
+                received += len(chunk)
+                yield chunk
+    except httpx.HTTPError:
+        observe_storage(bucket, "download", started, "error", received)
+        raise
+    observe_storage(bucket, "download", started, "ok", received)
+
+async def _upload_local(bucket: str, path: str, file: UploadFile):
+    target = get_supabase_client().storage.from_(bucket).path(path)
+    await anyio.Path(target.parent).mkdir(parents=True, exist_ok=True)
+    async with await anyio.open_file(target, "wb") as out:
+        while chunk := await file.read(STORAGE_CHUNK_SIZE):
+            await out.write(chunk)
+
+def _download_local(bucket: str, path: str, file_name: str) -> FileResponse:
+    target = get_supabase_client().storage.from_(bucket).path(path)
+    if not target.is_file():
+        raise HTTPException(status_code=404, detail="File not found in storage")
+    # FileResponse answers Range requests itself
+    return FileResponse(
+        target,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f"attachment; filename={file_name}"},
+    )
@@ -1,10 +1,52 @@
-from supabase import create_client, Client
-from config import SUPABASE_URL, SUPABASE_KEY
+import httpx
+from supabase import create_client, Client, ClientOptions
+from config import (
+    DATA_BACKEND,
+    SQLITE_PATH,
+    LOCAL_STORAGE_PATH,
+    SUPABASE_URL,
+    SUPABASE_KEY,
+    SUPABASE_POOL_SIZE,
+    SUPABASE_TIMEOUT,
+    SUPABASE_CONNECT_TIMEOUT,
+)
 
 supabase: Client = None
+_http_client: httpx.Client = None
 
 def get_supabase_client() -> Client:
-    global supabase
+    """Return the data client for the configured backend.
+
+    With DATA_BACKEND=sqlite this is a SQLiteClient, which supports the same
+    table() and storage.from_() calls the routes make.
+    """
+    global supabase, _http_client
     if supabase is None:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        if DATA_BACKEND == "sqlite":
+            from services.sqlite_backend import SQLiteClient
+            supabase = SQLiteClient(SQLITE_PATH, LOCAL_STORAGE_PATH)
+            return supabase
+
+        # One pooled HTTP client shared by the database and storage APIs
+        _http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=SUPABASE_POOL_SIZE,
+                max_keepalive_connections=SUPABASE_POOL_SIZE,
+            ),
+            timeout=httpx.Timeout(SUPABASE_TIMEOUT, connect=SUPABASE_CONNECT_TIMEOUT),
+        )
+        supabase = create_client(
+            SUPABASE_URL,
+            SUPABASE_KEY,
+            options=ClientOptions(httpx_client=_http_client),
+        )
     return supabase
+
+def close_supabase_client():
+    global supabase, _http_client
+    if _http_client is not None:
+        _http_client.close()
+    if supabase is not None and hasattr(supabase, "close"):
+        supabase.close()
+    supabase = None
+    _http_client = None
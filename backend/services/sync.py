@@ -0,0 +1,46 @@
+"""Change tracking for the delta sync endpoint.
+
+Deletes are recorded as tombstones in the ``deleted_records`` table so that
+clients syncing later can drop the rows they still hold. Sync tokens are an
+opaque encoding of the server time at which a sync started.
+"""
+import base64
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+
+from services.supabase_client import get_supabase_client
+from services.database import execute
+
+TOMBSTONE_TABLE = "deleted_records"
+
+# Re-send rows written shortly before the previous token, so writes whose
+# timestamp was taken before a sync but committed after it are not missed
+SYNC_OVERLAP = timedelta(seconds=5)
+
+async def record_deletions(table: str, record_ids: Iterable[str]):
+    """Write a tombstone for each deleted row"""
+    deleted_at = datetime.utcnow().isoformat()
+    rows = [
+        {"id": str(uuid.uuid4()), "table_name": table, "record_id": record_id, "deleted_at": deleted_at}
+        for record_id in record_ids
+    ]
+    if rows:
+        supabase = get_supabase_client()
+        await execute(supabase.table(TOMBSTONE_TABLE).insert(rows))
+
+def encode_token(moment: datetime) -> str:
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode()
+
+def decode_token(token: Optional[str]) -> Optional[datetime]:
+    if not token:
+        return None
+    try:
+        return datetime.fromisoformat(base64.urlsafe_b64decode(token.encode()).decode())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+
+def changed_since(since: datetime) -> str:
+    return (since - SYNC_OVERLAP).isoformat()
@@ -0,0 +1,46 @@
+"""Row versions and single-round-trip updates.
+
+Application, company and resume rows carry a ``version`` that the
+apply_row_update RPC increments on every write (see
+migrations/002_row_versions.sql). Single-row GET and PUT responses expose it
+as the ETag. A PUT that sends it back in If-Match gets a 409 if the row has
+changed since, instead of overwriting the newer version.
+"""
+from typing import Optional
+
+from fastapi import HTTPException
+from postgrest.exceptions import APIError
+
+from services.supabase_client import get_supabase_client
+from services.database import execute
+
+def expected_version(if_match: Optional[str]) -> Optional[int]:
+    if not if_match or if_match.strip() == "*":
+        return None
+    tag = if_match.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be a row version ETag")
+
+def version_etag(row: dict) -> str:
+    return f'"{row.get("version") or 1}"'
+
+async def apply_update(table: str, row_id: str, changes: dict, if_match: Optional[str] = None) -> Optional[dict]:
+    """Apply changes to one row atomically; returns None if it doesn't exist"""
+    supabase = get_supabase_client()
+    params = {
+        "p_table": table,
+        "p_id": row_id,
+        "p_changes": changes,
+        "p_expected_version": expected_version(if_match),
+    }
+    try:
+        response = await execute(supabase.rpc("apply_row_update", params))
+    except APIError as e:
+        if e.code == "PT409":
+            raise HTTPException(status_code=409, detail="Modified by another request; reload and try again")
+        raise
+    return response.data
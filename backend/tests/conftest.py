@@ -0,0 +1,35 @@
+"""Tests run the app against the embedded SQLite backend in a temporary
+directory. Install requirements-dev.txt, then run them from backend/ with
+``python -m pytest``."""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_data_dir = tempfile.mkdtemp(prefix="job_command_center_tests_")
+os.environ["DATA_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = os.path.join(_data_dir, "test.db")
+os.environ["LOCAL_STORAGE_PATH"] = os.path.join(_data_dir, "storage")
+os.environ["FOLLOWUP_TICK_INTERVAL"] = "0"
+os.environ["BLOB_GC_INTERVAL"] = "0"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def application(client):
+    """A new application, as returned by POST /api/applications"""
+    response = client.post("/api/applications", json={"company": "Acme", "title": "Analytical Chemist"},
+                           params={"duplicates": "allow"})
+    assert response.status_code == 200
+    return response.json()
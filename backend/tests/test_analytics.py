@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+def _counts(client) -> dict:
+    response = client.get("/api/analytics")
+    assert response.status_code == 200
+    return response.json()["status_counts"]
+
+def _delta(before: dict, after: dict) -> dict:
+    return {s: after.get(s, 0) - before.get(s, 0) for s in set(before) | set(after) if after.get(s, 0) != before.get(s, 0)}
+
+def test_analytics_follow_writes(client):
+    before = _counts(client)
+    row = client.post("/api/applications", params={"duplicates": "allow"},
+                      json={"company": "Funnel Co", "title": "Chemist"}).json()
+    assert _delta(before, _counts(client)) == {"Applied": 1}
+
+    client.put(f"/api/applications/{row['id']}", json={"status": "Phone Screen"})
+    assert _delta(before, _counts(client)) == {"Phone Screen": 1}
+
+    client.delete(f"/api/applications/{row['id']}")
+    assert _delta(before, _counts(client)) == {}
+
+def test_analytics_follow_bulk_writes(client):
+    before = _counts(client)
+    created = client.post("/api/applications/bulk", json=[
+        {"company": "Funnel A", "title": "Chemist"},
+        {"company": "Funnel B", "title": "Chemist"},
+    ]).json()
+    ids = [r["id"] for r in created["results"]]
+    client.put("/api/applications/bulk", json=[{"id": ids[0], "status": "Rejected"}])
+    assert _delta(before, _counts(client)) == {"Applied": 1, "Rejected": 1}
+
+    client.post("/api/applications/bulk/delete", json={"ids": ids})
+    assert _delta(before, _counts(client)) == {}
@@ -0,0 +1,70 @@
+from services import backup as backup_service
+
+FILE_BYTES = b"\x00\x01 instrument export " * 512
+
+def _ids(changes: dict) -> list:
+    return [row["id"] for row in changes["upserted"]]
+
+def _backup(client) -> bytes:
+    response = client.get("/api/backup")
+    assert response.status_code == 200
+    return response.content
+
+def _restore(client, archive: bytes) -> dict:
+    response = client.post("/api/restore", content=archive, headers={"content-type": "application/gzip"})
+    assert response.status_code == 200
+    return response.json()
+
+def test_round_trip_restores_deleted_rows_and_files(client, application):
+    upload = client.post(f"/api/applications/{application['id']}/files", data={"file_type": "resume"},
+                         files={"file": ("spectra.bin", FILE_BYTES, "application/octet-stream")})
+    assert upload.status_code == 200
+    file_id = client.get(f"/api/applications/{application['id']}/files").json()[0]["id"]
+    archive = _backup(client)
+
+    token = client.get("/api/sync").json()["token"]
+    client.delete(f"/api/applications/{application['id']}")
+    assert client.get(f"/api/applications/{application['id']}").status_code == 404
+
+    result = _restore(client, archive)
+    assert result["errors"] == []
+    assert result["tables"]["applications"] >= 1
+    assert result["files"]
+
+    row = client.get(f"/api/applications/{application['id']}").json()
+    assert row["company"] == application["company"]
+    download = client.get(f"/api/files/{file_id}/download")
+    assert download.status_code == 200 and download.content == FILE_BYTES
+
+    # Clients syncing since before the delete see the row come back, newer
+    # than the version they last saw, and no tombstone for it
+    changes = client.get("/api/sync", params={"since": token}).json()["applications"]
+    assert application["id"] in _ids(changes)
+    assert application["id"] not in changes["deleted"]
+    assert row["version"] > application["version"]
+    assert row["updated_at"] > application["updated_at"]
+
+def test_restore_is_repeatable(client, application):
+    archive = _backup(client)
+    first = _restore(client, archive)
+    second = _restore(client, archive)
+    assert second["tables"]["applications"] == first["tables"]["applications"]
+    assert second["errors"] == []
+
+def test_failed_upload_writes_no_blob_row(client, application, monkeypatch):
+    client.post(f"/api/applications/{application['id']}/files", data={"file_type": "resume"},
+                files={"file": ("unstored.bin", b"never uploaded", "application/octet-stream")})
+    archive = _backup(client)
+
+    async def failing_upload(*args, **kwargs):
+        raise OSError("storage is down")
+
+    monkeypatch.setattr(backup_service, "upload_stream", failing_upload)
+    result = _restore(client, archive)
+    assert result["files"] == {}
+    assert "storage_blobs" not in result["tables"]
+    assert result["errors"] and all("storage is down" in e for e in result["errors"])
+
+def test_restore_rejects_invalid_archives(client):
+    response = client.post("/api/restore", content=b"not a backup")
+    assert response.status_code == 400
@@ -0,0 +1,123 @@
+import hashlib
+import os
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from services import blobs
+from services.blobs import blob_store, blob_path, BLOB_TABLE
+from services.database import execute
+from services.supabase_client import get_supabase_client
+
+BUCKET = "application-files"
+
+def _content() -> bytes:
+    return f"Tailored resume {uuid.uuid4()}\n".encode()
+
+def _upload(client, application_id: str, content: bytes):
+    return client.post(f"/api/applications/{application_id}/files", data={"file_type": "resume"},
+                       files={"file": ("resume.txt", content, "text/plain")})
+
+def _stored(sha256: str) -> Path:
+    return Path(os.environ["LOCAL_STORAGE_PATH"]) / BUCKET / blob_path(sha256)
+
+def _blob_row(client, sha256: str):
+    async def select():
+        result = await execute(get_supabase_client().table(BLOB_TABLE).select("*").eq("sha256", sha256))
+        return result.data
+    rows = client.portal.call(select)
+    return rows[0] if rows else None
+
+def _age(client, sha256: str, seconds: float):
+    async def update():
+        last_used = (datetime.utcnow() - timedelta(seconds=seconds)).isoformat()
+        await execute(get_supabase_client().table(BLOB_TABLE).update({"last_used_at": last_used}).eq("sha256", sha256))
+    client.portal.call(update)
+
+def _unreferenced_blob(client, application) -> str:
+    """A stored blob whose only file row has been deleted"""
+    content = _content()
+    _upload(client, application["id"], content)
+    file_id = client.get(f"/api/applications/{application['id']}/files").json()[-1]["id"]
+    client.delete(f"/api/files/{file_id}")
+    return hashlib.sha256(content).hexdigest()
+
+@pytest.fixture
+def uploads(monkeypatch):
+    """Paths sent to storage"""
+    sent = []
+    upload_stream = blobs.upload_stream
+
+    async def counting_upload(bucket, path, file, upsert=False):
+        sent.append(path)
+        await upload_stream(bucket, path, file, upsert=upsert)
+
+    monkeypatch.setattr(blobs, "upload_stream", counting_upload)
+    return sent
+
+def test_same_content_is_stored_once(client, application, uploads):
+    other = client.post("/api/applications", json={"company": "Other Co", "title": "Chemist"},
+                        params={"duplicates": "allow"}).json()
+    content = _content()
+    first = _upload(client, application["id"], content).json()
+    second = _upload(client, other["id"], content).json()
+
+    assert first["file_path"] == second["file_path"] == blob_path(hashlib.sha256(content).hexdigest())
+    assert uploads == [first["file_path"]]
+
+def test_stored_content_is_attached_by_hash(client, application, uploads):
+    content = _content()
+    sha256 = hashlib.sha256(content).hexdigest()
+    link = {"sha256": sha256, "file_type": "resume", "file_name": "resume.txt"}
+    url = f"/api/applications/{application['id']}/files/by-hash"
+    assert client.post(url, json=link).status_code == 404
+
+    _upload(client, application["id"], content)
+    response = client.post(url, json=link)
+    assert response.status_code == 200
+    assert response.json()["file_path"] == blob_path(sha256)
+    assert len(uploads) == 1
+
+    files = client.get(f"/api/applications/{application['id']}/files").json()
+    assert [f["content_hash"] for f in files] == [sha256, sha256]
+
+def test_collect_keeps_blobs_within_the_grace_period(client, application, monkeypatch):
+    monkeypatch.setattr(blobs, "BLOB_GC_GRACE", 3600)
+    sha256 = _unreferenced_blob(client, application)
+
+    client.portal.call(blob_store.collect)
+    assert _blob_row(client, sha256) is not None
+    assert _stored(sha256).exists()
+
+    _age(client, sha256, 7200)
+    client.portal.call(blob_store.collect)
+    assert _blob_row(client, sha256) is None
+    assert not _stored(sha256).exists()
+
+def test_collect_keeps_referenced_blobs(client, application, monkeypatch):
+    monkeypatch.setattr(blobs, "BLOB_GC_GRACE", 0)
+    content = _content()
+    _upload(client, application["id"], content)
+    sha256 = hashlib.sha256(content).hexdigest()
+
+    client.portal.call(blob_store.collect)
+    assert _blob_row(client, sha256) is not None
+    assert _stored(sha256).exists()
+
+def test_blob_reused_during_collection_survives(client, application, monkeypatch):
+    monkeypatch.setattr(blobs, "BLOB_GC_GRACE", 3600)
+    sha256 = _unreferenced_blob(client, application)
+    _age(client, sha256, 7200)
+    referenced = blob_store._referenced
+
+    async def reused_while_checking(bucket, paths):
+        # An upload of the same content arrives after the blob was listed
+        assert await blob_store.reuse(bucket, sha256) == blob_path(sha256)
+        return await referenced(bucket, paths)
+
+    monkeypatch.setattr(blob_store, "_referenced", reused_while_checking)
+    client.portal.call(blob_store.collect)
+    assert _blob_row(client, sha256) is not None
+    assert _stored(sha256).exists()
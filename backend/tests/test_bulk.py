@@ -0,0 +1,66 @@
+import uuid
+
+def _statuses(result: dict) -> list:
+    return [(r["index"], r["status"]) for r in result["results"]]
+
+def test_bulk_create_reports_each_item(client):
+    response = client.post("/api/applications/bulk", json=[
+        {"company": "Bulk A", "title": "Chemist"},
+        {"company": "Bulk B", "title": "Scientist"},
+    ])
+    assert response.status_code == 200
+    result = response.json()
+    assert _statuses(result) == [(0, "created"), (1, "created")]
+    assert result["succeeded"] == 2 and result["failed"] == 0
+
+def test_bulk_update_statuses(client, application):
+    missing = str(uuid.uuid4())
+    response = client.put("/api/applications/bulk", json=[
+        {"id": application["id"], "status": "Reviewed", "version": application["version"]},
+        {"id": missing, "notes": "nobody"},
+    ])
+    result = response.json()
+    assert _statuses(result) == [(0, "updated"), (1, "not_found")]
+    assert result["succeeded"] == 1 and result["failed"] == 1
+
+    row = client.get(f"/api/applications/{application['id']}").json()
+    assert row["status"] == "Reviewed"
+    assert row["version"] == application["version"] + 1
+    assert [h["status"] for h in row["status_history"]] == ["Applied", "Reviewed"]
+
+def test_bulk_update_with_stale_version_is_a_conflict(client, application):
+    client.put(f"/api/applications/{application['id']}", json={"notes": "changed elsewhere"})
+
+    response = client.put("/api/applications/bulk", json=[
+        {"id": application["id"], "notes": "stale", "version": application["version"]},
+    ])
+    result = response.json()
+    assert _statuses(result) == [(0, "conflict")]
+    assert result["failed"] == 1
+    assert client.get(f"/api/applications/{application['id']}").json()["notes"] == "changed elsewhere"
+
+def test_bulk_update_only_changes_sent_columns(client, application):
+    # A concurrent write to another column must survive the bulk update
+    client.put(f"/api/applications/{application['id']}", json={"notes": "keep me"})
+    client.put("/api/applications/bulk", json=[{"id": application["id"], "salary": "100k"}])
+
+    row = client.get(f"/api/applications/{application['id']}").json()
+    assert row["notes"] == "keep me"
+    assert row["salary"] == "100k"
+
+def test_later_items_build_on_earlier_ones(client):
+    company = client.post("/api/companies", json={"name": "Bulk Co"}).json()
+    response = client.put("/api/companies/bulk", json=[
+        {"id": company["id"], "priority": 1, "version": company["version"]},
+        {"id": company["id"], "priority": 2, "version": company["version"]},
+        {"id": company["id"], "notes": "after", "version": company["version"] + 1},
+    ])
+    assert _statuses(response.json()) == [(0, "updated"), (1, "conflict"), (2, "updated")]
+    row = client.get(f"/api/companies/{company['id']}").json()
+    assert (row["priority"], row["notes"], row["version"]) == (1, "after", company["version"] + 2)
+
+def test_bulk_delete_statuses(client, application):
+    missing = str(uuid.uuid4())
+    response = client.post("/api/applications/bulk/delete", json={"ids": [application["id"], missing]})
+    assert _statuses(response.json()) == [(0, "deleted"), (1, "not_found")]
+    assert client.get(f"/api/applications/{application['id']}").status_code == 404
@@ -0,0 +1,60 @@
+from routes import applications as applications_routes
+from services.cache import response_cache
+
+def _vary(response) -> list:
+    return [v.strip() for v in response.headers["Vary"].split(",")]
+
+def test_matching_etag_gets_304(client, application):
+    first = client.get("/api/applications", params={"limit": 5})
+    assert first.status_code == 200
+    assert "Accept" in _vary(first)
+
+    again = client.get("/api/applications", params={"limit": 5}, headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert again.content == b""
+
+def test_write_gives_a_fresh_etag(client, application):
+    etag = client.get("/api/applications", params={"limit": 5}).headers["ETag"]
+    client.put(f"/api/applications/{application['id']}", json={"notes": "changed"})
+
+    response = client.get("/api/applications", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert any(row.get("notes") == "changed" for row in response.json())
+
+def test_json_and_ndjson_are_cached_separately(client, application):
+    json_page = client.get("/api/applications", params={"limit": 5})
+    ndjson_page = client.get("/api/applications", params={"limit": 5}, headers={"Accept": "application/x-ndjson"})
+    assert ndjson_page.headers["content-type"].startswith("application/x-ndjson")
+    assert "Accept" in _vary(ndjson_page)
+    assert ndjson_page.headers["ETag"] != json_page.headers["ETag"]
+    assert len(ndjson_page.text.splitlines()) == len(json_page.json())
+
+def _count_queries(monkeypatch, write_during_query: bool) -> list:
+    execute = applications_routes.execute
+    queries = []
+
+    async def counting_execute(query):
+        result = await execute(query)
+        queries.append(query)
+        if write_during_query:
+            # A write handled while this query was in flight
+            response_cache.invalidate("applications")
+        return result
+
+    monkeypatch.setattr(applications_routes, "execute", counting_execute)
+    return queries
+
+def test_page_is_served_from_cache(client, application, monkeypatch):
+    queries = _count_queries(monkeypatch, write_during_query=False)
+    client.get("/api/applications", params={"limit": 6})
+    client.get("/api/applications", params={"limit": 6})
+    assert len(queries) == 1
+
+def test_page_read_before_an_invalidation_is_not_stored(client, application, monkeypatch):
+    queries = _count_queries(monkeypatch, write_during_query=True)
+    client.get("/api/applications", params={"limit": 7})
+    assert response_cache.get("applications", "application/json?limit=7") is None
+    client.get("/api/applications", params={"limit": 7})
+    assert len(queries) == 2
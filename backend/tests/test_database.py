@@ -0,0 +1,66 @@
+import asyncio
+import threading
+import time
+
+import anyio
+
+from services import database
+
+def test_blocking_call_leaves_the_event_loop_free(client):
+    async def measure():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        await database.run(time.sleep, 0.2)
+        ticker.cancel()
+        return ticks
+
+    assert client.portal.call(measure) >= 5
+
+def test_pool_bounds_concurrent_calls(client, monkeypatch):
+    monkeypatch.setattr(database, "_limiter", anyio.CapacityLimiter(2))
+    lock = threading.Lock()
+    running, peak = 0, 0
+
+    def blocking_call():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    async def call_six():
+        await asyncio.gather(*(database.run(blocking_call) for _ in range(6)))
+
+    started = time.perf_counter()
+    client.portal.call(call_six)
+    assert peak == 2
+    assert time.perf_counter() - started >= 0.15
+
+def test_slow_query_does_not_hold_up_other_requests(client, application):
+    execute = database.execute
+    release = threading.Event()
+
+    class SlowQuery:
+        def execute(self):
+            release.wait(5)
+
+    async def slow_then_fast():
+        slow = asyncio.ensure_future(execute(SlowQuery()))
+        await asyncio.sleep(0.01)
+        # Another request is served while the slow call is still blocked
+        response = await anyio.to_thread.run_sync(client.get, f"/api/applications/{application['id']}")
+        blocked = not slow.done()
+        release.set()
+        await slow
+        return response.status_code, blocked
+
+    assert client.portal.call(slow_then_fast) == (200, True)
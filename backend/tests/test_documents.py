@@ -0,0 +1,57 @@
+import asyncio
+import uuid
+
+import pytest
+
+from services import documents
+
+@pytest.fixture
+def parses(monkeypatch):
+    """File names parsed, with parsing run inline instead of in the pool"""
+    parsed = []
+
+    async def inline(func, data, file_name):
+        parsed.append(file_name)
+        return func(data, file_name)
+
+    monkeypatch.setattr(documents, "run_in_pool", inline)
+    return parsed
+
+def _resume(client, file_name: str, content: bytes):
+    return client.post("/api/resumes", data={"name": file_name},
+                       files={"file": (file_name, content, "application/octet-stream")})
+
+async def _background_parses():
+    await asyncio.gather(*documents._background)
+
+def test_same_bytes_are_parsed_once(client, parses):
+    content = f"Jane Doe\njane@example.com\nAnalytical chemist {uuid.uuid4()}\n".encode()
+    first = _resume(client, "first.txt", content).json()
+    second = _resume(client, "second.txt", content).json()
+
+    assert parses == ["first.txt"]
+    assert first["content"] == second["content"] and "Analytical chemist" in first["content"]
+    assert first["content_hash"] == second["content_hash"]
+    assert second["parsed_info"] == first["parsed_info"]
+
+def test_parse_failure_keeps_the_resume_upload(client, parses):
+    content = b"not a zip archive " + uuid.uuid4().bytes
+    response = _resume(client, "broken.docx", content)
+
+    assert response.status_code == 200
+    resume = response.json()
+    assert parses == ["broken.docx"]
+    assert resume["content"] is None and resume["parsed_info"] is None
+    assert client.get(f"/api/resumes/{resume['id']}/download").content == content
+
+def test_parse_failure_keeps_the_application_file(client, application, parses):
+    content = b"not a zip archive " + uuid.uuid4().bytes
+    response = client.post(f"/api/applications/{application['id']}/files", data={"file_type": "resume"},
+                           files={"file": ("broken.docx", content, "application/octet-stream")})
+    assert response.status_code == 200
+
+    file = client.get(f"/api/applications/{application['id']}/files").json()[-1]
+    client.portal.call(_background_parses)
+    assert parses == ["broken.docx"]
+    assert client.get(f"/api/files/{file['id']}/parsed").status_code == 404
+    assert client.get(f"/api/files/{file['id']}/download").content == content
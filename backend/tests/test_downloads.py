@@ -0,0 +1,51 @@
+import re
+
+import httpx
+import pytest
+
+from services import storage
+
+CONTENT = bytes(range(256)) * 40
+
+@pytest.fixture
+def file_id(client, application):
+    client.post(f"/api/applications/{application['id']}/files", data={"file_type": "resume"},
+                files={"file": ("resume.bin", CONTENT, "application/octet-stream")})
+    return client.get(f"/api/applications/{application['id']}/files").json()[-1]["id"]
+
+def _storage_api(request: httpx.Request) -> httpx.Response:
+    """Supabase Storage answering Range requests for CONTENT"""
+    match = re.fullmatch(r"bytes=(\d+)-(\d*)", request.headers.get("range", ""))
+    if match is None:
+        return httpx.Response(200, content=CONTENT)
+    start = int(match[1])
+    end = min(int(match[2] or len(CONTENT) - 1), len(CONTENT) - 1)
+    if start >= len(CONTENT):
+        return httpx.Response(416, headers={"content-range": f"bytes */{len(CONTENT)}"})
+    return httpx.Response(206, content=CONTENT[start:end + 1],
+                          headers={"content-range": f"bytes {start}-{end}/{len(CONTENT)}"})
+
+@pytest.fixture(params=["local", "storage"])
+def backend(request, monkeypatch):
+    """Serve downloads from the local bucket or through the Storage proxy"""
+    if request.param == "storage":
+        monkeypatch.setattr(storage, "DATA_BACKEND", "supabase")
+        monkeypatch.setattr(storage, "_client", httpx.AsyncClient(transport=httpx.MockTransport(_storage_api)))
+    return request.param
+
+def test_full_download(client, file_id, backend):
+    response = client.get(f"/api/files/{file_id}/download")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["accept-ranges"] == "bytes"
+
+def test_range_download_returns_the_slice(client, file_id, backend):
+    response = client.get(f"/api/files/{file_id}/download", headers={"Range": "bytes=100-1123"})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 100-1123/{len(CONTENT)}"
+    assert response.headers["content-length"] == "1024"
+    assert response.content == CONTENT[100:1124]
+
+def test_unsatisfiable_range_gets_416(client, file_id, backend):
+    response = client.get(f"/api/files/{file_id}/download", headers={"Range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
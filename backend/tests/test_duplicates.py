@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+POSTING = {
+    "company": "Halcyon Instruments",
+    "title": "Senior Mass Spectrometry Scientist",
+    "job_description": (
+        "Lead method development for LC-MS/MS assays supporting small molecule programs. "
+        "Own instrument maintenance, validation and troubleshooting across three Orbitrap systems, "
+        "and mentor two associate scientists in quantitative bioanalysis."
+    ),
+}
+
+def _create(client, posting: dict, duplicates: str = "flag"):
+    return client.post("/api/applications", params={"duplicates": duplicates}, json=posting)
+
+def test_near_duplicate_is_flagged(client):
+    first = _create(client, POSTING).json()
+    response = _create(client, {**POSTING, "title": "Senior Mass Spectrometry Scientist II"})
+    assert response.status_code == 200
+    assert first["id"] in response.headers["X-Duplicate-Of"].split(",")
+
+    report = client.get("/api/applications/duplicates").json()
+    assert any({first["id"], response.json()["id"]} <= {a["id"] for a in group["applications"]}
+               for group in report["groups"])
+
+def test_near_duplicate_is_rejected(client):
+    first = _create(client, {**POSTING, "company": "Meridian Analytical"}).json()
+    response = _create(client, {**POSTING, "company": "Meridian Analytical"}, duplicates="reject")
+    assert response.status_code == 409
+    assert [d["id"] for d in response.json()["duplicates"]] == [first["id"]]
+
+def test_unrelated_and_deleted_postings_are_not_flagged(client):
+    posting = {"company": "Tessellate Bio", "title": "Cell Culture Technician",
+               "job_description": "Maintain mammalian cell lines and run plate-based viability assays."}
+    first = _create(client, posting).json()
+    assert "X-Duplicate-Of" not in _create(client, {"company": "Ardent Foods", "title": "QA Lead"}).headers
+
+    client.delete(f"/api/applications/{first['id']}")
+    assert _create(client, posting, duplicates="reject").status_code == 200
@@ -0,0 +1,35 @@
+import json
+
+from models.application import Application
+from models.resume import ResumeVersion
+from services.pagination import encode_page, NDJSON_MEDIA_TYPE
+
+NDJSON = {"Accept": NDJSON_MEDIA_TYPE}
+
+def test_ndjson_has_the_json_rows_one_per_line(client, application):
+    params = {"limit": 10}
+    rows = client.get("/api/applications", params=params).json()
+    response = client.get("/api/applications", params=params, headers=NDJSON)
+
+    assert response.headers["content-type"].startswith(NDJSON_MEDIA_TYPE)
+    assert response.text.endswith("\n")
+    assert [json.loads(line) for line in response.text.splitlines()] == rows
+
+def test_ndjson_with_fields(client, application):
+    response = client.get("/api/applications", params={"fields": "title", "limit": 3}, headers=NDJSON)
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines and all(row.keys() == {"title", "id", "created_at"} for row in lines)
+
+def test_rows_are_encoded_in_the_response_model_shape(client, application):
+    rows = client.get("/api/applications").json()
+    row = next(r for r in rows if r["id"] == application["id"])
+    assert row.keys() == Application.model_fields.keys()
+    assert Application.model_validate(row).model_dump(mode="json") == row
+
+def test_columns_the_model_does_not_expose_are_dropped():
+    # e.g. a column added to the table before the model knows about it
+    row = {"id": "r1", "name": "Resume", "created_at": "2024-01-01T00:00:00", "search_vector": "'resum':1"}
+
+    encoded = json.loads(encode_page([row], ResumeVersion, "*"))
+    assert encoded == [{k: v for k, v in row.items() if k != "search_vector"}]
+    assert json.loads(encode_page([row], ResumeVersion, "id,name,search_vector")) == [row]
@@ -0,0 +1,75 @@
+import uuid
+
+import pytest
+
+from services.database import execute
+from services.followups import followups, REMINDER_TABLE
+from services.supabase_client import get_supabase_client
+
+@pytest.fixture
+def overdue(client):
+    """An application applied to long ago, so its follow-up is overdue"""
+    response = client.post("/api/applications", params={"duplicates": "allow"},
+                           json={"company": "Overdue Ltd", "title": "Chemist", "date_applied": "2001-01-01"})
+    yield response.json()
+    client.delete(f"/api/applications/{response.json()['id']}")
+
+def _tick(client, monkeypatch) -> int:
+    monkeypatch.setattr(followups, "_ticked_until", None)
+    return client.portal.call(followups.tick)
+
+def test_due_lists_overdue_application(client, overdue):
+    result = client.get("/api/followups/due", params={"kind": "application"}).json()
+    item = next(f for f in result["followups"] if f["id"] == overdue["id"])
+    assert item["due_at"] == "2001-01-08T00:00:00"
+    assert item["overdue"] and item["reason"] == "No response since applying"
+
+    client.put(f"/api/applications/{overdue['id']}", json={"status": "Rejected"})
+    result = client.get("/api/followups/due", params={"kind": "application"}).json()
+    assert overdue["id"] not in [f["id"] for f in result["followups"]]
+
+def test_reminders_skip_stale_pages(client, monkeypatch, overdue):
+    # Reminders for records that moved on, all due before the current one
+    stale = [
+        {"id": str(uuid.uuid4()), "kind": "application", "record_id": str(uuid.uuid4()),
+         "status": "Applied", "due_at": f"2000-01-{day:02d}T00:00:00"}
+        for day in range(1, 8)
+    ]
+
+    async def insert():
+        await execute(get_supabase_client().table(REMINDER_TABLE).insert(stale))
+
+    client.portal.call(insert)
+    assert _tick(client, monkeypatch) >= 1
+
+    reminders = client.get("/api/followups/reminders", params={"limit": 2}).json()
+    assert reminders[0]["record_id"] == overdue["id"]
+    assert not {r["id"] for r in stale} & {r["id"] for r in reminders}
+
+def test_tick_is_idempotent_and_dismiss_hides_reminder(client, monkeypatch, overdue):
+    _tick(client, monkeypatch)
+    assert _tick(client, monkeypatch) == 0
+
+    reminders = client.get("/api/followups/reminders").json()
+    reminder = next(r for r in reminders if r["record_id"] == overdue["id"])
+    assert client.post(f"/api/followups/reminders/{reminder['id']}/dismiss").status_code == 200
+    reminders = client.get("/api/followups/reminders").json()
+    assert reminder["id"] not in [r["id"] for r in reminders]
+
+def _company_due(client, company_id: str):
+    result = client.get("/api/followups/due", params={"kind": "company", "before": "2100-01-01T00:00:00"}).json()
+    return next(f["due_at"] for f in result["followups"] if f["id"] == company_id)
+
+def test_company_followup_moves_only_on_status_change(client):
+    company = client.post("/api/companies", json={"name": f"Followed {uuid.uuid4()}"}).json()
+    due = _company_due(client, company["id"])
+
+    edited = client.put(f"/api/companies/{company['id']}", json={"notes": "Met a recruiter"}).json()
+    client.put(f"/api/companies/{company['id']}", json={"status": "Researching"})
+    assert edited["status_changed_at"] == company["status_changed_at"]
+    assert _company_due(client, company["id"]) == due
+
+    changed = client.put(f"/api/companies/{company['id']}", json={"status": "Interviewing"}).json()
+    assert changed["status_changed_at"] > company["status_changed_at"]
+    assert _company_due(client, company["id"]) < due
+    client.delete(f"/api/companies/{company['id']}")
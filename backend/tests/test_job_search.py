@@ -0,0 +1,102 @@
+import asyncio
+import functools
+
+import httpx
+import pytest
+
+from services.job_search import JobSearch, JobProvider, RateLimiter
+
+class StubProvider(JobProvider):
+    """Serves ``postings`` for every query from a stubbed HTTP API"""
+    requests_per_second = 1000.0
+    burst = 1000
+
+    def __init__(self, name: str, postings: list):
+        super().__init__(f"http://{name}.invalid")
+        self.name = self.label = name
+        self.postings = postings
+
+    def request(self, query, location, page):
+        return f"{self.base_url}/search", {"q": query, "page": str(page)}, {}
+
+    def normalize(self, data):
+        return [{"id": job["id"], "title": job["title"], "company": job["company"], "location": job["location"]}
+                for job in data["jobs"]]
+
+@pytest.fixture
+def upstream():
+    """Stub providers sharing one transport, and the requests it received"""
+    providers = {}
+    received = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        received.append((request.url.host, request.url.params["q"]))
+        return httpx.Response(200, json={"jobs": providers[request.url.host.split(".")[0]].postings})
+
+    def make(*stubs: StubProvider) -> JobSearch:
+        providers.update((stub.name, stub) for stub in stubs)
+        search = JobSearch(list(stubs), ttl=60)
+        search._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return search
+
+    return make, received
+
+def _search(client, search: JobSearch, keywords, **kwargs):
+    return client.portal.call(functools.partial(search.search, keywords, **kwargs))
+
+def test_same_posting_from_two_providers_is_kept_once(client, upstream):
+    make, _ = upstream
+    search = make(
+        StubProvider("alpha", [{"id": "a1", "title": "Analytical Chemist", "company": "Acme, Inc.", "location": "Boston, MA"},
+                               {"id": "a2", "title": "QC Analyst", "company": "Acme, Inc.", "location": "Boston, MA"}]),
+        StubProvider("beta", [{"id": "b1", "title": "analytical chemist", "company": "ACME Inc", "location": "Boston MA"}]),
+    )
+    postings, errors = _search(client, search, ["chemist"])
+    assert errors == []
+    assert [(p["id"], p["sources"]) for p in postings] == [("a1", ["alpha", "beta"]), ("a2", ["alpha"])]
+
+def test_searches_are_cached_and_coalesced(client, upstream):
+    make, received = upstream
+    search = make(StubProvider("alpha", [{"id": "a1", "title": "Chemist", "company": "Acme", "location": ""}]))
+
+    async def concurrently():
+        return await asyncio.gather(search.search(["chemist"]), search.search(["Chemist "]))
+
+    first, second = client.portal.call(concurrently)
+    assert first == second
+    _search(client, search, ["chemist"])
+    assert received == [("alpha.invalid", "chemist")]
+
+    search.clear_cache()
+    _search(client, search, ["chemist"])
+    assert len(received) == 2
+
+def test_unexpected_response_fails_only_that_provider(client, upstream):
+    make, _ = upstream
+    search = make(StubProvider("alpha", [{"id": "a1", "title": "Chemist", "company": "Acme", "location": ""}]),
+                  StubProvider("broken", [{"id": "x1"}]))
+    postings, errors = _search(client, search, ["chemist"])
+    assert [p["id"] for p in postings] == ["a1"]
+    assert [(e["provider"], e["query"]) for e in errors] == [("broken", "chemist")]
+    assert "unexpected response" in errors[0]["detail"]
+
+def test_rate_limiter_does_not_hold_its_lock_while_waiting(client):
+    limiter = RateLimiter(rate=20, burst=1)
+
+    async def acquire_three():
+        await limiter.acquire()
+        waiting = [asyncio.ensure_future(limiter.acquire()) for _ in range(2)]
+        await asyncio.sleep(0)
+        locked = limiter._lock.locked()
+        await asyncio.gather(*waiting)
+        return locked
+
+    assert client.portal.call(acquire_three) is False
+
+def test_provider_must_implement_request_and_normalize():
+    class Incomplete(JobProvider):
+        def request(self, query, location, page):
+            return "", {}, {}
+
+    with pytest.raises(TypeError):
+        Incomplete("http://incomplete.invalid")
@@ -0,0 +1,109 @@
+import asyncio
+import functools
+import json
+import uuid
+
+import httpx
+import pytest
+
+from routes import llm as llm_routes
+from services.llm import llm_gateway, LLMProvider
+from services.versioning import apply_update
+
+class StubProvider(LLMProvider):
+    """Answers every prompt with a numbered reply from a stubbed HTTP API"""
+    name = "stubchat"
+    label = "StubChat"
+    default_model = "stub-model"
+
+    def request(self, model, messages, temperature, max_tokens, stream, api_key):
+        return f"{self.base_url}/chat", {}, {"messages": messages, "stream": stream}
+
+    def parse(self, data):
+        return data["reply"]
+
+    async def chunks(self, response):
+        async for line in response.aiter_lines():
+            if line:
+                yield line
+
+@pytest.fixture
+def stub(monkeypatch):
+    """The stub provider and the prompts its API received"""
+    received = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        received.append(body["messages"][-1]["content"])
+        await asyncio.sleep(0.05)
+        reply = f"reply {len(received)}"
+        if body["stream"]:
+            return httpx.Response(200, content=f"{reply}\n".encode())
+        return httpx.Response(200, json={"reply": reply})
+
+    provider = StubProvider("http://llm.invalid", "key")
+    monkeypatch.setitem(llm_gateway.providers, provider.name, provider)
+    monkeypatch.setattr(llm_gateway, "_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return received
+
+def _prompt(text: str) -> dict:
+    return {"provider": "stubchat", "messages": [{"role": "user", "content": text}]}
+
+def test_repeated_prompt_is_served_from_cache(client, stub):
+    prompt = f"Summarize {uuid.uuid4()}"
+    first = client.post("/api/llm", json=_prompt(prompt)).json()
+    # Trailing whitespace and line endings don't change the prompt hash
+    second = client.post("/api/llm", json=_prompt(f"{prompt}  \r\n")).json()
+
+    assert first["cached"] is False and second["cached"] is True
+    assert second["content"] == first["content"] and second["prompt_hash"] == first["prompt_hash"]
+    assert stub == [prompt]
+
+    streamed = client.post("/api/llm", json={**_prompt(prompt), "stream": True})
+    assert streamed.headers["X-LLM-Cache"] == "hit"
+    assert streamed.text == first["content"]
+    assert len(stub) == 1
+
+def test_identical_requests_in_flight_share_one_call(client, stub):
+    provider = llm_gateway.providers["stubchat"]
+    messages = [{"role": "user", "content": f"Coalesce {uuid.uuid4()}"}]
+    complete = functools.partial(llm_gateway.complete, provider, "stub-model", messages, 0.7, 100)
+
+    async def together():
+        return await asyncio.gather(complete(), complete())
+
+    (first, key, first_cached), (second, second_key, second_cached) = client.portal.call(together)
+    assert first == second and key == second_key
+    assert sorted([first_cached, second_cached]) == [False, True]
+    assert len(stub) == 1
+
+def test_analysis_is_saved_after_a_concurrent_write(client, application, stub, monkeypatch):
+    attempts = []
+
+    async def racing_apply_update(table, row_id, changes, if_match=None):
+        attempts.append(if_match)
+        if len(attempts) == 1:
+            # Another client edits the application between the read and the write
+            await apply_update("applications", row_id, {"notes": "edited meanwhile"})
+        return await apply_update(table, row_id, changes, if_match=if_match)
+
+    monkeypatch.setattr(llm_routes, "apply_update", racing_apply_update)
+    response = client.post("/api/llm", json={**_prompt(f"Analyze {uuid.uuid4()}"),
+                                             "application_id": application["id"], "analysis_key": "fit"})
+    assert response.status_code == 200
+
+    saved = client.get(f"/api/applications/{application['id']}").json()
+    assert len(attempts) == 2 and attempts[0] != attempts[1]
+    assert saved["notes"] == "edited meanwhile"
+    assert saved["ai_analysis"]["fit"]["prompt_hash"] == response.json()["prompt_hash"]
+
+def test_provider_must_implement_request_parse_and_chunks():
+    class Incomplete(LLMProvider):
+        def request(self, model, messages, temperature, max_tokens, stream, api_key):
+            return "", {}, {}
+
+        def parse(self, data):
+            return ""
+
+    with pytest.raises(TypeError):
+        Incomplete("http://incomplete.invalid")
@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from services import matching
+
+RESUME = (
+    "Analytical chemist with eight years of HPLC method development and validation, "
+    "LC-MS quantitation of impurities, GMP documentation and stability testing."
+)
+
+def test_good_match_ranks_above_poor_one(client):
+    resume = client.post("/api/resumes", data={"name": "Chemist resume", "content": RESUME}).json()
+    response = client.post("/api/match", json={
+        "resume_ids": [resume["id"]],
+        "jobs": [
+            {"id": "poor", "title": "Retail Store Manager",
+             "description": "Manage store staff schedules, merchandising and customer service."},
+            {"id": "good", "title": "Analytical Chemist",
+             "description": "HPLC method development and validation, LC-MS impurity quantitation, GMP stability testing."},
+        ],
+    })
+    assert response.status_code == 200
+    results = response.json()["resumes"][0]["results"]
+    assert [r["id"] for r in results] == ["good", "poor"]
+    assert results[0]["score"] > 0.2 and results[1]["score"] == 0
+    assert "hplc" in results[0]["matched_terms"]
+    assert results[1]["matched_terms"] == []
+
+def test_vector_cache_is_bounded(monkeypatch):
+    cache = matching.VectorCache(max_entries=2)
+    for text in ("alpha beta", "gamma delta", "epsilon zeta"):
+        cache.vector(text)
+    assert len(cache._vectors) == 2
+
+    monkeypatch.setattr(matching, "vector_cache", cache)
+    scores = matching.score(["alpha gamma"], ["alpha beta", "gamma delta gamma", "omega"])
+    assert scores.matrix.shape == (3, 1)
+    assert scores.matrix[2, 0] == 0
+    assert scores.matched_terms(0, 0) == ["alpha"]
@@ -0,0 +1,35 @@
+import uuid
+
+def _requests_by_route(client) -> dict:
+    """http_requests_total samples as {(method, route, status): count}"""
+    samples = {}
+    for line in client.get("/metrics").text.splitlines():
+        if line.startswith("http_requests_total{"):
+            labels, value = line[len("http_requests_total{"):].rsplit("} ", 1)
+            fields = dict(pair.split("=", 1) for pair in labels.split('",'))
+            key = tuple(fields[name].strip('"') for name in ("method", "route", "status"))
+            samples[key] = float(value)
+    return samples
+
+def _delta(client, request) -> dict:
+    before = _requests_by_route(client)
+    request()
+    after = _requests_by_route(client)
+    return {key: count - before.get(key, 0) for key, count in after.items() if count != before.get(key, 0)
+            and key[1] != "/metrics"}
+
+def test_requests_are_labelled_by_route_template(client):
+    def request():
+        client.get(f"/api/applications/{uuid.uuid4()}")
+        client.get(f"/api/applications/{uuid.uuid4()}")
+    assert _delta(client, request) == {("GET", "/api/applications/{application_id}", "404"): 2}
+
+def test_parameter_equal_to_a_literal_segment_keeps_the_template(client):
+    delta = _delta(client, lambda: client.get("/api/research/research"))
+    assert delta == {("GET", "/api/research/{run_id}", "404"): 1}
+
+def test_unrouted_paths_share_one_label(client):
+    def request():
+        for i in range(3):
+            client.get(f"/wp-admin/{uuid.uuid4()}/setup.php")
+    assert _delta(client, request) == {("GET", "unmatched", "404"): 3}
@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+from migrations import check_plans
+
+# A scratch Postgres database the plan check may apply the migrations to
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+def test_seq_scans_finds_nested_scans():
+    plan = {
+        "Node Type": "Nested Loop",
+        "Plans": [
+            {"Node Type": "Index Scan", "Relation Name": "applications"},
+            {"Node Type": "Hash", "Plans": [{"Node Type": "Seq Scan", "Relation Name": "application_files"}]},
+        ],
+    }
+    assert list(check_plans.seq_scans(plan)) == ["application_files"]
+
+def test_every_migration_is_checked_in_order():
+    names = [path.name for path in sorted(check_plans.MIGRATIONS_DIR.glob("*.sql"))]
+    assert names[0] == "001_base_schema.sql"
+    assert [name[:3] for name in names] == [f"{i:03d}" for i in range(1, len(names) + 1)]
+
+@pytest.mark.skipif(check_plans.psycopg is None or not TEST_DATABASE_URL,
+                    reason="needs psycopg and TEST_DATABASE_URL pointing at a scratch database")
+def test_queries_use_indexes():
+    assert check_plans.main(["--dsn", TEST_DATABASE_URL, "--apply"]) == 0
+
+    # Without its index, listing an application's files falls back to a scan
+    with check_plans.psycopg.connect(TEST_DATABASE_URL, autocommit=True) as conn:
+        conn.execute("drop index idx_application_files_application")
+    try:
+        assert check_plans.main(["--dsn", TEST_DATABASE_URL]) == 1
+    finally:
+        assert check_plans.main(["--dsn", TEST_DATABASE_URL, "--apply"]) == 0
@@ -0,0 +1,59 @@
+import uuid
+
+import pytest
+
+def _walk(client, url: str, limit: int, **params) -> list:
+    """Every row of a list endpoint, read page by page"""
+    rows, cursor = [], None
+    while True:
+        page_params = {**params, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(url, params=page_params)
+        assert response.status_code == 200
+        rows.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return rows
+
+@pytest.fixture
+def companies(client):
+    """Companies whose priorities include repeats and NULLs"""
+    tag = uuid.uuid4().hex[:8]
+    ids = [client.post("/api/companies", json={"name": f"{tag} {i}", "priority": priority}).json()["id"]
+           for i, priority in enumerate([None, 5, None, 1, 5, None, 3])]
+    yield ids
+    for company_id in ids:
+        client.delete(f"/api/companies/{company_id}")
+
+def test_cursor_pages_cover_null_sort_keys_once(client, companies):
+    everything = client.get("/api/companies").json()
+    paged = _walk(client, "/api/companies", limit=2)
+
+    ids = [row["id"] for row in paged]
+    assert len(ids) == len(set(ids))
+    assert ids == [row["id"] for row in everything]
+    assert set(companies) <= set(ids)
+
+    # Descending, with NULL priorities first as Postgres orders them
+    priorities = [row["priority"] for row in paged]
+    nulls = priorities.count(None)
+    assert priorities[:nulls] == [None] * nulls
+    assert priorities[nulls:] == sorted(priorities[nulls:], reverse=True)
+
+def test_cursor_pages_match_the_unpaged_list(client, application):
+    everything = [row["id"] for row in client.get("/api/applications").json()]
+    assert [row["id"] for row in _walk(client, "/api/applications", limit=3)] == everything
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/api/applications", params={"limit": 2, "cursor": "not a cursor"}).status_code == 400
+
+def test_fields_select_columns(client, application):
+    rows = client.get("/api/applications", params={"fields": "company,status", "limit": 5}).json()
+    # id and the sort column are always included so the cursor can be built
+    assert rows and all(row.keys() == {"company", "status", "id", "created_at"} for row in rows)
+
+    summary = client.get("/api/applications", params={"shape": "summary", "limit": 5}).json()
+    assert "job_description" not in summary[0] and "company" in summary[0]
+
+    response = client.get("/api/applications", params={"fields": "company,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
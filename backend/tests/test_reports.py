@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("reportlab")
+
+from services import reports
+
+@pytest.fixture(autouse=True)
+def inline_render(monkeypatch):
+    """Render in this process instead of the worker pool"""
+    async def inline(func, *args):
+        return func(*args)
+
+    monkeypatch.setattr(reports, "run_in_pool", inline)
+
+def test_identical_inputs_give_the_same_etag(client, application):
+    url = f"/api/reports/interview-prep/{application['id']}"
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "application/pdf"
+    assert first.headers["content-length"] == str(len(first.content))
+    assert first.content.startswith(b"%PDF")
+
+    second = client.get(url)
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert second.headers["X-Report-Cache"] == "hit"
+    assert second.content == first.content
+
+    not_modified = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+def test_editing_the_application_changes_the_etag(client, application):
+    url = f"/api/reports/interview-prep/{application['id']}"
+    etag = client.get(url).headers["ETag"]
+    client.put(f"/api/applications/{application['id']}", json={"status": "Phone Screen"})
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.headers["X-Report-Cache"] == "miss"
+
+def test_new_application_changes_the_summary_etag(client):
+    etag = client.get("/api/reports/search-summary").headers["ETag"]
+    assert client.get("/api/reports/search-summary", headers={"If-None-Match": etag}).status_code == 304
+
+    client.post("/api/applications", params={"duplicates": "allow"},
+                json={"company": "Summary Co", "title": "Chemist", "status": "Applied"})
+    assert client.get("/api/reports/search-summary").headers["ETag"] != etag
@@ -0,0 +1,123 @@
+import functools
+import json
+import re
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.database import execute
+from services.job_search import job_search, JobProvider
+from services.llm import llm_gateway, OpenAIProvider
+from services.research import research, LeaseLost, Run, RUNS_TABLE
+from services.supabase_client import get_supabase_client
+
+RESUME = "Analytical chemist with HPLC and LC-MS method development experience"
+
+class StubLLM(OpenAIProvider):
+    """Answers each research prompt without calling an API"""
+    name = "stub"
+    label = "Stub"
+    default_model = "stub-model"
+
+    def __init__(self):
+        super().__init__("http://llm.invalid", "key")
+        self.prompts = []
+
+    async def complete(self, client, model, messages, temperature, max_tokens, api_key=None):
+        system = messages[0]["content"]
+        self.prompts.append(system[:40])
+        if "career strategist" in system:
+            return json.dumps({"searchQueries": [{"query": "analytical scientist", "priority": "high"}]})
+        if "optimization expert" in system:
+            return json.dumps({"analysis": "fine", "refinedQueries": []})
+        ids = re.findall(r"\(ID: (\w+)\)", messages[1]["content"])
+        return json.dumps({"matches": [{"jobId": i, "score": 80} for i in ids]})
+
+class StubJobs(JobProvider):
+    name = "stubjobs"
+    label = "StubJobs"
+
+    def __init__(self):
+        super().__init__("http://jobs.invalid")
+        self.queries = []
+
+    def request(self, query, location, page):
+        return self.base_url, {}, {}
+
+    def normalize(self, data):
+        return []
+
+    async def search(self, client, query, location, page):
+        self.queries.append(query)
+        return [{"id": f"{query}-{i}", "title": f"{query} {i}", "company": "Acme", "location": location,
+                 "description": "HPLC", "source": self.label} for i in range(2)]
+
+@pytest.fixture
+def stubs(monkeypatch):
+    llm, jobs = StubLLM(), StubJobs()
+    monkeypatch.setitem(llm_gateway.providers, llm.name, llm)
+    monkeypatch.setitem(job_search.providers, jobs.name, jobs)
+    job_search.clear_cache()
+    return llm, jobs
+
+def _wait(client, run_id: str) -> dict:
+    for _ in range(200):
+        run = client.get(f"/api/research/{run_id}").json()
+        if run["status"] not in ("pending", "running"):
+            return run
+        time.sleep(0.02)
+    raise AssertionError(f"research run {run_id} did not finish")
+
+def _set(client, run_id: str, changes: dict):
+    async def update():
+        await execute(get_supabase_client().table(RUNS_TABLE).update(changes).eq("id", run_id))
+    client.portal.call(update)
+
+def _ago(seconds: float) -> str:
+    return (datetime.utcnow() - timedelta(seconds=seconds)).isoformat()
+
+def test_run_completes(client, stubs):
+    response = client.post("/api/research", json={"provider": "stub", "resume_text": RESUME,
+                                                  "providers": ["stubjobs"]})
+    assert response.status_code == 200
+    run = _wait(client, response.json()["id"])
+    assert run["status"] == "completed"
+    assert run["stats"]["unique_jobs"] == 2
+    assert run["heartbeat_at"]
+
+def test_run_with_expired_lease_resumes_from_checkpoint(client, stubs):
+    llm, jobs = stubs
+    run = _wait(client, client.post("/api/research", json={
+        "provider": "stub", "resume_text": RESUME + " (lease)", "providers": ["stubjobs"]}).json()["id"])
+    profile = {"searchQueries": [{"query": "checkpointed query", "priority": "high"}]}
+
+    # A worker died after the profile stage, long enough ago for its lease to expire
+    _set(client, run["id"], {"status": "running", "heartbeat_at": _ago(3600), "checkpoints": {"profile": profile}})
+    llm.prompts.clear()
+    assert client.portal.call(research.resume_interrupted) == 1
+
+    resumed = _wait(client, run["id"])
+    assert resumed["status"] == "completed"
+    assert "checkpointed query" in jobs.queries
+    assert resumed["checkpoints"]["profile"] == profile
+    assert not any("career strategist" in p for p in llm.prompts)
+
+def test_run_with_live_lease_is_not_taken_over(client, stubs):
+    run = _wait(client, client.post("/api/research", json={
+        "provider": "stub", "resume_text": RESUME + " (live)", "providers": ["stubjobs"]}).json()["id"])
+    _set(client, run["id"], {"status": "running", "heartbeat_at": _ago(1)})
+
+    assert client.portal.call(research.resume_interrupted) == 0
+    assert client.post(f"/api/research/{run['id']}/resume").status_code == 409
+
+def test_worker_that_lost_its_lease_stops_writing(client, stubs):
+    run = _wait(client, client.post("/api/research", json={
+        "provider": "stub", "resume_text": RESUME + " (lost)", "providers": ["stubjobs"]}).json()["id"])
+    _set(client, run["id"], {"status": "running", "heartbeat_at": _ago(1)})
+
+    # The heartbeat this worker last wrote, before another worker took over
+    stale = Run({**client.get(f"/api/research/{run['id']}").json(), "scope": "", "heartbeat_at": _ago(3600)}, None)
+    with pytest.raises(LeaseLost):
+        client.portal.call(functools.partial(research._save, stale, status="failed"))
+    assert client.get(f"/api/research/{run['id']}").json()["status"] == "running"
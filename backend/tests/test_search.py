@@ -0,0 +1,51 @@
+import uuid
+from datetime import datetime
+
+from services import indexes
+from services.database import execute
+from services.supabase_client import get_supabase_client
+
+def _search(client, q: str) -> dict:
+    response = client.get("/api/applications/search", params={"q": q})
+    assert response.status_code == 200
+    return response.json()
+
+def _ids(result: dict) -> list:
+    return [r["id"] for r in result["results"]]
+
+def test_search_matches_prefix_and_highlights(client):
+    row = client.post("/api/applications", params={"duplicates": "allow"},
+                      json={"company": "Zephyrine Labs", "title": "Spectroscopist"}).json()
+
+    result = _search(client, "zephyr")
+    assert _ids(result) == [row["id"]]
+    assert result["results"][0]["highlights"]["company"] == "<mark>Zephyrine</mark> Labs"
+    assert _ids(_search(client, "zephyrine spectro")) == [row["id"]]
+    assert _search(client, "zephyrine chemist")["total"] == 0
+
+def test_search_follows_updates_and_deletes(client):
+    row = client.post("/api/applications", params={"duplicates": "allow"},
+                      json={"company": "Quillon", "title": "Analyst"}).json()
+    client.put(f"/api/applications/{row['id']}", json={"title": "Crystallographer"})
+
+    assert _ids(_search(client, "crystallographer")) == [row["id"]]
+    assert _search(client, "quillon analyst")["total"] == 0
+
+    client.delete(f"/api/applications/{row['id']}")
+    assert _search(client, "quillon")["total"] == 0
+
+def test_search_picks_up_writes_from_other_workers(client, monkeypatch):
+    _search(client, "anything")
+    monkeypatch.setattr(indexes, "INDEX_REFRESH_INTERVAL", 0)
+
+    async def insert():
+        supabase = get_supabase_client()
+        now = datetime.utcnow().isoformat()
+        row = {"id": str(uuid.uuid4()), "company": "Orrery Works", "title": "Chemist",
+               "created_at": now, "updated_at": now}
+        await execute(supabase.table("applications").insert(row))
+        return row
+
+    # Written straight to the database, as another worker would
+    row = client.portal.call(insert)
+    assert _ids(_search(client, "orrery")) == [row["id"]]
@@ -0,0 +1,80 @@
+import uuid
+
+import pytest
+from postgrest.exceptions import APIError
+
+from services.sqlite_backend import SQLiteClient
+
+@pytest.fixture
+def db(tmp_path):
+    client = SQLiteClient(str(tmp_path / "data.db"), str(tmp_path / "storage"))
+    yield client
+    client.close()
+
+def _application(**fields) -> dict:
+    return {"id": str(uuid.uuid4()), "company": "Acme", "title": "Chemist", **fields}
+
+def test_json_columns_round_trip(db):
+    row = _application(status_history=[{"status": "Applied", "date": "2024-01-01"}], tags=["hplc"],
+                       ai_analysis={"fit": {"score": 0.8}})
+    db.table("applications").insert(row).execute()
+
+    stored = db.table("applications").select("status_history,tags,ai_analysis").eq("id", row["id"]).execute().data[0]
+    assert stored == {key: row[key] for key in ("status_history", "tags", "ai_analysis")}
+
+def test_filters_and_nested_or(db):
+    rows = [_application(company=name, status=status, created_at=created)
+            for name, status, created in [("A", "Applied", "2024-01-01"), ("B", "Offer", "2024-02-01"),
+                                          ("C", None, "2024-03-01"), ("D", "Applied", "2024-04-01")]]
+    db.table("applications").insert(rows).execute()
+
+    def companies(query):
+        return sorted(r["company"] for r in query.execute().data)
+
+    assert companies(db.table("applications").select("company").in_("status", ["Offer", "Applied"])) == ["A", "B", "D"]
+    assert companies(db.table("applications").select("company").is_("status", "null")) == ["C"]
+    assert companies(db.table("applications").select("company").or_(
+        'status.eq.Offer,and(status.eq.Applied,created_at.gt."2024-03-15")')) == ["B", "D"]
+
+def test_nulls_order_like_postgres(db):
+    for priority in (2, None, 5):
+        db.table("target_companies").insert({"id": str(uuid.uuid4()), "name": str(priority), "priority": priority}).execute()
+
+    def order(desc):
+        rows = db.table("target_companies").select("priority").order("priority", desc=desc).execute().data
+        return [r["priority"] for r in rows]
+
+    assert order(desc=True) == [None, 5, 2]
+    assert order(desc=False) == [2, 5, None]
+
+def test_upsert_and_unknown_columns(db):
+    key = {"key": "k", "provider": "p", "model": "m", "created_at": "2024-01-01"}
+    db.table("llm_cache").upsert({**key, "content": "first"}, on_conflict="key").execute()
+    db.table("llm_cache").upsert({**key, "content": "second"}, on_conflict="key").execute()
+    assert [r["content"] for r in db.table("llm_cache").select("content").execute().data] == ["second"]
+
+    with pytest.raises(APIError) as error:
+        db.table("applications").select("id,nonexistent").execute()
+    assert error.value.code == "42703"
+
+def test_apply_row_update_checks_the_version(db):
+    row = _application(status="Applied", status_history=[])
+    db.table("applications").insert(row).execute()
+
+    updated = db.rpc("apply_row_update", {"p_table": "applications", "p_id": row["id"],
+                                          "p_changes": {"status": "Offer", "updated_at": "2024-05-01"},
+                                          "p_expected_version": 1}).execute().data
+    assert updated["version"] == 2
+    assert updated["status_history"] == [{"status": "Offer", "date": "2024-05-01"}]
+
+    with pytest.raises(APIError) as error:
+        db.rpc("apply_row_update", {"p_table": "applications", "p_id": row["id"],
+                                    "p_changes": {"notes": "stale"}, "p_expected_version": 1}).execute()
+    assert error.value.code == "PT409"
+
+def test_local_storage_stays_inside_its_bucket(db):
+    bucket = db.storage.from_("resumes")
+    bucket.upload("a/resume.txt", b"resume")
+    assert bucket.download("a/resume.txt") == b"resume"
+    with pytest.raises(ValueError):
+        bucket.upload("../../escape.txt", b"x")
@@ -0,0 +1,44 @@
+import functools
+from datetime import datetime, timedelta
+
+from services.stats import status_counts
+
+def _counts(client, **kwargs):
+    return client.portal.call(functools.partial(status_counts, **kwargs))
+
+def test_status_counts_keep_real_status_names(client):
+    before_total, before = _counts(client)
+    for status in ("Applied", "Applied", "On Hold"):
+        client.post("/api/applications", params={"duplicates": "allow"},
+                    json={"company": "Counted Co", "title": "Chemist", "status": status})
+
+    total, counts = _counts(client)
+    assert total == before_total + 3
+    assert counts["Applied"] == before.get("Applied", 0) + 2
+    assert counts["On Hold"] == before.get("On Hold", 0) + 1
+    assert total == sum(counts.values())
+
+def test_status_counts_filter_by_time_and_status(client):
+    client.post("/api/applications", params={"duplicates": "allow"},
+                json={"company": "Filtered Co", "title": "Chemist", "status": "Offer"})
+    future = (datetime.utcnow() + timedelta(days=1)).isoformat()
+    assert _counts(client, since=future) == (0, {})
+
+    total, counts = _counts(client, statuses=["Offer"])
+    assert list(counts) == ["Offer"] and total == counts["Offer"]
+
+def test_export_lists_counts_by_status(client):
+    client.post("/api/applications", params={"duplicates": "allow"},
+                json={"company": "Export Co", "title": "Chemist", "status": "On Hold"})
+    text = client.get("/api/applications/export-for-llm", params={"status": "On Hold"}).text
+    assert "- On Hold: " in text
+    assert "Unknown" not in text
+
+def test_export_is_markdown_unless_json_is_asked_for(client, application):
+    markdown = client.get("/api/applications/export-for-llm")
+    assert markdown.headers["content-type"].startswith("text/markdown")
+    assert markdown.text.startswith("# Job Search Summary")
+
+    response = client.get("/api/applications/export-for-llm", headers={"Accept": "application/json"})
+    assert response.json() == {"text": markdown.text, "format": "markdown"}
+    assert "Accept" in [v.strip() for v in response.headers["Vary"].split(",")]
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from services.database import execute
+from services.supabase_client import get_supabase_client
+from services.sync import SYNC_OVERLAP, decode_token
+
+def _ids(rows) -> list:
+    return [row["id"] for row in rows]
+
+def _stamp(client, application_id: str, updated_at):
+    """Backdate a write, as if its timestamp was taken before it committed"""
+    async def update():
+        await execute(get_supabase_client().table("applications")
+                      .update({"updated_at": updated_at.isoformat()}).eq("id", application_id))
+    client.portal.call(update)
+
+def _stamp_tombstones_back(client, record_id: str):
+    async def update():
+        await execute(get_supabase_client().table("deleted_records")
+                      .update({"deleted_at": "2000-01-01T00:00:00"}).eq("record_id", record_id))
+    client.portal.call(update)
+
+def test_deleted_row_comes_back_as_a_tombstone(client, application):
+    token = client.get("/api/sync").json()["token"]
+    client.delete(f"/api/applications/{application['id']}")
+
+    changes = client.get("/api/sync", params={"since": token}).json()
+    assert application["id"] in changes["applications"]["deleted"]
+    assert application["id"] not in _ids(changes["applications"]["upserted"])
+    assert changes["full"] is False
+
+def test_tombstones_before_the_token_are_not_resent(client, application):
+    client.delete(f"/api/applications/{application['id']}")
+    token = client.get("/api/sync").json()["token"]
+    _stamp_tombstones_back(client, application["id"])
+
+    changes = client.get("/api/sync", params={"since": token}).json()
+    assert application["id"] not in changes["applications"]["deleted"]
+
+def test_row_written_within_the_overlap_is_sent_again(client, application):
+    first = client.get("/api/sync").json()
+    assert application["id"] in _ids(first["applications"]["upserted"])
+    synced_at = decode_token(first["token"])
+
+    # Committed after the first sync, with a timestamp from just before it
+    _stamp(client, application["id"], synced_at - SYNC_OVERLAP / 2)
+    changes = client.get("/api/sync", params={"since": first["token"]}).json()
+    assert application["id"] in _ids(changes["applications"]["upserted"])
+
+    _stamp(client, application["id"], synced_at - SYNC_OVERLAP - timedelta(seconds=1))
+    changes = client.get("/api/sync", params={"since": first["token"]}).json()
+    assert application["id"] not in _ids(changes["applications"]["upserted"])
+
+def test_invalid_token_is_rejected(client):
+    assert client.get("/api/sync", params={"since": "not a token"}).status_code == 400
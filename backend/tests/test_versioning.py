@@ -0,0 +1,45 @@
+def test_get_returns_version_etag(client, application):
+    response = client.get(f"/api/applications/{application['id']}")
+    assert response.headers["ETag"] == f'"{application["version"]}"'
+
+def test_put_with_current_etag_bumps_version(client, application):
+    etag = client.get(f"/api/applications/{application['id']}").headers["ETag"]
+    response = client.put(f"/api/applications/{application['id']}", headers={"If-Match": etag},
+                          json={"status": "Phone Screen"})
+    assert response.status_code == 200
+    row = response.json()
+    assert row["version"] == application["version"] + 1
+    assert response.headers["ETag"] == f'"{row["version"]}"'
+    assert [h["status"] for h in row["status_history"]] == ["Applied", "Phone Screen"]
+
+def test_put_with_stale_etag_is_a_conflict(client, application):
+    stale = client.get(f"/api/applications/{application['id']}").headers["ETag"]
+    client.put(f"/api/applications/{application['id']}", json={"notes": "first"})
+
+    response = client.put(f"/api/applications/{application['id']}", headers={"If-Match": stale},
+                          json={"notes": "second"})
+    assert response.status_code == 409
+    assert client.get(f"/api/applications/{application['id']}").json()["notes"] == "first"
+
+def test_put_accepts_weak_and_wildcard_etags(client, application):
+    weak = f'W/"{application["version"]}"'
+    assert client.put(f"/api/applications/{application['id']}", headers={"If-Match": weak},
+                      json={"notes": "weak"}).status_code == 200
+    assert client.put(f"/api/applications/{application['id']}", headers={"If-Match": "*"},
+                      json={"notes": "any"}).status_code == 200
+
+def test_put_with_malformed_etag_is_rejected(client, application):
+    response = client.put(f"/api/applications/{application['id']}", headers={"If-Match": "abc"},
+                          json={"notes": "x"})
+    assert response.status_code == 400
+
+def test_put_on_missing_row_is_not_found(client):
+    response = client.put("/api/applications/00000000-0000-0000-0000-000000000000", json={"notes": "x"})
+    assert response.status_code == 404
+
+def test_company_put_with_stale_etag_is_a_conflict(client):
+    company = client.post("/api/companies", json={"name": "Versioned Co"}).json()
+    client.put(f"/api/companies/{company['id']}", json={"notes": "first"})
+    response = client.put(f"/api/companies/{company['id']}", headers={"If-Match": f'"{company["version"]}"'},
+                          json={"notes": "second"})
+    assert response.status_code == 409
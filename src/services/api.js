@@ -22,8 +22,10 @@ export const applicationsApi = {
     return handleResponse(response);
   },
 
-  create: async (data) => {
-    const response = await fetch(`${API_BASE}/applications`, {
+  // duplicates: 'flag' (default), 'reject' to get an error instead of creating
+  // a near-duplicate of an existing application, or 'allow' to skip the check
+  create: async (data, { duplicates = 'flag' } = {}) => {
+    const response = await fetch(`${API_BASE}/applications?duplicates=${duplicates}`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
       body: JSON.stringify(data)
@@ -47,7 +49,49 @@ export const applicationsApi = {
     return response.ok;
   },
 
+  bulkCreate: async (items) => {
+    const response = await fetch(`${API_BASE}/applications/bulk`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(items)
+    });
+    return handleResponse(response);
+  },
+
+  // Each item must include the id of the record to update
+  bulkUpdate: async (items) => {
+    const response = await fetch(`${API_BASE}/applications/bulk`, {
+      method: 'PUT',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(items)
+    });
+    return handleResponse(response);
+  },
+
+  bulkDelete: async (ids) => {
+    const response = await fetch(`${API_BASE}/applications/bulk/delete`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ ids })
+    });
+    return handleResponse(response);
+  },
+
+  // Attaches by hash when the content is already stored, else uploads it
   uploadFile: async (id, file, fileType) => {
+    if (globalThis.crypto?.subtle) {
+      const digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+      const sha256 = Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, '0')).join('');
+      const linked = await fetch(`${API_BASE}/applications/${id}/files/by-hash`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ sha256, file_type: fileType, file_name: file.name })
+      });
+      if (linked.status !== 404) {
+        return handleResponse(linked);
+      }
+    }
+
     const formData = new FormData();
     formData.append('file', file);
     formData.append('file_type', fileType);
@@ -59,14 +103,36 @@ export const applicationsApi = {
     return handleResponse(response);
   },
 
+  search: async (q, { limit = 20, offset = 0 } = {}) => {
+    const params = new URLSearchParams({ q, limit, offset });
+    const response = await fetch(`${API_BASE}/applications/search?${params}`);
+    return handleResponse(response);
+  },
+
+  // Groups of applications that look like the same posting
+  duplicates: async (threshold = null) => {
+    const params = threshold === null ? '' : `?threshold=${threshold}`;
+    const response = await fetch(`${API_BASE}/applications/duplicates${params}`);
+    return handleResponse(response);
+  },
+
   listFiles: async (id) => {
     const response = await fetch(`${API_BASE}/applications/${id}/files`);
     return handleResponse(response);
   },
 
-  exportForLLM: async () => {
-    const response = await fetch(`${API_BASE}/applications/export-for-llm`);
-    return handleResponse(response);
+  // Streamed as markdown; options: days, status, limit, description_chars
+  exportForLLM: async (options = {}) => {
+    const params = new URLSearchParams();
+    Object.entries(options).forEach(([key, value]) => {
+      [].concat(value ?? []).forEach(v => params.append(key, v));
+    });
+    const query = params.toString() ? `?${params}` : '';
+    const response = await fetch(`${API_BASE}/applications/export-for-llm${query}`);
+    if (!response.ok) {
+      await handleResponse(response);
+    }
+    return { text: await response.text(), format: 'markdown' };
   }
 };
 
@@ -162,6 +228,34 @@ export const companiesApi = {
       method: 'DELETE'
     });
     return response.ok;
+  },
+
+  bulkCreate: async (items) => {
+    const response = await fetch(`${API_BASE}/companies/bulk`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(items)
+    });
+    return handleResponse(response);
+  },
+
+  // Each item must include the id of the record to update
+  bulkUpdate: async (items) => {
+    const response = await fetch(`${API_BASE}/companies/bulk`, {
+      method: 'PUT',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(items)
+    });
+    return handleResponse(response);
+  },
+
+  bulkDelete: async (ids) => {
+    const response = await fetch(`${API_BASE}/companies/bulk/delete`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ ids })
+    });
+    return handleResponse(response);
   }
 };
 
@@ -182,6 +276,194 @@ export const filesApi = {
   }
 };
 
+// Sync API
+export const syncApi = {
+  // Pass the token from the previous call to get only what changed since
+  changes: async (since = null) => {
+    const query = since ? `?since=${encodeURIComponent(since)}` : '';
+    const response = await fetch(`${API_BASE}/sync${query}`);
+    return handleResponse(response);
+  }
+};
+
+// Jobs API
+export const jobsApi = {
+  providers: async () => {
+    const response = await fetch(`${API_BASE}/jobs/providers`);
+    return handleResponse(response);
+  },
+
+  // Searches every configured provider for each keyword on the backend
+  search: async ({ keywords = [], location = '', page = 1, providers = [] } = {}) => {
+    const params = new URLSearchParams({ location, page: String(page) });
+    keywords.forEach(k => params.append('keywords', k));
+    providers.forEach(p => params.append('providers', p));
+    const response = await fetch(`${API_BASE}/jobs/search?${params}`);
+    return handleResponse(response);
+  }
+};
+
+// LLM gateway API
+export const llmApi = {
+  providers: async () => {
+    const response = await fetch(`${API_BASE}/llm/providers`);
+    return handleResponse(response);
+  },
+
+  // request: { provider, model, messages, application_id, analysis_key, ... }
+  complete: async (request) => {
+    const response = await fetch(`${API_BASE}/llm`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ ...request, stream: false })
+    });
+    return handleResponse(response);
+  },
+
+  // Calls onText with each piece of text as it arrives; resolves to the full text
+  stream: async (request, onText) => {
+    const response = await fetch(`${API_BASE}/llm`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ ...request, stream: true })
+    });
+    if (!response.ok) {
+      return handleResponse(response);
+    }
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let text = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      const piece = decoder.decode(value, { stream: true });
+      text += piece;
+      onText?.(piece);
+    }
+    return text;
+  }
+};
+
+// Match scoring API
+export const matchApi = {
+  // Ranks applications and/or posted jobs against resume versions locally;
+  // send only the top results to the LLM for detailed analysis
+  score: async ({ resumeIds, applicationIds, jobs = [], topN = 20 } = {}) => {
+    const response = await fetch(`${API_BASE}/match`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        resume_ids: resumeIds,
+        application_ids: applicationIds,
+        jobs,
+        top_n: topN
+      })
+    });
+    return handleResponse(response);
+  }
+};
+
+// Analytics API
+export const analyticsApi = {
+  // Funnel, time in stage, response rates by group and weekly velocity
+  get: async (weeks = 8) => {
+    const response = await fetch(`${API_BASE}/analytics?weeks=${weeks}`);
+    return handleResponse(response);
+  }
+};
+
+// Deep Research API
+export const researchApi = {
+  list: async (limit = 20) => {
+    const response = await fetch(`${API_BASE}/research?limit=${limit}`);
+    return handleResponse(response);
+  },
+
+  // request: { resume_id or resume_text, provider, model, api_key, location, providers }
+  start: async (request) => {
+    const response = await fetch(`${API_BASE}/research`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(request)
+    });
+    return handleResponse(response);
+  },
+
+  // Run status, stage checkpoints and postings with their analyses
+  get: async (id) => {
+    const response = await fetch(`${API_BASE}/research/${id}`);
+    return handleResponse(response);
+  },
+
+  // Continue an interrupted or failed run from its last finished stage
+  resume: async (id, apiKey = null) => {
+    const response = await fetch(`${API_BASE}/research/${id}/resume`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ api_key: apiKey })
+    });
+    return handleResponse(response);
+  },
+
+  // Calls onEvent with each progress event; returns a function that stops listening.
+  // The stream ends with a 'done', 'error', 'interrupted' or 'status' event.
+  events: (id, onEvent) => {
+    const source = new EventSource(`${API_BASE}/research/${id}/events`);
+    const types = ['progress', 'done', 'error', 'interrupted', 'status'];
+    for (const type of types) {
+      source.addEventListener(type, (event) => {
+        onEvent(JSON.parse(event.data));
+        if (type !== 'progress') source.close();
+      });
+    }
+    return () => source.close();
+  }
+};
+
+// Follow-ups API
+export const followupsApi = {
+  // Applications and companies due a follow-up before `before` (default: end of today)
+  due: async ({ before = null, kind = null, limit = 100 } = {}) => {
+    const params = new URLSearchParams({ limit });
+    if (before) params.set('before', before);
+    if (kind) params.set('kind', kind);
+    const response = await fetch(`${API_BASE}/followups/due?${params}`);
+    return handleResponse(response);
+  },
+
+  reminders: async (limit = 100) => {
+    const response = await fetch(`${API_BASE}/followups/reminders?limit=${limit}`);
+    return handleResponse(response);
+  },
+
+  dismiss: async (id) => {
+    const response = await fetch(`${API_BASE}/followups/reminders/${id}/dismiss`, { method: 'POST' });
+    return handleResponse(response);
+  }
+};
+
+// Reports API (PDFs rendered by the backend)
+export const reportsApi = {
+  getInterviewPrepUrl: (applicationId) => `${API_BASE}/reports/interview-prep/${applicationId}`,
+  getSearchSummaryUrl: () => `${API_BASE}/reports/search-summary`
+};
+
+// Backup API
+export const backupApi = {
+  // A .tar.gz of every table and stored file, streamed by the backend
+  getBackupUrl: () => `${API_BASE}/backup`,
+
+  // file: a backup archive from getBackupUrl
+  restore: async (file) => {
+    const response = await fetch(`${API_BASE}/restore`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/gzip' },
+      body: file
+    });
+    return handleResponse(response);
+  }
+};
+
 // Check if backend is available
 export const checkBackendHealth = async () => {
   try {
@@ -198,6 +480,15 @@ export const api = {
   resumes: resumesApi,
   companies: companiesApi,
   files: filesApi,
+  sync: syncApi,
+  jobs: jobsApi,
+  llm: llmApi,
+  match: matchApi,
+  analytics: analyticsApi,
+  research: researchApi,
+  followups: followupsApi,
+  reports: reportsApi,
+  backup: backupApi,
   checkHealth: checkBackendHealth
 };
 